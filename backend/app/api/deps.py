@@ -1,11 +1,15 @@
 """Dependencias compartidas para los endpoints"""
 from typing import Annotated
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_read_db
+
+settings = get_settings()
 
 # Type aliases para usar en los endpoints
-DBSession = Annotated[AsyncSession, Depends(get_db)]
+DBSession = Annotated[AsyncSession, Depends(get_db)]  # primario: escrituras y relecturas
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db)]  # réplica si hay: solo lectura
 
 # Dependency para paginación
 def _pagination_params(
@@ -17,4 +21,27 @@ def _pagination_params(
         page_size,  # limit
     )
 
-PaginationParams = Annotated[tuple[int, int], Depends(_pagination_params)]
\ No newline at end of file
+PaginationParams = Annotated[tuple[int, int], Depends(_pagination_params)]
+
+# Dependency para búsquedas por lote: IDs sin repetir, en el orden pedido
+def _batch_ids(
+    ids: str = Query(..., description="IDs separados por coma, p. ej. 3,1,2"),
+) -> list[int]:
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids debe ser una lista de enteros separados por coma"
+        )
+    unique = list(dict.fromkeys(parsed))
+    if not unique:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids está vacío")
+    if len(unique) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo {settings.BATCH_MAX_IDS} ids por request"
+        )
+    return unique
+
+BatchIds = Annotated[list[int], Depends(_batch_ids)]
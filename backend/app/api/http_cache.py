@@ -0,0 +1,125 @@
+"""Validadores HTTP (ETag / Last-Modified) y Cache-Control para el catálogo.
+
+Las rutas GET de los routers creados con `catalog_route` responden 304 si
+el cliente (navegador, nginx o CDN) ya tiene la versión actual, sin ejecutar
+el endpoint ni consultar la base de datos. El 304 sale después de validar los
+parámetros: un request inválido recibe su 422 aunque el ETag coincida. La
+versión es la del catálogo en `app.cache`, leída de la base, así que todos los
+workers dan los mismos validadores; si no se pudo leer, las respuestas salen
+sin validadores. Las respuestas en MessagePack (app/negotiation.py) y las búsquedas hechas antes de
+que esté el índice (app/search.py) tienen su propio ETag.
+"""
+import asyncio
+from contextvars import ContextVar
+from email.utils import formatdate, parsedate_to_datetime
+from functools import wraps
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app import search
+from app.cache import catalog_etag, catalog_last_modified
+from app.serialization import response_format
+
+
+# Headers del 304 si la copia del cliente del request en curso sigue vigente
+_not_modified: ContextVar[dict | None] = ContextVar("catalog_not_modified", default=None)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparación débil de If-None-Match (RFC 9110 §13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+
+def _not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # Las fechas HTTP tienen resolución de segundos
+    return int(last_modified) <= since
+
+
+def representation_etag(etag: str) -> str:
+    """ETag del catálogo para el formato negociado del request en curso"""
+    if not search.tracks.ready:
+        # Las búsquedas con ILIKE dan otros resultados que con el índice
+        etag = f'{etag[:-1]}-ilike"'
+    fmt = response_format.get()
+    if fmt == "json":
+        return etag
+    return f'{etag[:-1]}-{fmt}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Si la copia del cliente sigue vigente; If-None-Match tiene prioridad"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def _skip_if_not_modified(endpoint: Callable) -> Callable:
+    """Endpoint que responde 304 en lugar de ejecutarse si la copia sigue vigente.
+
+    FastAPI lo llama después de validar parámetros y resolver dependencias.
+    """
+    @wraps(endpoint)
+    async def call(**values):
+        headers = _not_modified.get()
+        if headers is not None:
+            return Response(status_code=304, headers=headers)
+        return await endpoint(**values)
+
+    return call
+
+
+class CatalogRoute(APIRoute):
+    """Ruta con validadores de catálogo en sus respuestas GET"""
+    cache_control = "no-cache"
+
+    def get_route_handler(self) -> Callable:
+        if "GET" not in self.methods:
+            return super().get_route_handler()
+        if asyncio.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = _skip_if_not_modified(self.dependant.call)
+        handler = super().get_route_handler()
+        cache_control = self.cache_control
+
+        async def route_handler(request: Request) -> Response:
+            etag = catalog_etag()
+            headers = {"Cache-Control": cache_control}
+            not_modified = False
+            if etag is not None:
+                etag = representation_etag(etag)
+                last_modified = catalog_last_modified()
+                headers["ETag"] = etag
+                headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+                not_modified = is_not_modified(request, etag, last_modified)
+
+            token = _not_modified.set(headers if not_modified else None)
+            try:
+                response = await handler(request)
+            finally:
+                _not_modified.reset(token)
+            if response.status_code == 200:
+                response.headers.update(headers)
+            return response
+
+        return route_handler
+
+
+def catalog_route(max_age: int) -> type[APIRoute]:
+    """Clase de ruta para `APIRouter(route_class=...)` con el max-age dado"""
+    return type(
+        "CatalogRoute",
+        (CatalogRoute,),
+        {"cache_control": f"public, max-age={max_age}"},
+    )
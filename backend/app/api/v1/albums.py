@@ -1,37 +1,75 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.api.deps import DBSession
+from app.api.deps import BatchIds, ReadDBSession
+from app.api.http_cache import catalog_route
+from app.config import get_settings
 from app.schemas import album as schemas
-from app.crud import album as crud
+from app.schemas.artist import Artist
+from app.serialization import batch_response, list_response, row_to_dict
+from app.crud import album as crud, artist as artist_crud
+from app.crud.counting import CountStrategy
+from app.crud.pagination import InvalidCursorError
 
-router = APIRouter()
+settings = get_settings()
+router = APIRouter(route_class=catalog_route(settings.CATALOG_MAX_AGE))
 
 
 @router.get("/", response_model=schemas.AlbumList)
 async def list_albums(
-    db: DBSession,
+    db: ReadDBSession,
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(50, ge=1, le=100, description="Items por página"),
     artist_id: int | None = Query(None, description="Filtrar por artista"),
-    search: str | None = Query(None, description="Buscar por título")
+    search: str | None = Query(None, description="Buscar por título"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+    include_total: bool = Query(True, description="Calcular el total de resultados"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo en la búsqueda"),
 ):
     """Lista todos los álbumes con paginación, filtros y búsqueda"""
     skip = (page - 1) * page_size
+    count = None if include_total else CountStrategy.NONE
     
-    if search:
-        albums, total = await crud.search_albums(db, search, skip, page_size)
-    else:
-        albums, total = await crud.get_albums(db, skip, page_size, artist_id)
+    try:
+        if search:
+            albums, total, next_cursor = await crud.search_albums(db, search, skip, page_size, cursor, count, fuzzy)
+        else:
+            albums, total, next_cursor = await crud.get_albums(db, skip, page_size, artist_id, cursor, count)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return schemas.AlbumList(
-        albums=albums,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    albums_detail = [
+        row_to_dict(
+            album,
+            schemas.AlbumDetail,
+            artist=row_to_dict(album.artist, Artist) if album.artist else None,
+        )
+        for album in albums
+    ]
+    return list_response("albums", albums_detail, total, page, page_size, next_cursor)
+
+
+@router.get("/batch", response_model=schemas.AlbumBatch)
+async def get_albums_batch(ids: BatchIds, db: ReadDBSession):
+    """Obtiene varios álbumes por ID (?ids=3,1,2) con su artista, en el orden pedido.
+
+    Álbumes y artistas salen de la caché del catálogo (una consulta por
+    tipo para los que falten); los IDs que no existen se informan en `missing`.
+    """
+    albums = await crud.get_albums_by_ids(db, ids)
+    artists = await artist_crud.get_artists_by_ids(db, {album.ArtistId for album in albums.values()})
+    
+    albums_detail = {}
+    for album_id, album in albums.items():
+        artist = artists.get(album.ArtistId)
+        albums_detail[album_id] = row_to_dict(
+            album,
+            schemas.AlbumDetail,
+            artist=row_to_dict(artist, Artist) if artist else None,
+        )
+    return batch_response("albums", ids, albums_detail)
 
 
 @router.get("/{album_id}", response_model=schemas.AlbumDetail)
-async def get_album(album_id: int, db: DBSession):
+async def get_album(album_id: int, db: ReadDBSession):
     """Obtiene un álbum por ID con su artista"""
     album = await crud.get_album(db, album_id)
     if not album:
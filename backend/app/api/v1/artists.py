@@ -1,36 +1,63 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.api.deps import DBSession
+from app.api.deps import BatchIds, ReadDBSession
+from app.api.http_cache import catalog_route
+from app.config import get_settings
 from app.schemas import artist as schemas
+from app.serialization import batch_response, list_response, row_to_dict
 from app.crud import artist as crud
+from app.crud.counting import CountStrategy
+from app.crud.pagination import InvalidCursorError
 
-router = APIRouter()
+settings = get_settings()
+router = APIRouter(route_class=catalog_route(settings.CATALOG_MAX_AGE))
 
 
 @router.get("/", response_model=schemas.ArtistList)
 async def list_artists(
-    db: DBSession,
+    db: ReadDBSession,
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(50, ge=1, le=100, description="Items por página"),
-    search: str | None = Query(None, description="Buscar por nombre")
+    search: str | None = Query(None, description="Buscar por nombre"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+    include_total: bool = Query(True, description="Calcular el total de resultados"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo en la búsqueda"),
 ):
     """Lista todos los artistas con paginación y búsqueda opcional"""
     skip = (page - 1) * page_size
+    count = None if include_total else CountStrategy.NONE
     
-    if search:
-        artists, total = await crud.search_artists(db, search, skip, page_size)
-    else:
-        artists, total = await crud.get_artists(db, skip, page_size)
+    try:
+        if search:
+            artists, total, next_cursor = await crud.search_artists(db, search, skip, page_size, cursor, count, fuzzy)
+        else:
+            artists, total, next_cursor = await crud.get_artists(db, skip, page_size, cursor, count)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return schemas.ArtistList(
-        artists=artists,
-        total=total,
-        page=page,
-        page_size=page_size
+    return list_response(
+        "artists",
+        [row_to_dict(artist, schemas.Artist) for artist in artists],
+        total, page, page_size, next_cursor,
+    )
+
+
+@router.get("/batch", response_model=schemas.ArtistBatch)
+async def get_artists_batch(ids: BatchIds, db: ReadDBSession):
+    """Obtiene varios artistas por ID (?ids=3,1,2) en el orden pedido.
+
+    Salen de la caché del catálogo (una consulta para los que falten); los
+    IDs que no existen se informan en `missing`.
+    """
+    artists = await crud.get_artists_by_ids(db, ids)
+    return batch_response(
+        "artists",
+        ids,
+        {artist_id: row_to_dict(artist, schemas.Artist) for artist_id, artist in artists.items()},
     )
 
 
 @router.get("/{artist_id}", response_model=schemas.Artist)
-async def get_artist(artist_id: int, db: DBSession):
+async def get_artist(artist_id: int, db: ReadDBSession):
     """Obtiene un artista por ID"""
     artist = await crud.get_artist(db, artist_id)
     if not artist:
@@ -1,32 +1,57 @@
 from fastapi import APIRouter, HTTPException, Query, status
-from app.api.deps import DBSession
+from app.api.deps import BatchIds, DBSession, ReadDBSession
 from app.schemas import customer as schemas
-from app.crud import customer as crud
+from app.serialization import batch_response, row_to_dict
+from app.crud import customer as crud, employee, fanout
+from app.crud.counting import CountStrategy
+from app.crud.pagination import InvalidCursorError
 
 router = APIRouter()
 
 
 @router.get("/", response_model=schemas.CustomerList)
 async def list_customers(
-    db: DBSession,
+    db: ReadDBSession,
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(50, ge=1, le=100, description="Items por página"),
-    search: str | None = Query(None, description="Buscar por nombre, email o compañía")
+    search: str | None = Query(None, description="Buscar por nombre, email o compañía"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+    include_total: bool = Query(True, description="Calcular el total de resultados"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo en la búsqueda"),
 ):
     """Lista todos los clientes con paginación y búsqueda opcional"""
     skip = (page - 1) * page_size
-    customers, total = await crud.get_customers(db, skip, page_size, search)
+    count = None if include_total else CountStrategy.NONE
+    try:
+        customers, total, next_cursor = await crud.get_customers(db, skip, page_size, search, cursor, count, fuzzy)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     return schemas.CustomerList(
         customers=customers,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/batch", response_model=schemas.CustomerBatch)
+async def get_customers_batch(ids: BatchIds, db: ReadDBSession):
+    """Obtiene varios clientes por ID (?ids=3,1,2) en una consulta, en el orden pedido.
+
+    Los IDs que no existen se informan en `missing`.
+    """
+    customers = await crud.get_customers_by_ids(db, ids)
+    return batch_response(
+        "customers",
+        ids,
+        {customer_id: row_to_dict(customer, schemas.Customer) for customer_id, customer in customers.items()},
     )
 
 
 @router.get("/{customer_id}", response_model=schemas.Customer)
-async def get_customer(customer_id: int, db: DBSession):
+async def get_customer(customer_id: int, db: ReadDBSession):
     """Obtiene un cliente por ID"""
     customer = await crud.get_customer(db, customer_id)
     if not customer:
@@ -40,8 +65,15 @@ async def get_customer(customer_id: int, db: DBSession):
 @router.post("/", response_model=schemas.Customer, status_code=status.HTTP_201_CREATED)
 async def create_customer(customer: schemas.CustomerCreate, db: DBSession):
     """Crea un nuevo cliente"""
+    # Email y empleado de soporte se validan en paralelo
+    existing_customer, support_rep = await fanout.gather(
+        db,
+        lambda session: crud.get_customer_by_email(session, customer.Email),
+        (lambda session: employee.get_employee(session, customer.SupportRepId))
+        if customer.SupportRepId else None,
+    )
+    
     # Verificar si el email ya existe
-    existing_customer = await crud.get_customer_by_email(db, customer.Email)
     if existing_customer:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -49,14 +81,11 @@ async def create_customer(customer: schemas.CustomerCreate, db: DBSession):
         )
     
     # Verificar que el SupportRepId existe si se proporciona
-    if customer.SupportRepId:
-        from app.crud import employee
-        support_rep = await employee.get_employee(db, customer.SupportRepId)
-        if not support_rep:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="El empleado de soporte especificado no existe"
-            )
+    if customer.SupportRepId and not support_rep:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="El empleado de soporte especificado no existe"
+        )
     
     return await crud.create_customer(db, customer)
 
@@ -68,24 +97,28 @@ async def update_customer(
     db: DBSession
 ):
     """Actualiza un cliente existente"""
+    # Email y empleado de soporte se validan en paralelo
+    existing_customer, support_rep = await fanout.gather(
+        db,
+        (lambda session: crud.get_customer_by_email(session, customer_update.Email))
+        if customer_update.Email else None,
+        (lambda session: employee.get_employee(session, customer_update.SupportRepId))
+        if customer_update.SupportRepId else None,
+    )
+    
     # Verificar si el email ya está en uso por otro cliente
-    if customer_update.Email:
-        existing_customer = await crud.get_customer_by_email(db, customer_update.Email)
-        if existing_customer and existing_customer.CustomerId != customer_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Ya existe otro cliente con este email"
-            )
+    if existing_customer and existing_customer.CustomerId != customer_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya existe otro cliente con este email"
+        )
     
     # Verificar que el SupportRepId existe si se proporciona
-    if customer_update.SupportRepId:
-        from app.crud import employee
-        support_rep = await employee.get_employee(db, customer_update.SupportRepId)
-        if not support_rep:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="El empleado de soporte especificado no existe"
-            )
+    if customer_update.SupportRepId and not support_rep:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="El empleado de soporte especificado no existe"
+        )
     
     customer = await crud.update_customer(db, customer_id, customer_update)
     if not customer:
@@ -0,0 +1,145 @@
+"""Exportaciones masivas en streaming (NDJSON, CSV o MessagePack).
+
+La compresión (gzip/brotli/zstd según Accept-Encoding) la aplica lote a
+lote el middleware de app/negotiation.py.
+"""
+import csv
+import io
+import json
+from contextlib import aclosing
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Literal, Sequence
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from app.config import get_settings
+from app.database import read_session
+from app.serialization import MSGPACK_MEDIA_TYPE, dumps_msgpack, msgpack
+from app.crud import export as crud
+
+router = APIRouter()
+settings = get_settings()
+
+ExportFormat = Literal["ndjson", "csv", "msgpack"]
+
+_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "msgpack": MSGPACK_MEDIA_TYPE,  # un mapa por fila, concatenados
+}
+
+
+def _plain(value):
+    """Decimal y fechas como texto, igual que en las respuestas JSON de la API"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_ndjson(columns: list[str], rows: Sequence) -> str:
+    return "".join(
+        json.dumps({c: _plain(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _encode_msgpack(columns: list[str], rows: Sequence) -> bytes:
+    return b"".join(dumps_msgpack(dict(zip(columns, row))) for row in rows)
+
+
+def _encode_csv(rows: Sequence) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_plain(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+_ENCODERS = {
+    "ndjson": _encode_ndjson,
+    "csv": lambda columns, rows: _encode_csv(rows),
+    "msgpack": _encode_msgpack,
+}
+
+
+async def _stream(request: Request, query: Select, fmt: ExportFormat) -> AsyncIterator[str | bytes]:
+    """Escribe la exportación lote a lote con su propia sesión.
+
+    La sesión de `get_db` se cierra antes de que empiece a enviarse el cuerpo,
+    por eso el generador abre la suya.
+    """
+    columns = [column.name for column in query.selected_columns]
+    encode = _ENCODERS[fmt]
+    if fmt == "csv":
+        yield _encode_csv([columns])
+    
+    async with read_session() as session:
+        batches = crud.stream_rows(session, query, settings.EXPORT_BATCH_SIZE)
+        async with aclosing(batches):
+            async for rows in batches:
+                if await request.is_disconnected():
+                    break
+                yield encode(columns, rows)
+
+
+def _response(request: Request, query: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    if fmt == "msgpack" and msgpack is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Formato msgpack no disponible (falta el paquete msgpack)"
+        )
+    return StreamingResponse(
+        _stream(request, query, fmt),
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+@router.get("/invoices")
+async def export_invoices(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Formato de salida"),
+    customer_id: int | None = Query(None, description="Filtrar por cliente"),
+    employee_id: int | None = Query(None, description="Filtrar por empleado"),
+    start_date: date | None = Query(None, description="Desde esta fecha (inclusive)"),
+    end_date: date | None = Query(None, description="Hasta esta fecha (inclusive)"),
+):
+    """Exporta todas las facturas que cumplen los filtros, sin paginar"""
+    query = crud.invoices_query(customer_id, employee_id, start_date, end_date)
+    return _response(request, query, format, "invoices")
+
+
+@router.get("/invoice-lines")
+async def export_invoice_lines(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Formato de salida"),
+    customer_id: int | None = Query(None, description="Filtrar por cliente"),
+    employee_id: int | None = Query(None, description="Filtrar por empleado"),
+    start_date: date | None = Query(None, description="Desde esta fecha (inclusive)"),
+    end_date: date | None = Query(None, description="Hasta esta fecha (inclusive)"),
+):
+    """Exporta las líneas de las facturas que cumplen los filtros"""
+    query = crud.invoice_lines_query(customer_id, employee_id, start_date, end_date)
+    return _response(request, query, format, "invoice-lines")
+
+
+@router.get("/customers")
+async def export_customers(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Formato de salida"),
+):
+    """Exporta todos los clientes"""
+    return _response(request, crud.customers_query(), format, "customers")
+
+
+@router.get("/tracks")
+async def export_tracks(
+    request: Request,
+    format: ExportFormat = Query("ndjson", description="Formato de salida"),
+    album_id: int | None = Query(None, description="Filtrar por álbum"),
+    genre_id: int | None = Query(None, description="Filtrar por género"),
+):
+    """Exporta todos los tracks que cumplen los filtros"""
+    return _response(request, crud.tracks_query(album_id, genre_id), format, "tracks")
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, HTTPException
-from app.api.deps import DBSession
+from app.api.deps import ReadDBSession
+from app.api.http_cache import catalog_route
+from app.config import get_settings
 from app.schemas import genre as schemas
 from app.crud import genre as crud
 
-router = APIRouter()
+settings = get_settings()
+router = APIRouter(route_class=catalog_route(settings.GENRES_MAX_AGE))
 
 
 @router.get("/", response_model=schemas.GenreList)
-async def list_genres(db: DBSession):
+async def list_genres(db: ReadDBSession):
     """Lista todos los géneros musicales"""
     genres, total = await crud.get_genres(db)
     
@@ -18,7 +21,7 @@ async def list_genres(db: DBSession):
 
 
 @router.get("/{genre_id}", response_model=schemas.Genre)
-async def get_genre(genre_id: int, db: DBSession):
+async def get_genre(genre_id: int, db: ReadDBSession):
     """Obtiene un género por ID"""
     genre = await crud.get_genre(db, genre_id)
     if not genre:
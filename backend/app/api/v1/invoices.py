@@ -1,33 +1,49 @@
+from datetime import date
 from fastapi import APIRouter, HTTPException, Query, status
-from app.api.deps import DBSession
+from app.api.deps import DBSession, ReadDBSession
+from app.config import get_settings
 from app.schemas import invoice as schemas
-from app.crud import invoice as crud, customer as customer_crud, employee as employee_crud
+from app.serialization import list_response, row_to_dict
+from app.crud import invoice as crud, customer as customer_crud, employee as employee_crud, fanout
+from app.crud.counting import CountStrategy
+from app.crud.pagination import InvalidCursorError
 
 router = APIRouter()
+settings = get_settings()
 
 
 @router.get("/", response_model=schemas.InvoiceList)
 async def list_invoices(
-    db: DBSession,
+    db: ReadDBSession,
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(50, ge=1, le=100, description="Items por página"),
     customer_id: int | None = Query(None, description="Filtrar por cliente"),
-    employee_id: int | None = Query(None, description="Filtrar por empleado")
+    employee_id: int | None = Query(None, description="Filtrar por empleado"),
+    start_date: date | None = Query(None, description="Desde esta fecha (inclusive)"),
+    end_date: date | None = Query(None, description="Hasta esta fecha (inclusive)"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+    include_total: bool = Query(True, description="Calcular el total de resultados"),
 ):
     """Lista todas las facturas con paginación y filtros opcionales"""
     skip = (page - 1) * page_size
-    invoices, total = await crud.get_invoices(db, skip, page_size, customer_id, employee_id)
+    count = None if include_total else CountStrategy.NONE
+    try:
+        invoices, total, next_cursor = await crud.get_invoices(
+            db, skip, page_size, customer_id, employee_id, cursor, count,
+            start_date=start_date, end_date=end_date,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    return schemas.InvoiceList(
-        invoices=invoices,
-        total=total,
-        page=page,
-        page_size=page_size
+    return list_response(
+        "invoices",
+        [row_to_dict(invoice, schemas.Invoice) for invoice in invoices],
+        total, page, page_size, next_cursor,
     )
 
 
 @router.get("/{invoice_id}", response_model=schemas.InvoiceDetail)
-async def get_invoice(invoice_id: int, db: DBSession):
+async def get_invoice(invoice_id: int, db: ReadDBSession):
     """Obtiene una factura por ID con todos sus detalles"""
     invoice = await crud.get_invoice_detail(db, invoice_id)
     if not invoice:
@@ -41,8 +57,15 @@ async def get_invoice(invoice_id: int, db: DBSession):
 @router.post("/", response_model=schemas.InvoiceDetail, status_code=status.HTTP_201_CREATED)
 async def create_invoice(invoice: schemas.InvoiceCreate, db: DBSession):
     """Crea una nueva factura"""
+    # Cliente y empleado (si se proporciona) se buscan en paralelo
+    customer, employee = await fanout.gather(
+        db,
+        lambda session: customer_crud.get_customer(session, invoice.CustomerId),
+        (lambda session: employee_crud.get_employee(session, invoice.EmployeeId))
+        if invoice.EmployeeId else None,
+    )
+    
     # Verificar que el cliente existe
-    customer = await customer_crud.get_customer(db, invoice.CustomerId)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,19 +73,20 @@ async def create_invoice(invoice: schemas.InvoiceCreate, db: DBSession):
         )
     
     # Verificar que el empleado existe si se proporciona
-    if invoice.EmployeeId:
-        employee = await employee_crud.get_employee(db, invoice.EmployeeId)
-        if not employee:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Empleado no encontrado"
-            )
+    if invoice.EmployeeId and not employee:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Empleado no encontrado"
+        )
     
     try:
-        created_invoice = await crud.create_invoice(db, invoice)
-        # Obtener detalle completo
-        invoice_detail = await crud.get_invoice_detail(db, created_invoice.InvoiceId)
-        return invoice_detail
+        # El detalle se arma en memoria, sin releer la factura
+        return await crud.create_invoice(
+            db,
+            invoice,
+            customer_name=f"{customer.FirstName} {customer.LastName}",
+            employee_name=f"{employee.FirstName} {employee.LastName}" if employee else None,
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,28 +94,65 @@ async def create_invoice(invoice: schemas.InvoiceCreate, db: DBSession):
         )
 
 
+@router.post("/bulk", response_model=schemas.InvoiceBulkResponse)
+async def create_invoices_bulk(
+    payload: schemas.InvoiceBulkCreate,
+    db: DBSession,
+    batch_size: int | None = Query(None, ge=1, le=10000, description="Facturas por transacción"),
+):
+    """Crea muchas facturas de una vez (importaciones).
+
+    Cada factura se valida y guarda por separado en cuanto a resultados: las
+    que fallan se reportan con su error sin impedir que se creen las demás.
+    """
+    if len(payload.invoices) > settings.BULK_INVOICE_MAX_RECORDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo {settings.BULK_INVOICE_MAX_RECORDS} facturas por carga"
+        )
+    
+    results = await crud.create_invoices_bulk(db, payload.invoices, batch_size=batch_size)
+    created = sum(1 for result in results if result.success)
+    return schemas.InvoiceBulkResponse(
+        results=results,
+        created=created,
+        failed=len(results) - created
+    )
+
+
 @router.get("/customer/{customer_id}/history", response_model=schemas.InvoiceList)
 async def get_customer_purchase_history(
     customer_id: int,
-    db: DBSession,
+    db: ReadDBSession,
     page: int = Query(1, ge=1),
-    page_size: int = Query(50, ge=1, le=100)
+    page_size: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True)
 ):
     """Obtiene historial de compras de un cliente"""
+    skip = (page - 1) * page_size
+    count = None if include_total else CountStrategy.NONE
+    try:
+        # El cliente se verifica en paralelo con la página del historial
+        customer, (invoices, total, next_cursor) = await fanout.gather(
+            db,
+            lambda session: customer_crud.get_customer(session, customer_id),
+            lambda session: crud.get_customer_purchase_history(
+                session, customer_id, skip, page_size, cursor, count
+            ),
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
     # Verificar que el cliente existe
-    customer = await customer_crud.get_customer(db, customer_id)
     if not customer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Cliente no encontrado"
         )
     
-    skip = (page - 1) * page_size
-    invoices, total = await crud.get_customer_purchase_history(db, customer_id, skip, page_size)
-    
-    return schemas.InvoiceList(
-        invoices=invoices,
-        total=total,
-        page=page,
-        page_size=page_size
+    return list_response(
+        "invoices",
+        [row_to_dict(invoice, schemas.Invoice) for invoice in invoices],
+        total, page, page_size, next_cursor,
     )
\ No newline at end of file
@@ -0,0 +1,140 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from app.api.deps import DBSession, ReadDBSession
+from app.config import get_settings
+from app import playlists
+from app.schemas import playlist as schemas
+from app.schemas.track import Track
+from app.serialization import list_response, row_to_dict
+from app.crud import playlist as crud
+from app.crud.counting import CountStrategy
+from app.crud.pagination import InvalidCursorError
+
+router = APIRouter()
+settings = get_settings()
+
+
+def _summary(playlist, totals: tuple[int, int] | None = None) -> dict:
+    track_count, milliseconds = totals or playlists.totals.get(playlist.PlaylistId)
+    return row_to_dict(
+        playlist,
+        schemas.PlaylistSummary,
+        track_count=track_count,
+        total_milliseconds=milliseconds,
+    )
+
+
+async def _get_playlist_or_404(db, playlist_id: int):
+    playlist = await crud.get_playlist(db, playlist_id)
+    if not playlist:
+        raise HTTPException(status_code=404, detail="Playlist no encontrada")
+    return playlist
+
+
+def _check_size(payload: schemas.PlaylistTracksUpdate) -> None:
+    if len(payload.TrackIds) > settings.PLAYLIST_BULK_MAX_TRACKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo {settings.PLAYLIST_BULK_MAX_TRACKS} tracks por operación"
+        )
+
+
+@router.get("/", response_model=schemas.PlaylistList)
+async def list_playlists(
+    db: ReadDBSession,
+    page: int = Query(1, ge=1, description="Número de página"),
+    page_size: int = Query(50, ge=1, le=100, description="Items por página"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+    include_total: bool = Query(True, description="Calcular el total de resultados"),
+):
+    """Lista las playlists con su cantidad de tracks y duración total"""
+    skip = (page - 1) * page_size
+    count = None if include_total else CountStrategy.NONE
+    
+    try:
+        items, total, next_cursor = await crud.get_playlists(db, skip, page_size, cursor, count)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return list_response("playlists", [_summary(p) for p in items], total, page, page_size, next_cursor)
+
+
+@router.get("/{playlist_id}", response_model=schemas.PlaylistSummary)
+async def get_playlist(playlist_id: int, db: ReadDBSession):
+    """Obtiene una playlist con su cantidad de tracks y duración total"""
+    playlist = await _get_playlist_or_404(db, playlist_id)
+    return _summary(playlist, await playlists.current(db, playlist_id))
+
+
+@router.get("/{playlist_id}/tracks", response_model=schemas.PlaylistTrackList)
+async def list_playlist_tracks(
+    playlist_id: int,
+    db: ReadDBSession,
+    page: int = Query(1, ge=1, description="Número de página"),
+    page_size: int = Query(100, ge=1, le=1000, description="Items por página"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+):
+    """Tracks de una playlist por TrackId; con cursor el costo no depende de la profundidad"""
+    await _get_playlist_or_404(db, playlist_id)
+    skip = (page - 1) * page_size
+    
+    try:
+        tracks, next_cursor = await crud.get_playlist_tracks(db, playlist_id, skip, page_size, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    total, _ = await playlists.current(db, playlist_id)
+    items = [row_to_dict(track, Track) for track in tracks]
+    return list_response("tracks", items, total, page, page_size, next_cursor)
+
+
+@router.post("/", response_model=schemas.PlaylistSummary, status_code=status.HTTP_201_CREATED)
+async def create_playlist(playlist: schemas.PlaylistCreate, db: DBSession):
+    """Crea una playlist vacía"""
+    db_playlist = await crud.create_playlist(db, playlist)
+    await playlists.ensure_ready(db)
+    return _summary(db_playlist)
+
+
+@router.post("/{playlist_id}/tracks", response_model=schemas.PlaylistTracksAdded)
+async def add_playlist_tracks(
+    playlist_id: int,
+    payload: schemas.PlaylistTracksUpdate,
+    db: DBSession,
+):
+    """Agrega tracks a una playlist en una sola sentencia.
+
+    Los tracks que ya estaban (o repetidos en el request) se ignoran y los
+    que no existen se informan en `missing`.
+    """
+    _check_size(payload)
+    await _get_playlist_or_404(db, playlist_id)
+    
+    added, missing = await crud.add_tracks(db, playlist_id, payload.TrackIds)
+    track_count, milliseconds = (await playlists.ensure_ready(db)).get(playlist_id)
+    return schemas.PlaylistTracksAdded(
+        added=added,
+        ignored=len(payload.TrackIds) - added - len(missing),
+        missing=missing,
+        track_count=track_count,
+        total_milliseconds=milliseconds,
+    )
+
+
+@router.delete("/{playlist_id}/tracks", response_model=schemas.PlaylistTracksRemoved)
+async def remove_playlist_tracks(
+    playlist_id: int,
+    payload: schemas.PlaylistTracksUpdate,
+    db: DBSession,
+):
+    """Quita tracks de una playlist en una sola sentencia (TrackIds en el cuerpo)"""
+    _check_size(payload)
+    await _get_playlist_or_404(db, playlist_id)
+    
+    removed = await crud.remove_tracks(db, playlist_id, payload.TrackIds)
+    track_count, milliseconds = (await playlists.ensure_ready(db)).get(playlist_id)
+    return schemas.PlaylistTracksRemoved(
+        removed=removed,
+        ignored=len(payload.TrackIds) - removed,
+        track_count=track_count,
+        total_milliseconds=milliseconds,
+    )
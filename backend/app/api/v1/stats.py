@@ -0,0 +1,61 @@
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query, status
+from app.api.deps import ReadDBSession
+from app.schemas import stats as schemas
+from app.crud import stats as crud
+
+router = APIRouter()
+
+
+@router.get("/top-tracks", response_model=schemas.TopTracksResponse)
+async def top_tracks(
+    db: ReadDBSession,
+    limit: int = Query(10, ge=1, le=100, description="Cantidad de tracks"),
+):
+    """Tracks más vendidos"""
+    tracks = await crud.get_top_tracks(db, limit)
+    return schemas.TopTracksResponse(tracks=tracks, limit=limit)
+
+
+@router.get("/top-genres", response_model=schemas.TopGenresResponse)
+async def top_genres(
+    db: ReadDBSession,
+    limit: int = Query(10, ge=1, le=100, description="Cantidad de géneros"),
+):
+    """Géneros más vendidos"""
+    genres = await crud.get_top_genres(db, limit)
+    return schemas.TopGenresResponse(genres=genres, limit=limit)
+
+
+@router.get("/top-customers", response_model=schemas.TopCustomersResponse)
+async def top_customers(
+    db: ReadDBSession,
+    limit: int = Query(10, ge=1, le=100, description="Cantidad de clientes"),
+):
+    """Clientes con mayor gasto"""
+    customers = await crud.get_top_customers(db, limit)
+    return schemas.TopCustomersResponse(customers=customers, limit=limit)
+
+
+@router.get("/sales-by-employee", response_model=schemas.SalesByEmployeeResponse)
+async def sales_by_employee(db: ReadDBSession):
+    """Ventas totales por empleado"""
+    sales = await crud.get_sales_by_employee(db)
+    return schemas.SalesByEmployeeResponse(sales=sales)
+
+
+@router.get("/monthly-sales", response_model=schemas.MonthlySalesResponse)
+async def monthly_sales(
+    db: ReadDBSession,
+    start_date: date | None = Query(None, description="Desde este mes (inclusive)"),
+    end_date: date | None = Query(None, description="Hasta este mes (inclusive)"),
+):
+    """Ventas totales por mes"""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date debe ser anterior a end_date"
+        )
+    
+    sales = await crud.get_monthly_sales(db, start_date, end_date)
+    return schemas.MonthlySalesResponse(sales=sales, start_date=start_date, end_date=end_date)
@@ -1,65 +1,111 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.api.deps import DBSession
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import BatchIds, ReadDBSession
+from app.api.http_cache import catalog_route
+from app.config import get_settings
 from app.schemas import track as schemas
-from app.crud import track as crud
+from app.schemas.album import Album
+from app.serialization import FastJSONResponse, batch_response, list_response, row_to_dict
+from app.crud import track as crud, album as album_crud, artist as artist_crud, genre as genre_crud
+from app.crud.counting import CountStrategy
+from app.crud.pagination import InvalidCursorError
 
-router = APIRouter()
+settings = get_settings()
+router = APIRouter(route_class=catalog_route(settings.CATALOG_MAX_AGE))
+# Las recomendaciones cambian con cada venta y no con el catálogo: su router
+# no lleva los validadores HTTP (ETag) del catálogo
+recommendations_router = APIRouter()
+
+
+async def _serialize_tracks(db: AsyncSession, tracks: list) -> list[dict]:
+    """Tracks con álbum, nombre de artista y de género desde la caché del catálogo"""
+    albums = await album_crud.get_albums_by_ids(db, {t.AlbumId for t in tracks if t.AlbumId})
+    artists = await artist_crud.get_artists_by_ids(db, {a.ArtistId for a in albums.values()})
+    genres = await genre_crud.get_genres_by_id(db)
+    
+    tracks_detail = []
+    for track in tracks:
+        album = albums.get(track.AlbumId)
+        artist = artists.get(album.ArtistId) if album else None
+        genre = genres.get(track.GenreId)
+        tracks_detail.append(row_to_dict(
+            track,
+            schemas.TrackDetail,
+            album=row_to_dict(album, Album) if album else None,
+            artist_name=artist.Name if artist else None,
+            genre_name=genre.Name if genre else None,
+        ))
+    return tracks_detail
 
 
 @router.get("/", response_model=schemas.TrackList)
 async def list_tracks(
-    db: DBSession,
+    db: ReadDBSession,
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(50, ge=1, le=100, description="Items por página"),
     album_id: int | None = Query(None, description="Filtrar por álbum"),
     genre_id: int | None = Query(None, description="Filtrar por género"),
-    search: str | None = Query(None, description="Buscar por nombre")
+    search: str | None = Query(None, description="Buscar por nombre"),
+    cursor: str | None = Query(None, description="Cursor de la página siguiente (reemplaza a page)"),
+    include_total: bool = Query(True, description="Calcular el total de resultados"),
+    fuzzy: bool = Query(False, description="Tolerar errores de tipeo en la búsqueda"),
 ):
     """Lista todos los tracks con paginación, filtros y búsqueda"""
     skip = (page - 1) * page_size
+    count = None if include_total else CountStrategy.NONE
     
-    if search:
-        tracks, total = await crud.search_tracks(db, search, skip, page_size)
-    else:
-        tracks, total = await crud.get_tracks(db, skip, page_size, album_id, genre_id)
+    try:
+        if search:
+            tracks, total, next_cursor = await crud.search_tracks(db, search, skip, page_size, cursor, count, fuzzy)
+        else:
+            tracks, total, next_cursor = await crud.get_tracks(
+                db, skip, page_size, album_id, genre_id, cursor, count
+            )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Enriquecer con nombres de artista y género
-    tracks_detail = []
-    for track in tracks:
-        track_dict = schemas.TrackDetail.model_validate(track).model_dump()
-        
-        # Agregar nombre del artista
-        if track.album and track.album.artist:
-            track_dict["artist_name"] = track.album.artist.Name
-        
-        # Agregar nombre del género
-        if track.genre:
-            track_dict["genre_name"] = track.genre.Name
-        
-        tracks_detail.append(schemas.TrackDetail(**track_dict))
+    tracks_detail = await _serialize_tracks(db, tracks)
     
-    return schemas.TrackList(
-        tracks=tracks_detail,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    return list_response("tracks", tracks_detail, total, page, page_size, next_cursor)
+
+
+@router.get("/batch", response_model=schemas.TrackBatch)
+async def get_tracks_batch(ids: BatchIds, db: ReadDBSession):
+    """Obtiene varios tracks por ID (?ids=3,1,2) en el orden pedido.
+
+    Una consulta para los tracks y una carga de álbumes, artistas y géneros
+    para todo el lote; los IDs que no existen se informan en `missing`.
+    """
+    tracks = await crud.get_tracks_by_ids(db, ids)
+    tracks_detail = await _serialize_tracks(db, list(tracks.values()))
+    return batch_response("tracks", ids, {track["TrackId"]: track for track in tracks_detail})
 
 
 @router.get("/{track_id}", response_model=schemas.TrackDetail)
-async def get_track(track_id: int, db: DBSession):
+async def get_track(track_id: int, db: ReadDBSession):
     """Obtiene un track por ID con todas sus relaciones"""
     track = await crud.get_track(db, track_id)
     if not track:
         raise HTTPException(status_code=404, detail="Track no encontrado")
     
     # Enriquecer con nombres
-    track_dict = schemas.TrackDetail.model_validate(track).model_dump()
-    
-    if track.album and track.album.artist:
-        track_dict["artist_name"] = track.album.artist.Name
-    
-    if track.genre:
-        track_dict["genre_name"] = track.genre.Name
+    tracks_detail = await _serialize_tracks(db, [track])
+    return FastJSONResponse(tracks_detail[0])
+
+
+@recommendations_router.get("/{track_id}/recommendations", response_model=schemas.TrackRecommendations)
+async def get_track_recommendations(
+    track_id: int,
+    db: ReadDBSession,
+    limit: int = Query(10, ge=1, le=settings.RECOMMENDATIONS_TOP_K, description="Cantidad de recomendaciones"),
+):
+    """Tracks que más compraron quienes compraron este track"""
+    track, neighbors = await crud.get_recommended_tracks(db, track_id, limit)
+    if not track:
+        raise HTTPException(status_code=404, detail="Track no encontrado")
     
-    return schemas.TrackDetail(**track_dict)
\ No newline at end of file
+    tracks_detail = await _serialize_tracks(db, [neighbor for neighbor, _ in neighbors])
+    for detail, (_, co_purchases) in zip(tracks_detail, neighbors):
+        detail["co_purchases"] = co_purchases
+    return FastJSONResponse({"TrackId": track_id, "recommendations": tracks_detail})
@@ -0,0 +1,183 @@
+"""Caché en proceso (TTL + LRU) para los datos de referencia del catálogo"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import get_settings
+from app.models import CatalogVersion
+
+settings = get_settings()
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Caché LRU con expiración por entrada y contadores de aciertos/fallos"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna el valor cacheado o `default` si no existe o venció"""
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Elimina una entrada, o todas si no se indica `key`"""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Lectura a través de la caché: carga y guarda el valor si falta"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    async def get_many(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[list[Hashable]], Awaitable[dict[Hashable, Any]]],
+    ) -> dict[Hashable, Any]:
+        """Lectura a través de la caché para varias claves con una sola carga"""
+        found = {}
+        missing = []
+        for key in set(keys):
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            loaded = await loader(missing)
+            for key, value in loaded.items():
+                self.set(key, value)
+            found.update(loaded)
+        return found
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+# Géneros y tipos de medio se cachean como una sola entrada con la tabla completa
+genres = TTLCache("genres", maxsize=1, ttl=settings.CACHE_TTL)
+media_types = TTLCache("media_types", maxsize=1, ttl=settings.CACHE_TTL)
+# Artistas y álbumes se cachean por id
+artists = TTLCache("artists", maxsize=settings.CACHE_MAX_ITEMS, ttl=settings.CACHE_TTL)
+albums = TTLCache("albums", maxsize=settings.CACHE_MAX_ITEMS, ttl=settings.CACHE_TTL)
+
+_caches = (genres, media_types, artists, albums)
+
+# Versión del catálogo para los validadores HTTP (ETag / Last-Modified): la
+# fila de CatalogVersion, que los triggers de las tablas del catálogo
+# incrementan con cada escritura. Todos los workers la leen de la base, así
+# dan los mismos validadores para los mismos datos y ven los cambios hechos
+# por otros procesos o por SQL. None mientras no se pudo leer.
+_catalog_version: tuple[int, int] | None = None  # (versión, modificación en epoch)
+
+
+async def refresh_catalog_version(session_factory: async_sessionmaker) -> None:
+    """Relee la versión del catálogo; si cambió, vacía las cachés en proceso"""
+    global _catalog_version
+    async with session_factory() as session:
+        result = await session.execute(
+            select(CatalogVersion.Version, CatalogVersion.Modified).where(CatalogVersion.Id == 1)
+        )
+        row = result.one_or_none()
+    version = (row.Version, row.Modified) if row else None
+    if version != _catalog_version:
+        for cache in _caches:
+            cache.invalidate()
+    _catalog_version = version
+
+
+async def run_catalog_version_checks(session_factory: async_sessionmaker, interval: float) -> None:
+    """Relee la versión del catálogo cada `interval` segundos (tarea de fondo)"""
+    global _catalog_version
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh_catalog_version(session_factory)
+        except Exception as e:
+            if _catalog_version is not None:
+                print(f"⚠️ No se pudo leer la versión del catálogo: {e}")
+            # Sin versión conocida las respuestas salen sin validadores
+            _catalog_version = None
+
+
+def catalog_etag() -> str | None:
+    if _catalog_version is None:
+        return None
+    return f'W/"catalog-{_catalog_version[0]}"'
+
+
+def catalog_last_modified() -> float | None:
+    """Momento (epoch) de la última modificación del catálogo"""
+    if _catalog_version is None:
+        return None
+    return float(_catalog_version[1])
+
+
+# Hooks de invalidación: todo endpoint que escriba en el catálogo debe
+# llamarlos para que este worker no espere a la siguiente lectura de la versión
+def invalidate_genres() -> None:
+    genres.invalidate()
+
+
+def invalidate_media_types() -> None:
+    media_types.invalidate()
+
+
+def invalidate_artist(artist_id: int | None = None) -> None:
+    artists.invalidate(artist_id)
+
+
+def invalidate_album(album_id: int | None = None) -> None:
+    albums.invalidate(album_id)
+
+
+def invalidate_all() -> None:
+    for cache in _caches:
+        cache.invalidate()
+
+
+def cache_stats() -> dict:
+    """Estadísticas de todas las cachés del catálogo"""
+    return {cache.name: cache.stats() for cache in _caches}
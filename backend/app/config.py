@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal
 
 
 class Settings(BaseSettings):
@@ -11,10 +12,113 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    # URL completa (opcional); reemplaza a DB_*, p. ej. SQLite para benchmarks
+    DATABASE_URL: str | None = None
+    
+    # Pool de conexiones (por proceso/worker; ver app/pool.py)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # segundos de espera máxima en el checkout
+    DB_POOL_RECYCLE: int = 3600  # segundos
+    DB_POOL_PRE_PING: bool = True
+    # Pool de las lecturas en el primario (engine en autocommit). Sus conexiones
+    # se suman a las de arriba contra el mismo servidor; cada GET retiene una
+    # hasta terminar el request, sin transacción ni COMMIT
+    DB_READ_POOL_SIZE: int = 3
+    DB_READ_MAX_OVERFLOW: int = 2
+    # Conexiones extra por request para consultas independientes en paralelo
+    # (ver app/crud/fanout.py); 0 las ejecuta una detrás de otra
+    DB_FANOUT_MAX_CONNECTIONS: int = 2
+    # Sentencias compiladas que guarda cada engine (ver app/statements.py)
+    DB_QUERY_CACHE_SIZE: int = 500
+    
+    # Réplicas de lectura (ver app/replicas.py): URLs async separadas por coma.
+    # Sin réplicas todo va al primario
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_BALANCING: Literal["round_robin", "least_connections"] = "round_robin"
+    DB_REPLICA_HEALTH_INTERVAL: float = 5  # segundos entre chequeos
+    DB_REPLICA_HEALTH_TIMEOUT: float = 2  # segundos
+    DB_REPLICA_MAX_LAG: int | None = None  # segundos; requiere privilegio REPLICATION CLIENT
+    DB_REPLICA_STICKY_SECONDS: int = 5  # lecturas al primario tras una escritura del cliente
+    # Pool de cada réplica (en autocommit, como las lecturas en el primario)
+    DB_REPLICA_POOL_SIZE: int = 5
+    DB_REPLICA_MAX_OVERFLOW: int = 10
     
     # App
     APP_NAME: str = "Chinook Music Store"
     DEBUG: bool = True
+    # Endpoints /health/* con métricas internas (pools, réplicas, cachés);
+    # solo para redes internas o diagnóstico
+    HEALTH_DETAILS_ENABLED: bool = False
+    
+    # Perfilado de SQL por request (ver app/profiling.py); solo para diagnóstico
+    PROFILING_ENABLED: bool = False
+    PROFILING_BUFFER_SIZE: int = 200  # requests recientes guardados
+    PROFILING_REPEAT_THRESHOLD: int = 3  # repeticiones de una sentencia para marcarla como N+1
+    
+    # Log de SQL en JSON (ver app/sql_log.py); reemplaza al echo del engine.
+    # Se registran siempre las sentencias desde SQL_LOG_SLOW_MS (0: ninguna)
+    # y una fracción SQL_LOG_SAMPLE_RATE del resto
+    SQL_LOG_ENABLED: bool = True
+    SQL_LOG_SAMPLE_RATE: float = 0.0
+    SQL_LOG_SLOW_MS: float = 200
+    SQL_LOG_QUEUE_SIZE: int = 10000  # registros pendientes antes de descartar
+    SQL_LOG_FILE: str = ""  # vacío: stderr
+    
+    # Totales de los listados (ver app/crud/counting.py). "cached" y
+    # "estimated" son más baratos pero pueden devolver totales viejos
+    COUNT_STRATEGY: Literal["exact", "window", "cached", "estimated"] = "exact"
+    COUNT_CACHE_TTL: int = 60  # segundos
+    
+    # Caché en proceso del catálogo (ver app/cache.py)
+    CACHE_TTL: int = 300  # segundos
+    CACHE_MAX_ITEMS: int = 10000  # por tipo de entidad
+    
+    # Cache-Control de las respuestas del catálogo (ver app/api/http_cache.py)
+    CATALOG_MAX_AGE: int = 300  # artistas, álbumes y tracks (segundos)
+    GENRES_MAX_AGE: int = 3600  # géneros (segundos)
+    CATALOG_VERSION_INTERVAL: float = 2  # segundos entre lecturas de la versión del catálogo
+    
+    # Negociación de contenido (ver app/negotiation.py)
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"  # preferencia; vacío desactiva la compresión
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; las respuestas más chicas van sin comprimir
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_LEVEL: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    MSGPACK_ENABLED: bool = True  # Accept: application/msgpack (requiere msgpack)
+    
+    # Índice de búsqueda en memoria (ver app/search.py): cada worker tiene su
+    # copia y la reconstruye cada tantos segundos (0: solo al iniciar) para
+    # tomar el catálogo cambiado por SQL y los clientes de otros workers
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_INDEX_REBUILD_INTERVAL: int = 3600
+    
+    # Exportaciones en streaming: filas leídas por lote del cursor
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Carga masiva de facturas (POST /invoices/bulk)
+    BULK_INVOICE_MAX_RECORDS: int = 10000  # facturas por request
+    BULK_INVOICE_BATCH_SIZE: int = 500  # facturas por transacción
+    BULK_INSERT_CHUNK_SIZE: int = 1000  # filas por INSERT multi-fila
+    
+    # Playlists: TrackIds por operación de agregar/quitar y segundos entre
+    # reconstrucciones de los totales del listado (0: solo al iniciar)
+    PLAYLIST_BULK_MAX_TRACKS: int = 10000
+    PLAYLIST_TOTALS_REBUILD_INTERVAL: int = 60
+    
+    # Búsquedas por lote (GET /<recurso>/batch?ids=...): IDs por request
+    BATCH_MAX_IDS: int = 500
+    
+    # Agregados de ventas del API de estadísticas (ver app/stats.py): segundos
+    # entre reconstrucciones (0: solo al iniciar)
+    STATS_REBUILD_INTERVAL: int = 3600
+    
+    # Recomendaciones por co-compra (ver app/recommendations.py): vecinos
+    # guardados por track, segundos entre reconstrucciones (0: solo al iniciar)
+    # y segundos entre lotes de facturas nuevas sumadas a la matriz
+    RECOMMENDATIONS_TOP_K: int = 20
+    RECOMMENDATIONS_REBUILD_INTERVAL: int = 3600
+    RECOMMENDATIONS_UPDATE_INTERVAL: float = 5
     
     # Pydantic V2: usar model_config en lugar de class Config
     model_config = SettingsConfigDict(
@@ -26,7 +130,19 @@ class Settings(BaseSettings):
     @property
     def database_url(self) -> str:
         """Construye la URL de conexión async para MySQL"""
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+    
+    @property
+    def compression_encodings(self) -> list[str]:
+        """Content-Encodings ofrecidos, en orden de preferencia"""
+        return [name.strip() for name in self.COMPRESSION_ENCODINGS.split(",") if name.strip()]
+    
+    @property
+    def replica_urls(self) -> list[str]:
+        """URLs de las réplicas de lectura configuradas"""
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
 
 
 @lru_cache
@@ -1,3 +1,15 @@
-from app.crud import artist, album, track, genre, customer, employee, invoice
+from app.crud import artist, album, track, genre, media_type, customer, employee, invoice, playlist, export, stats
 
-__all__ = ["artist", "album", "track", "genre", "customer", "employee", "invoice"]
\ No newline at end of file
+__all__ = [
+    "artist",
+    "album",
+    "track",
+    "genre",
+    "media_type",
+    "customer",
+    "employee",
+    "invoice",
+    "playlist",
+    "export",
+    "stats",
+]
\ No newline at end of file
@@ -1,75 +1,94 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import selectinload
+from app import cache, search as search_index
 from app.models import Album
+from app.statements import Listing, bound_filters, listing
+from app.schemas.album import Album as AlbumSchema, AlbumDetail
+from app.crud.artist import get_artist
+from app.crud.counting import CountStrategy
+from app.crud.pagination import fetch_page, fetch_ranked_page
 
+# Orden de los listados; AlbumId desempata para la paginación por cursor
+ALBUM_ORDER = ((Album.Title, False), (Album.AlbumId, False))
 
-async def get_album(db: AsyncSession, album_id: int) -> Album | None:
-    """Obtiene un álbum por ID con su artista"""
-    result = await db.execute(
-        select(Album)
-        .options(selectinload(Album.artist))
-        .where(Album.AlbumId == album_id)
+# Filtros de los listados por nombre de parámetro
+ALBUM_FILTERS = {
+    "artist_id": lambda value: Album.ArtistId == value,
+    "search": lambda value: Album.Title.ilike(value),
+}
+
+# Sentencias preconstruidas (ver app.statements)
+ALBUMS_BY_IDS = select(Album).where(Album.AlbumId.in_(bindparam("album_ids", expanding=True)))
+
+
+def _albums_listing(params: dict) -> Listing:
+    """Listado de álbumes (con su artista) con los filtros presentes en `params`"""
+    return listing(
+        ("albums", *params),
+        lambda: select(Album).options(selectinload(Album.artist)),
+        lambda: bound_filters(ALBUM_FILTERS, params),
+        model=Album,
     )
-    return result.scalar_one_or_none()
+
+
+async def _load_albums(db: AsyncSession, album_ids: list[int]) -> dict[int, AlbumSchema]:
+    result = await db.execute(ALBUMS_BY_IDS, {"album_ids": list(album_ids)})
+    return {album.AlbumId: AlbumSchema.model_validate(album) for album in result.scalars()}
+
+
+async def get_albums_by_ids(db: AsyncSession, album_ids) -> dict[int, AlbumSchema]:
+    """Obtiene varios álbumes por ID (cacheados); los que no existen se omiten"""
+    return await cache.albums.get_many(album_ids, lambda missing: _load_albums(db, missing))
+
+
+async def get_album(db: AsyncSession, album_id: int) -> AlbumDetail | None:
+    """Obtiene un álbum por ID con su artista"""
+    album = (await get_albums_by_ids(db, [album_id])).get(album_id)
+    if not album:
+        return None
+    artist = await get_artist(db, album.ArtistId)
+    return AlbumDetail(**album.model_dump(), artist=artist)
 
 
 async def get_albums(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
-    artist_id: int | None = None
-) -> tuple[list[Album], int]:
+    artist_id: int | None = None,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+) -> tuple[list[Album], int | None, str | None]:
     """Obtiene lista de álbumes con paginación"""
-    # Base query
-    base_query = select(Album).options(selectinload(Album.artist))
-    
     # Filtro por artista si se especifica
+    params = {}
     if artist_id:
-        base_query = base_query.where(Album.ArtistId == artist_id)
-    
-    # Count
-    count_query = select(func.count(Album.AlbumId))
-    if artist_id:
-        count_query = count_query.where(Album.ArtistId == artist_id)
-    
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+        params["artist_id"] = artist_id
     
-    # Data
-    query = base_query.offset(skip).limit(limit).order_by(Album.Title)
-    result = await db.execute(query)
-    albums = result.scalars().all()
-    
-    return list(albums), total
+    return await fetch_page(
+        db, _albums_listing(params), params, ALBUM_ORDER, skip, limit, cursor, count=count,
+    )
 
 
 async def search_albums(
     db: AsyncSession,
     search: str,
     skip: int = 0,
-    limit: int = 50
-) -> tuple[list[Album], int]:
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+    fuzzy: bool = False,
+) -> tuple[list[Album], int | None, str | None]:
     """Busca álbumes por título"""
-    search_pattern = f"%{search}%"
+    if search_index.albums.ready:
+        return await fetch_ranked_page(
+            db, _albums_listing({}), Album.AlbumId, search_index.albums, search,
+            skip, limit, cursor, fuzzy, count,
+        )
     
-    # Count
-    count_query = select(func.count(Album.AlbumId)).where(
-        Album.Title.ilike(search_pattern)
-    )
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Sin índice (aún no construido o deshabilitado): ILIKE
+    params = {"search": f"%{search}%"}
     
-    # Data
-    query = (
-        select(Album)
-        .options(selectinload(Album.artist))
-        .where(Album.Title.ilike(search_pattern))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Album.Title)
+    return await fetch_page(
+        db, _albums_listing(params), params, ALBUM_ORDER, skip, limit, cursor, count=count,
     )
-    result = await db.execute(query)
-    albums = result.scalars().all()
-    
-    return list(albums), total
\ No newline at end of file
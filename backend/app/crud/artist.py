@@ -1,60 +1,82 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, select
+from app import cache, search as search_index
 from app.models import Artist
+from app.statements import Listing, bound_filters, listing
+from app.schemas.artist import Artist as ArtistSchema
+from app.crud.counting import CountStrategy
+from app.crud.pagination import fetch_page, fetch_ranked_page
 
+# Orden de los listados; ArtistId desempata para la paginación por cursor
+ARTIST_ORDER = ((Artist.Name, False), (Artist.ArtistId, False))
 
-async def get_artist(db: AsyncSession, artist_id: int) -> Artist | None:
-    """Obtiene un artista por ID"""
-    result = await db.execute(
-        select(Artist).where(Artist.ArtistId == artist_id)
+# Filtros de los listados por nombre de parámetro
+ARTIST_FILTERS = {
+    "search": lambda value: Artist.Name.ilike(value),
+}
+
+# Sentencias preconstruidas (ver app.statements)
+ARTISTS_BY_IDS = select(Artist).where(Artist.ArtistId.in_(bindparam("artist_ids", expanding=True)))
+
+
+def _artists_listing(params: dict) -> Listing:
+    """Listado de artistas con los filtros presentes en `params`"""
+    return listing(
+        ("artists", *params),
+        lambda: select(Artist),
+        lambda: bound_filters(ARTIST_FILTERS, params),
+        model=Artist,
     )
-    return result.scalar_one_or_none()
+
+
+async def _load_artists(db: AsyncSession, artist_ids: list[int]) -> dict[int, ArtistSchema]:
+    result = await db.execute(ARTISTS_BY_IDS, {"artist_ids": list(artist_ids)})
+    return {artist.ArtistId: ArtistSchema.model_validate(artist) for artist in result.scalars()}
+
+
+async def get_artists_by_ids(db: AsyncSession, artist_ids) -> dict[int, ArtistSchema]:
+    """Obtiene varios artistas por ID (cacheados); los que no existen se omiten"""
+    return await cache.artists.get_many(artist_ids, lambda missing: _load_artists(db, missing))
+
+
+async def get_artist(db: AsyncSession, artist_id: int) -> ArtistSchema | None:
+    """Obtiene un artista por ID"""
+    artists = await get_artists_by_ids(db, [artist_id])
+    return artists.get(artist_id)
 
 
 async def get_artists(
     db: AsyncSession,
     skip: int = 0,
-    limit: int = 50
-) -> tuple[list[Artist], int]:
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+) -> tuple[list[Artist], int | None, str | None]:
     """Obtiene lista de artistas con paginación"""
-    # Query para contar total
-    count_query = select(func.count(Artist.ArtistId))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Query para datos
-    query = select(Artist).offset(skip).limit(limit).order_by(Artist.Name)
-    result = await db.execute(query)
-    artists = result.scalars().all()
-    
-    return list(artists), total
+    return await fetch_page(
+        db, _artists_listing({}), {}, ARTIST_ORDER, skip, limit, cursor, count=count,
+    )
 
 
 async def search_artists(
     db: AsyncSession,
     search: str,
     skip: int = 0,
-    limit: int = 50
-) -> tuple[list[Artist], int]:
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+    fuzzy: bool = False,
+) -> tuple[list[Artist], int | None, str | None]:
     """Busca artistas por nombre"""
-    search_pattern = f"%{search}%"
+    if search_index.artists.ready:
+        return await fetch_ranked_page(
+            db, _artists_listing({}), Artist.ArtistId, search_index.artists, search,
+            skip, limit, cursor, fuzzy, count,
+        )
     
-    # Count
-    count_query = select(func.count(Artist.ArtistId)).where(
-        Artist.Name.ilike(search_pattern)
-    )
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Sin índice (aún no construido o deshabilitado): ILIKE
+    params = {"search": f"%{search}%"}
     
-    # Data
-    query = (
-        select(Artist)
-        .where(Artist.Name.ilike(search_pattern))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Artist.Name)
+    return await fetch_page(
+        db, _artists_listing(params), params, ARTIST_ORDER, skip, limit, cursor, count=count,
     )
-    result = await db.execute(query)
-    artists = result.scalars().all()
-    
-    return list(artists), total
\ No newline at end of file
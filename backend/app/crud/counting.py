@@ -0,0 +1,115 @@
+"""Estrategias para calcular el total de los listados paginados"""
+import time
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import statements
+from app.config import get_settings
+from app.statements import Listing
+
+settings = get_settings()
+
+# Máximo de firmas de filtros cacheadas por tabla
+_MAX_ENTRIES_PER_TABLE = 1024
+
+# tabla -> {firma de la consulta: (total, expira_en)}
+_count_cache: dict[str, dict[tuple, tuple[int, float]]] = {}
+
+
+class CountStrategy(str, Enum):
+    """Cómo se obtiene el total de un listado"""
+    EXACT = "exact"          # SELECT COUNT(*) en cada llamada
+    WINDOW = "window"        # COUNT(*) OVER() en la misma consulta de datos
+    CACHED = "cached"        # COUNT(*) cacheado por firma de filtros
+    ESTIMATED = "estimated"  # Estadísticas de la tabla (solo sin filtros)
+    NONE = "none"            # No calcular el total
+
+
+def default_strategy() -> CountStrategy:
+    """Estrategia configurada en Settings"""
+    return CountStrategy(settings.COUNT_STRATEGY)
+
+
+def invalidate_counts(*tables: str) -> None:
+    """Descarta los totales cacheados de las tablas modificadas.
+
+    Toda función CRUD que escribe en una tabla debe llamarla; las escrituras
+    hechas fuera de la API solo se reflejan al vencer COUNT_CACHE_TTL.
+    """
+    for table in tables:
+        _count_cache.pop(table, None)
+
+
+def _count_statement(listing: Listing) -> Select:
+    return statements.prepared(
+        (*listing.key, "count"),
+        lambda: select(func.count()).select_from(listing.model).where(*listing.filters),
+    )
+
+
+async def _exact_count(db: AsyncSession, listing: Listing, params: dict) -> int:
+    result = await db.execute(_count_statement(listing), params)
+    return result.scalar()
+
+
+async def _cached_count(db: AsyncSession, listing: Listing, params: dict) -> int:
+    table = listing.model.__tablename__
+    # Firma: la forma del listado más los valores de sus filtros
+    key = (listing.key, tuple(sorted(params.items())))
+    entries = _count_cache.setdefault(table, {})
+
+    cached = entries.get(key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+
+    total = await _exact_count(db, listing, params)
+
+    if len(entries) >= _MAX_ENTRIES_PER_TABLE:
+        entries.pop(next(iter(entries)))
+    entries[key] = (total, time.monotonic() + settings.COUNT_CACHE_TTL)
+    return total
+
+
+async def _estimated_count(db: AsyncSession, model: Any) -> int | None:
+    """Número aproximado de filas según information_schema (InnoDB)"""
+    if db.bind.dialect.name != "mysql":
+        return None
+    result = await db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table"
+        ),
+        {"table": model.__tablename__},
+    )
+    return result.scalar()
+
+
+async def count_rows(
+    db: AsyncSession,
+    listing: Listing,
+    params: dict,
+    strategy: CountStrategy | None = None,
+) -> int | None:
+    """Calcula el total de filas de `listing.model` que cumplen sus filtros
+    con los valores de `params`.
+
+    WINDOW se resuelve en `pagination.fetch_page`; si llega aquí (por ejemplo
+    en modo cursor) se cuenta de forma exacta. ESTIMATED solo aplica a
+    listados sin filtros; con filtros, o si no hay estadísticas, usa el
+    conteo cacheado.
+    """
+    strategy = strategy or default_strategy()
+
+    if strategy == CountStrategy.NONE:
+        return None
+    if strategy == CountStrategy.ESTIMATED and not listing.filters:
+        estimate = await _estimated_count(db, listing.model)
+        if estimate is not None:
+            return estimate
+        return await _cached_count(db, listing, params)
+    if strategy in (CountStrategy.CACHED, CountStrategy.ESTIMATED):
+        return await _cached_count(db, listing, params)
+    return await _exact_count(db, listing, params)
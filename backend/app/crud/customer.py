@@ -1,22 +1,61 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, select
+from app import search as search_index
 from app.models import Customer
+from app.statements import Listing, bound_filters, listing
 from app.schemas.customer import CustomerCreate, CustomerUpdate
+from app.crud.counting import CountStrategy, invalidate_counts
+from app.crud.pagination import fetch_page, fetch_ranked_page
+
+# Orden de los listados; CustomerId desempata para la paginación por cursor
+CUSTOMER_ORDER = (
+    (Customer.LastName, False),
+    (Customer.FirstName, False),
+    (Customer.CustomerId, False),
+)
+
+# Filtros de los listados por nombre de parámetro: búsqueda por nombre,
+# email o company
+CUSTOMER_FILTERS = {
+    "search": lambda value: (
+        (Customer.FirstName.ilike(value)) |
+        (Customer.LastName.ilike(value)) |
+        (Customer.Email.ilike(value)) |
+        (Customer.Company.ilike(value))
+    ),
+}
+
+# Sentencias preconstruidas (ver app.statements)
+CUSTOMER_BY_ID = select(Customer).where(Customer.CustomerId == bindparam("customer_id"))
+CUSTOMERS_BY_IDS = select(Customer).where(Customer.CustomerId.in_(bindparam("customer_ids", expanding=True)))
+CUSTOMER_BY_EMAIL = select(Customer).where(Customer.Email == bindparam("email"))
+
+
+def _customers_listing(params: dict) -> Listing:
+    """Listado de clientes con los filtros presentes en `params`"""
+    return listing(
+        ("customers", *params),
+        lambda: select(Customer),
+        lambda: bound_filters(CUSTOMER_FILTERS, params),
+        model=Customer,
+    )
 
 
 async def get_customer(db: AsyncSession, customer_id: int) -> Customer | None:
     """Obtiene un cliente por ID"""
-    result = await db.execute(
-        select(Customer).where(Customer.CustomerId == customer_id)
-    )
+    result = await db.execute(CUSTOMER_BY_ID, {"customer_id": customer_id})
     return result.scalar_one_or_none()
 
 
+async def get_customers_by_ids(db: AsyncSession, customer_ids) -> dict[int, Customer]:
+    """Obtiene varios clientes por ID en una consulta; los que no existen se omiten"""
+    result = await db.execute(CUSTOMERS_BY_IDS, {"customer_ids": list(set(customer_ids))})
+    return {customer.CustomerId: customer for customer in result.scalars()}
+
+
 async def get_customer_by_email(db: AsyncSession, email: str) -> Customer | None:
     """Obtiene un cliente por email"""
-    result = await db.execute(
-        select(Customer).where(Customer.Email == email)
-    )
+    result = await db.execute(CUSTOMER_BY_EMAIL, {"email": email})
     return result.scalar_one_or_none()
 
 
@@ -25,41 +64,25 @@ async def get_customers(
     skip: int = 0,
     limit: int = 50,
     search: str | None = None,
-) -> tuple[list[Customer], int]:
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+    fuzzy: bool = False,
+) -> tuple[list[Customer], int | None, str | None]:
     """Obtiene lista de clientes con paginación y búsqueda opcional"""
-    # Base query
-    base_query = select(Customer)
-    
-    # Búsqueda por nombre, email o company
-    if search:
-        search_pattern = f"%{search}%"
-        base_query = base_query.where(
-            (Customer.FirstName.ilike(search_pattern)) |
-            (Customer.LastName.ilike(search_pattern)) |
-            (Customer.Email.ilike(search_pattern)) |
-            (Customer.Company.ilike(search_pattern))
+    if search and search_index.customers.ready:
+        return await fetch_ranked_page(
+            db, _customers_listing({}), Customer.CustomerId, search_index.customers, search,
+            skip, limit, cursor, fuzzy, count,
         )
     
-    # Count
-    count_query = select(func.count(Customer.CustomerId))
+    # Sin índice de búsqueda (aún no construido o deshabilitado): ILIKE
+    params = {}
     if search:
-        search_pattern = f"%{search}%"
-        count_query = count_query.where(
-            (Customer.FirstName.ilike(search_pattern)) |
-            (Customer.LastName.ilike(search_pattern)) |
-            (Customer.Email.ilike(search_pattern)) |
-            (Customer.Company.ilike(search_pattern))
-        )
-    
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+        params["search"] = f"%{search}%"
     
-    # Data
-    query = base_query.offset(skip).limit(limit).order_by(Customer.LastName, Customer.FirstName)
-    result = await db.execute(query)
-    customers = result.scalars().all()
-    
-    return list(customers), total
+    return await fetch_page(
+        db, _customers_listing(params), params, CUSTOMER_ORDER, skip, limit, cursor, count=count,
+    )
 
 
 async def create_customer(db: AsyncSession, customer: CustomerCreate) -> Customer:
@@ -67,7 +90,9 @@ async def create_customer(db: AsyncSession, customer: CustomerCreate) -> Custome
     db_customer = Customer(**customer.model_dump())
     db.add(db_customer)
     await db.commit()
+    invalidate_counts(Customer.__tablename__)
     await db.refresh(db_customer)
+    search_index.index_customer(db_customer)
     return db_customer
 
 
@@ -87,7 +112,9 @@ async def update_customer(
         setattr(db_customer, field, value)
     
     await db.commit()
+    invalidate_counts(Customer.__tablename__)
     await db.refresh(db_customer)
+    search_index.index_customer(db_customer)
     return db_customer
 
 
@@ -99,4 +126,6 @@ async def delete_customer(db: AsyncSession, customer_id: int) -> bool:
     
     await db.delete(db_customer)
     await db.commit()
+    invalidate_counts(Customer.__tablename__)
+    search_index.remove_customer(customer_id)
     return True
\ No newline at end of file
@@ -0,0 +1,78 @@
+from datetime import date
+from typing import AsyncIterator, Sequence
+import anyio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Select, select
+from app.models import Invoice, InvoiceLine, Customer, Track
+from app.crud.invoice import invoice_filters
+
+
+def invoices_query(
+    customer_id: int | None = None,
+    employee_id: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Select:
+    """Facturas a exportar, con los mismos filtros que get_invoices"""
+    return (
+        select(*Invoice.__table__.columns)
+        .where(*invoice_filters(customer_id, employee_id, start_date, end_date))
+        .order_by(Invoice.InvoiceId)
+    )
+
+
+def invoice_lines_query(
+    customer_id: int | None = None,
+    employee_id: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Select:
+    """Líneas de las facturas que cumplen los filtros de get_invoices"""
+    query = select(*InvoiceLine.__table__.columns)
+    filters = invoice_filters(customer_id, employee_id, start_date, end_date)
+    if filters:
+        query = query.join(Invoice, Invoice.InvoiceId == InvoiceLine.InvoiceId).where(*filters)
+    return query.order_by(InvoiceLine.InvoiceLineId)
+
+
+def customers_query() -> Select:
+    """Todos los clientes"""
+    return select(*Customer.__table__.columns).order_by(Customer.CustomerId)
+
+
+def tracks_query(album_id: int | None = None, genre_id: int | None = None) -> Select:
+    """Tracks a exportar, con los mismos filtros que get_tracks"""
+    query = select(*Track.__table__.columns)
+    if album_id:
+        query = query.where(Track.AlbumId == album_id)
+    if genre_id:
+        query = query.where(Track.GenreId == genre_id)
+    return query.order_by(Track.TrackId)
+
+
+async def stream_rows(
+    db: AsyncSession,
+    query: Select,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence]:
+    """Recorre la consulta con un cursor del lado del servidor, por lotes.
+
+    La memoria usada es la de un lote sin importar cuántas filas haya. Si el
+    recorrido se corta antes del final (p. ej. el cliente se desconectó) la
+    conexión se descarta: cerrar un cursor de servidor obliga a leer todas
+    las filas que faltan.
+    """
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    completed = False
+    try:
+        async for partition in result.partitions():
+            yield partition
+        completed = True
+    finally:
+        # Blindado: si la tarea fue cancelada, igual hay que liberar la conexión
+        with anyio.CancelScope(shield=True):
+            if completed:
+                await result.close()
+            else:
+                connection = await db.connection()
+                await connection.invalidate()
@@ -0,0 +1,133 @@
+"""Consultas independientes de un mismo request en paralelo.
+
+Una AsyncSession no admite dos consultas a la vez, así que `gather` ejecuta
+la primera llamada en la sesión del request y las demás en sesiones
+hermanas (mismo engine, misma clase de sesión), cada una con su conexión
+del pool. El costo de las consultas se superpone en lugar de sumarse.
+
+Cada request puede tomar a lo sumo DB_FANOUT_MAX_CONNECTIONS conexiones
+extra. Si no quedan (o el pool no tiene conexiones libres) las llamadas que
+no entran se ejecutan una detrás de otra en la sesión del request, como
+antes: el fan-out nunca espera conexiones que otros requests necesitan.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import get_settings
+from app.pool import InstrumentedPool
+
+settings = get_settings()
+
+# Clave en `session.info` con las conexiones extra en uso por el request;
+# las sesiones hermanas comparten el mismo dict (fan-out anidado)
+_SLOTS_KEY = "fanout_slots"
+
+Query = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class FanoutStats:
+    """Contadores acumulados del fan-out (ver /health/pool)"""
+
+    def __init__(self):
+        self.batches = 0
+        self.parallel = 0  # llamadas ejecutadas en una sesión hermana
+        self.inline = 0    # llamadas que no consiguieron conexión extra
+
+    def snapshot(self) -> dict:
+        return {
+            "max_connections_per_request": settings.DB_FANOUT_MAX_CONNECTIONS,
+            "batches": self.batches,
+            "parallel": self.parallel,
+            "inline": self.inline,
+        }
+
+
+stats = FanoutStats()
+
+
+def _spare_connections(engine: AsyncEngine) -> int:
+    """Conexiones que el pool puede entregar sin hacer esperar a nadie"""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedPool):
+        # StaticPool/NullPool: sin límite conocido, mejor no multiplicar
+        return 0
+    max_overflow = pool.max_overflow
+    if max_overflow < 0:
+        return settings.DB_FANOUT_MAX_CONNECTIONS
+    return pool.size() + max_overflow - pool.checkedout()
+
+
+def _slots(db: AsyncSession) -> dict:
+    return db.info.setdefault(_SLOTS_KEY, {"in_use": 0})
+
+
+def _reserve(db: AsyncSession, wanted: int) -> int:
+    """Reserva hasta `wanted` conexiones extra para el request de `db`"""
+    slots = _slots(db)
+    granted = max(min(
+        wanted,
+        settings.DB_FANOUT_MAX_CONNECTIONS - slots["in_use"],
+        _spare_connections(db.bind),
+    ), 0)
+    slots["in_use"] += granted
+    return granted
+
+
+async def _run_apart(db: AsyncSession, call: Query) -> Any:
+    """Ejecuta `call` en una sesión hermana de `db`"""
+    async with AsyncSession(
+        db.bind,
+        sync_session_class=type(db.sync_session),
+        expire_on_commit=False,
+        info={_SLOTS_KEY: _slots(db)},
+    ) as session:
+        return await call(session)
+
+
+async def gather(db: AsyncSession, *calls: Query | None) -> list[Any]:
+    """Ejecuta consultas independientes en paralelo y retorna sus resultados
+    en el mismo orden.
+
+    Cada llamada recibe la sesión donde debe consultar y no puede depender
+    de las otras. None en lugar de una llamada da None (validaciones
+    opcionales). Los objetos que vienen de sesiones hermanas quedan
+    desligados de `db`: sirven para leer sus atributos, no para asignarlos
+    a relaciones de objetos de `db`.
+    """
+    pending = [index for index, call in enumerate(calls) if call is not None]
+    results: list[Any] = [None] * len(calls)
+    if not pending:
+        return results
+
+    granted = _reserve(db, len(pending) - 1)
+    apart, inline = pending[1:1 + granted], [pending[0], *pending[1 + granted:]]
+    stats.batches += 1
+    stats.parallel += len(apart)
+    stats.inline += len(inline) - 1
+
+    async def run_inline():
+        return [await calls[index](db) for index in inline]
+
+    try:
+        outcomes = await asyncio.gather(
+            run_inline(),
+            *(_run_apart(db, calls[index]) for index in apart),
+            return_exceptions=True,
+        )
+    finally:
+        _slots(db)["in_use"] -= granted
+
+    # Se espera a todas antes de propagar un error: ninguna sesión hermana
+    # queda abierta después de que el request termina
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+    inline_results, *apart_results = outcomes
+    for index, value in zip(inline, inline_results):
+        results[index] = value
+    for index, value in zip(apart, apart_results):
+        results[index] = value
+    return results
@@ -1,26 +1,29 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
+from app import cache
 from app.models import Genre
+from app.schemas.genre import Genre as GenreSchema
 
 
-async def get_genre(db: AsyncSession, genre_id: int) -> Genre | None:
+async def _load_genres(db: AsyncSession) -> dict[int, GenreSchema]:
+    result = await db.execute(select(Genre).order_by(Genre.Name))
+    return {genre.GenreId: GenreSchema.model_validate(genre) for genre in result.scalars()}
+
+
+async def get_genres_by_id(db: AsyncSession) -> dict[int, GenreSchema]:
+    """Todos los géneros indexados por ID, ordenados por nombre (cacheados)"""
+    return await cache.genres.get_or_load("all", lambda: _load_genres(db))
+
+
+async def get_genre(db: AsyncSession, genre_id: int) -> GenreSchema | None:
     """Obtiene un género por ID"""
-    result = await db.execute(
-        select(Genre).where(Genre.GenreId == genre_id)
-    )
-    return result.scalar_one_or_none()
+    genres = await get_genres_by_id(db)
+    return genres.get(genre_id)
 
 
-async def get_genres(db: AsyncSession) -> tuple[list[Genre], int]:
+async def get_genres(db: AsyncSession) -> tuple[list[GenreSchema], int]:
     """Obtiene todos los géneros (son pocos, no necesita paginación)"""
-    # Count
-    count_query = select(func.count(Genre.GenreId))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Data
-    query = select(Genre).order_by(Genre.Name)
-    result = await db.execute(query)
-    genres = result.scalars().all()
+    # Se traen todos, así que el total es el largo de la lista
+    genres = list((await get_genres_by_id(db)).values())
     
-    return list(genres), total
\ No newline at end of file
+    return genres, len(genres)
\ No newline at end of file
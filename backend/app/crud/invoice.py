@@ -1,177 +1,484 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, select, insert, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from typing import Iterable, Iterator
 
+from app import recommendations, stats
+from app.config import get_settings
+from app.statements import bound_filters, listing
 from app.models import Invoice, InvoiceLine, Track, Album, Artist, Customer, Employee
-from app.schemas.invoice import InvoiceCreate
+from app.schemas.invoice import (
+    InvoiceCreate,
+    InvoiceDetail,
+    InvoiceItemDetail,
+    InvoiceImport,
+    InvoiceBulkResult,
+)
+from app.crud.counting import CountStrategy, invalidate_counts
+from app.crud.pagination import fetch_page
+
+# Orden de los listados (más recientes primero); InvoiceId desempata para
+# la paginación por cursor
+INVOICE_ORDER = ((Invoice.InvoiceDate, True), (Invoice.InvoiceId, True))
+
+# Filtros de facturas por nombre de parámetro (ver invoice_params)
+INVOICE_FILTERS = {
+    "customer_id": lambda value: Invoice.CustomerId == value,
+    "employee_id": lambda value: Invoice.EmployeeId == value,
+    "start_date": lambda value: Invoice.InvoiceDate >= value,
+    "end_before": lambda value: Invoice.InvoiceDate < value,
+}
+
+# Sentencias preconstruidas (ver app.statements)
+INVOICE_BY_ID = (
+    select(Invoice)
+    .options(selectinload(Invoice.lines))
+    .where(Invoice.InvoiceId == bindparam("invoice_id"))
+)
+INVOICE_DETAIL = (
+    select(
+        *Invoice.__table__.columns,
+        Customer.FirstName.label("customer_first_name"),
+        Customer.LastName.label("customer_last_name"),
+        Employee.FirstName.label("employee_first_name"),
+        Employee.LastName.label("employee_last_name"),
+    )
+    .outerjoin(Customer, Customer.CustomerId == Invoice.CustomerId)
+    .outerjoin(Employee, Employee.EmployeeId == Invoice.EmployeeId)
+    .where(Invoice.InvoiceId == bindparam("invoice_id"))
+)
+INVOICE_DETAIL_LINES = (
+    select(
+        InvoiceLine.InvoiceLineId,
+        InvoiceLine.InvoiceId,
+        InvoiceLine.TrackId,
+        InvoiceLine.UnitPrice,
+        InvoiceLine.Quantity,
+        Track.Name.label("track_name"),
+        Album.Title.label("album_title"),
+        Artist.Name.label("artist_name"),
+    )
+    .outerjoin(Track, Track.TrackId == InvoiceLine.TrackId)
+    .outerjoin(Album, Album.AlbumId == Track.AlbumId)
+    .outerjoin(Artist, Artist.ArtistId == Album.ArtistId)
+    .where(InvoiceLine.InvoiceId == bindparam("invoice_id"))
+    .order_by(InvoiceLine.InvoiceLineId)
+)
+
+settings = get_settings()
 
 
 async def get_invoice(db: AsyncSession, invoice_id: int) -> Invoice | None:
     """Obtiene una factura por ID con sus items"""
-    result = await db.execute(
-        select(Invoice)
-        .options(selectinload(Invoice.lines))
-        .where(Invoice.InvoiceId == invoice_id)
-    )
+    result = await db.execute(INVOICE_BY_ID, {"invoice_id": invoice_id})
     return result.scalar_one_or_none()
 
 
+def invoice_params(
+    customer_id: int | None = None,
+    employee_id: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> dict:
+    """Valores de los filtros de facturas presentes, por nombre de parámetro"""
+    params = {}
+    if customer_id:
+        params["customer_id"] = customer_id
+    if employee_id:
+        params["employee_id"] = employee_id
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        # end_date es inclusiva
+        params["end_before"] = end_date + timedelta(days=1)
+    return params
+
+
+def invoice_filters(
+    customer_id: int | None = None,
+    employee_id: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list:
+    """Filtros de facturas compartidos por el listado y la exportación"""
+    return bound_filters(INVOICE_FILTERS, invoice_params(customer_id, employee_id, start_date, end_date))
+
+
 async def get_invoices(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
     customer_id: int | None = None,
     employee_id: int | None = None,
-) -> tuple[list[Invoice], int]:
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> tuple[list[Invoice], int | None, str | None]:
     """Obtiene lista de facturas con paginación y filtros opcionales"""
-    base_query = select(Invoice)
-    
     # Filtros opcionales
-    if customer_id:
-        base_query = base_query.where(Invoice.CustomerId == customer_id)
-    if employee_id:
-        base_query = base_query.where(Invoice.EmployeeId == employee_id)
+    params = invoice_params(customer_id, employee_id, start_date, end_date)
     
-    # Count
-    count_query = select(func.count(Invoice.InvoiceId))
-    if customer_id:
-        count_query = count_query.where(Invoice.CustomerId == customer_id)
-    if employee_id:
-        count_query = count_query.where(Invoice.EmployeeId == employee_id)
-    
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Data
-    query = base_query.offset(skip).limit(limit).order_by(Invoice.InvoiceDate.desc())
-    result = await db.execute(query)
-    invoices = result.scalars().all()
+    page = listing(
+        ("invoices", *params),
+        lambda: select(Invoice),
+        lambda: bound_filters(INVOICE_FILTERS, params),
+        model=Invoice,
+    )
+    return await fetch_page(db, page, params, INVOICE_ORDER, skip, limit, cursor, count=count)
+
+
+class TrackNotFoundError(ValueError):
+    """Uno o más items de la factura referencian tracks inexistentes"""
     
-    return list(invoices), total
+    def __init__(self, missing: list[tuple[int, int]]):
+        # Pares (posición del item, TrackId)
+        self.missing = missing
+        items = ", ".join(f"item {index} (TrackId {track_id})" for index, track_id in missing)
+        super().__init__(f"Tracks no encontrados: {items}")
 
 
 async def create_invoice(
     db: AsyncSession,
-    invoice_data: InvoiceCreate
-) -> Invoice:
-    """Crea una nueva factura con sus items"""
-    # Calcular total
-    total = Decimal('0.00')
-    invoice_items = []
+    invoice_data: InvoiceCreate,
+    customer_name: str | None = None,
+    employee_name: str | None = None,
+) -> InvoiceDetail:
+    """Crea una nueva factura con sus items y retorna su detalle completo.
+
+    Todos los precios se obtienen con una sola consulta IN y todas las líneas
+    se insertan con un solo INSERT multi-fila. La respuesta se arma con los
+    datos que ya están en memoria; de la base solo se leen los ids de las
+    líneas.
+    """
+    track_ids = {item.TrackId for item in invoice_data.items}
     
-    for item in invoice_data.items:
-        # Obtener precio del track
-        track_result = await db.execute(
-            select(Track).where(Track.TrackId == item.TrackId)
+    # Precio y nombres de todos los tracks en una sola consulta
+    tracks_result = await db.execute(
+        select(
+            Track.TrackId,
+            Track.UnitPrice,
+            Track.GenreId,
+            Track.Name.label("track_name"),
+            Album.Title.label("album_title"),
+            Artist.Name.label("artist_name"),
         )
-        track = track_result.scalar_one_or_none()
-        if not track:
-            raise ValueError(f"Track {item.TrackId} no encontrado")
-        
-        item_total = track.UnitPrice * item.Quantity
-        total += item_total
-        
-        invoice_items.append({
-            "TrackId": item.TrackId,
-            "UnitPrice": track.UnitPrice,
-            "Quantity": item.Quantity
-        })
+        .outerjoin(Album, Album.AlbumId == Track.AlbumId)
+        .outerjoin(Artist, Artist.ArtistId == Album.ArtistId)
+        .where(Track.TrackId.in_(track_ids))
+    )
+    tracks = {row.TrackId: row for row in tracks_result}
     
-    # Crear la factura
-    db_invoice = Invoice(
-        CustomerId=invoice_data.CustomerId,
-        InvoiceDate=datetime.now(),
-        BillingAddress=invoice_data.BillingAddress,
-        BillingCity=invoice_data.BillingCity,
-        BillingState=invoice_data.BillingState,
-        BillingCountry=invoice_data.BillingCountry,
-        BillingPostalCode=invoice_data.BillingPostalCode,
-        Total=total,
-        EmployeeId=invoice_data.EmployeeId
+    missing = [
+        (index, item.TrackId)
+        for index, item in enumerate(invoice_data.items)
+        if item.TrackId not in tracks
+    ]
+    if missing:
+        raise TrackNotFoundError(missing)
+    
+    # Calcular total
+    total = sum(
+        (tracks[item.TrackId].UnitPrice * item.Quantity for item in invoice_data.items),
+        Decimal('0.00'),
     )
     
-    db.add(db_invoice)
-    await db.flush()  # Para obtener el InvoiceId
+    # Crear la factura
+    invoice_values = {
+        "CustomerId": invoice_data.CustomerId,
+        # DATETIME no guarda microsegundos: la respuesta debe coincidir con un GET
+        "InvoiceDate": datetime.now().replace(microsecond=0),
+        "BillingAddress": invoice_data.BillingAddress,
+        "BillingCity": invoice_data.BillingCity,
+        "BillingState": invoice_data.BillingState,
+        "BillingCountry": invoice_data.BillingCountry,
+        "BillingPostalCode": invoice_data.BillingPostalCode,
+        "Total": total,
+        "EmployeeId": invoice_data.EmployeeId,
+    }
+    invoice_result = await db.execute(insert(Invoice).values(**invoice_values))
+    invoice_id = invoice_result.inserted_primary_key[0]
+    
+    # Crear los items en un solo INSERT multi-fila
+    lines = [
+        {
+            "InvoiceId": invoice_id,
+            "TrackId": item.TrackId,
+            "UnitPrice": tracks[item.TrackId].UnitPrice,
+            "Quantity": item.Quantity,
+        }
+        for item in invoice_data.items
+    ]
+    await db.execute(insert(InvoiceLine).values(lines))
     
-    # Crear los items
-    for item_data in invoice_items:
-        invoice_line = InvoiceLine(
-            InvoiceId=db_invoice.InvoiceId,
-            **item_data
-        )
-        db.add(invoice_line)
+    # Los ids de un INSERT multi-fila crecen en el orden de las filas, pero no
+    # son necesariamente consecutivos (auto_increment_increment > 1,
+    # innodb_autoinc_lock_mode=2): se leen en lugar de calcularlos
+    line_ids_result = await db.execute(
+        select(InvoiceLine.InvoiceLineId)
+        .where(InvoiceLine.InvoiceId == invoice_id)
+        .order_by(InvoiceLine.InvoiceLineId)
+    )
+    line_ids = list(line_ids_result.scalars())
     
     await db.commit()
-    await db.refresh(db_invoice)
+    invalidate_counts(Invoice.__tablename__, InvoiceLine.__tablename__)
+    stats.record_invoice(
+        invoice_id,
+        invoice_values["CustomerId"],
+        invoice_values["EmployeeId"],
+        invoice_values["InvoiceDate"],
+        total,
+        [
+            (line["TrackId"], tracks[line["TrackId"]].GenreId, line["UnitPrice"], line["Quantity"])
+            for line in lines
+        ],
+    )
+    recommendations.record_invoice(invoice_id, [line["TrackId"] for line in lines])
+    
+    items = [
+        InvoiceItemDetail(
+            InvoiceLineId=line_id,
+            **line,
+            track_name=tracks[line["TrackId"]].track_name,
+            album_title=tracks[line["TrackId"]].album_title,
+            artist_name=tracks[line["TrackId"]].artist_name,
+        )
+        for line_id, line in zip(line_ids, lines)
+    ]
     
-    # Cargar los items
-    result = await db.execute(
-        select(Invoice)
-        .options(selectinload(Invoice.lines))
-        .where(Invoice.InvoiceId == db_invoice.InvoiceId)
+    return InvoiceDetail(
+        InvoiceId=invoice_id,
+        **invoice_values,
+        items=items,
+        customer_name=customer_name,
+        employee_name=employee_name,
     )
-    return result.scalar_one()
 
 
-async def get_invoice_detail(db: AsyncSession, invoice_id: int) -> dict | None:
-    """Obtiene detalle completo de una factura con información relacionada"""
-    # Obtener factura
-    invoice = await get_invoice(db, invoice_id)
-    if not invoice:
-        return None
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _existing_ids(db: AsyncSession, column, ids: Iterable[int], chunk_size: int) -> set[int]:
+    """Ids de `ids` que existen en la tabla de `column`, con un IN por bloque"""
+    found = set()
+    for chunk in _chunks(list(ids), chunk_size):
+        result = await db.execute(select(column).where(column.in_(chunk)))
+        found.update(result.scalars())
+    return found
+
+
+async def _track_prices(
+    db: AsyncSession, track_ids: Iterable[int], chunk_size: int
+) -> dict[int, tuple[Decimal, int | None]]:
+    """Precio y género de cada track existente, con un IN por bloque"""
+    prices = {}
+    for chunk in _chunks(list(track_ids), chunk_size):
+        result = await db.execute(
+            select(Track.TrackId, Track.UnitPrice, Track.GenreId).where(Track.TrackId.in_(chunk))
+        )
+        prices.update((track_id, (price, genre_id)) for track_id, price, genre_id in result)
+    return prices
+
+
+async def _insert_invoices(db: AsyncSession, records: list[tuple], chunk_size: int) -> list[int]:
+    """Inserta facturas ya validadas con sus líneas y retorna sus ids.
+
+    Cabeceras y líneas van en INSERT multi-fila de hasta `chunk_size` filas.
+    Un INSERT multi-fila con la cantidad de filas conocida es un "simple
+    insert" para InnoDB: sus ids son consecutivos (de a
+    auto_increment_increment) en todos los innodb_autoinc_lock_mode, y
+    LAST_INSERT_ID() es el de la primera fila. En SQLite lastrowid es el de
+    la última.
+    """
+    dialect = db.get_bind().dialect.name
+    step = 1
+    if dialect == "mysql":
+        step = (await db.execute(text("SELECT @@auto_increment_increment"))).scalar()
     
-    # Obtener información del cliente
-    customer_result = await db.execute(
-        select(Customer).where(Customer.CustomerId == invoice.CustomerId)
-    )
-    customer = customer_result.scalar_one_or_none()
+    invoice_ids = []
+    for chunk in _chunks([values for _, values, _ in records], chunk_size):
+        result = await db.execute(insert(Invoice).values(chunk))
+        first = result.lastrowid if dialect == "mysql" else result.lastrowid - len(chunk) + 1
+        invoice_ids.extend(first + position * step for position in range(len(chunk)))
     
-    # Obtener información del empleado si existe
-    employee = None
-    if invoice.EmployeeId:
-        employee_result = await db.execute(
-            select(Employee).where(Employee.EmployeeId == invoice.EmployeeId)
-        )
-        employee = employee_result.scalar_one_or_none()
-    
-    # Obtener detalles de los items
-    items_detail = []
-    for line in invoice.lines:
-        # Obtener track con album y artist
-        track_result = await db.execute(
-            select(Track)
-            .options(selectinload(Track.album).selectinload(Album.artist))
-            .where(Track.TrackId == line.TrackId)
+    lines = [
+        {**line, "InvoiceId": invoice_id}
+        for invoice_id, (_, _, invoice_lines) in zip(invoice_ids, records)
+        for line in invoice_lines
+    ]
+    for chunk in _chunks(lines, chunk_size):
+        await db.execute(insert(InvoiceLine).values(chunk))
+    return invoice_ids
+
+
+def _record_saved(batch: list[tuple], invoice_ids: list[int], prices: dict) -> None:
+    """Suma a las estadísticas y recomendaciones las facturas de un lote ya confirmado"""
+    invalidate_counts(Invoice.__tablename__, InvoiceLine.__tablename__)
+    for (_, values, lines), invoice_id in zip(batch, invoice_ids):
+        stats.record_invoice(
+            invoice_id,
+            values["CustomerId"],
+            values["EmployeeId"],
+            values["InvoiceDate"],
+            values["Total"],
+            [
+                (line["TrackId"], prices[line["TrackId"]][1], line["UnitPrice"], line["Quantity"])
+                for line in lines
+            ],
         )
-        track = track_result.scalar_one_or_none()
+        recommendations.record_invoice(invoice_id, [line["TrackId"] for line in lines])
+
+
+async def _save_batch(
+    db: AsyncSession, batch: list[tuple], prices: dict, chunk_size: int
+) -> list[InvoiceBulkResult]:
+    """Guarda un lote en una transacción.
+
+    Si el lote falla se revierte y se reintenta factura por factura, así solo
+    se reportan como fallidas las que realmente no se pudieron guardar. Las
+    facturas se registran en las estadísticas justo después de su commit, sin
+    awaits de por medio, para que una reconstrucción que corra entre lotes no
+    las cuente dos veces.
+    """
+    try:
+        invoice_ids = await _insert_invoices(db, batch, chunk_size)
+        await db.commit()
+        _record_saved(batch, invoice_ids, prices)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        if len(batch) == 1:
+            index = batch[0][0]
+            return [InvoiceBulkResult(index=index, success=False, error=str(getattr(e, "orig", None) or e))]
+        results = []
+        for record in batch:
+            results.extend(await _save_batch(db, [record], prices, chunk_size))
+        return results
+    
+    return [
+        InvoiceBulkResult(index=index, success=True, InvoiceId=invoice_id, Total=values["Total"])
+        for (index, values, _), invoice_id in zip(batch, invoice_ids)
+    ]
+
+
+async def create_invoices_bulk(
+    db: AsyncSession,
+    invoices: list[InvoiceImport],
+    batch_size: int | None = None,
+    chunk_size: int | None = None,
+) -> list[InvoiceBulkResult]:
+    """Crea muchas facturas de una vez y retorna el resultado de cada una.
+
+    Clientes, empleados y tracks de toda la carga se validan con consultas IN
+    por conjunto en lugar de varias consultas por factura. Las facturas
+    válidas se guardan en transacciones de `batch_size` facturas, con las
+    líneas en INSERT multi-fila de hasta `chunk_size` filas. Los resultados vienen en el mismo
+    orden que `invoices`.
+    """
+    batch_size = batch_size or settings.BULK_INVOICE_BATCH_SIZE
+    chunk_size = chunk_size or settings.BULK_INSERT_CHUNK_SIZE
+    
+    # Validación por conjuntos
+    customers = await _existing_ids(
+        db, Customer.CustomerId, {invoice.CustomerId for invoice in invoices}, chunk_size
+    )
+    employees = await _existing_ids(
+        db, Employee.EmployeeId, {invoice.EmployeeId for invoice in invoices if invoice.EmployeeId}, chunk_size
+    )
+    prices = await _track_prices(
+        db, {item.TrackId for invoice in invoices for item in invoice.items}, chunk_size
+    )
+    
+    results: list[InvoiceBulkResult] = []
+    pending = []  # (posición, valores de la factura, líneas)
+    # Sin microsegundos, como create_invoice: DATETIME de MySQL no los guarda
+    now = datetime.now().replace(microsecond=0)
+    for index, invoice in enumerate(invoices):
+        error = None
+        if invoice.CustomerId not in customers:
+            error = "Cliente no encontrado"
+        elif invoice.EmployeeId and invoice.EmployeeId not in employees:
+            error = "Empleado no encontrado"
+        else:
+            missing = [
+                (position, item.TrackId)
+                for position, item in enumerate(invoice.items)
+                if item.TrackId not in prices
+            ]
+            if missing:
+                error = str(TrackNotFoundError(missing))
+        if error:
+            results.append(InvoiceBulkResult(index=index, success=False, error=error))
+            continue
         
-        item_detail = {
-            "InvoiceLineId": line.InvoiceLineId,
-            "InvoiceId": line.InvoiceId,
-            "TrackId": line.TrackId,
-            "UnitPrice": line.UnitPrice,
-            "Quantity": line.Quantity,
-            "track_name": track.Name if track else None,
-            "album_title": track.album.Title if track and track.album else None,
-            "artist_name": track.album.artist.Name if track and track.album and track.album.artist else None,
+        lines = [
+            {"TrackId": item.TrackId, "UnitPrice": prices[item.TrackId][0], "Quantity": item.Quantity}
+            for item in invoice.items
+        ]
+        values = {
+            "CustomerId": invoice.CustomerId,
+            "InvoiceDate": invoice.InvoiceDate or now,
+            "BillingAddress": invoice.BillingAddress,
+            "BillingCity": invoice.BillingCity,
+            "BillingState": invoice.BillingState,
+            "BillingCountry": invoice.BillingCountry,
+            "BillingPostalCode": invoice.BillingPostalCode,
+            "Total": sum((line["UnitPrice"] * line["Quantity"] for line in lines), Decimal('0.00')),
+            "EmployeeId": invoice.EmployeeId,
         }
-        items_detail.append(item_detail)
+        pending.append((index, values, lines))
     
-    return {
-        **invoice.__dict__,
-        "items": items_detail,
-        "customer_name": f"{customer.FirstName} {customer.LastName}" if customer else None,
-        "employee_name": f"{employee.FirstName} {employee.LastName}" if employee else None,
-    }
+    for batch in _chunks(pending, batch_size):
+        results.extend(await _save_batch(db, batch, prices, chunk_size))
+    
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+async def get_invoice_detail(db: AsyncSession, invoice_id: int) -> InvoiceDetail | None:
+    """Obtiene detalle completo de una factura con información relacionada.
+
+    Usa siempre dos consultas, sin importar cuántos items tenga la factura:
+    una para la factura con los nombres de cliente y empleado, y otra para
+    las líneas con los nombres de track, álbum y artista.
+    """
+    # Factura + cliente + empleado
+    invoice_result = await db.execute(INVOICE_DETAIL, {"invoice_id": invoice_id})
+    invoice = invoice_result.mappings().first()
+    if not invoice:
+        return None
+    
+    # Items con track, álbum y artista
+    lines_result = await db.execute(INVOICE_DETAIL_LINES, {"invoice_id": invoice_id})
+    items = [InvoiceItemDetail(**line) for line in lines_result.mappings()]
+    
+    customer_name = None
+    if invoice["customer_first_name"] is not None:
+        customer_name = f"{invoice['customer_first_name']} {invoice['customer_last_name']}"
+    employee_name = None
+    if invoice["employee_first_name"] is not None:
+        employee_name = f"{invoice['employee_first_name']} {invoice['employee_last_name']}"
+    
+    return InvoiceDetail(
+        **invoice,
+        items=items,
+        customer_name=customer_name,
+        employee_name=employee_name,
+    )
 
 
 async def get_customer_purchase_history(
     db: AsyncSession,
     customer_id: int,
     skip: int = 0,
-    limit: int = 50
-) -> tuple[list[Invoice], int]:
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+) -> tuple[list[Invoice], int | None, str | None]:
     """Obtiene historial de compras de un cliente"""
-    return await get_invoices(db, skip, limit, customer_id=customer_id)
\ No newline at end of file
+    return await get_invoices(db, skip, limit, customer_id=customer_id, cursor=cursor, count=count)
\ No newline at end of file
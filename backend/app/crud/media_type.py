@@ -0,0 +1,29 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app import cache
+from app.models import MediaType
+from app.schemas.media_type import MediaType as MediaTypeSchema
+
+
+async def _load_media_types(db: AsyncSession) -> dict[int, MediaTypeSchema]:
+    result = await db.execute(select(MediaType).order_by(MediaType.Name))
+    return {
+        media_type.MediaTypeId: MediaTypeSchema.model_validate(media_type)
+        for media_type in result.scalars()
+    }
+
+
+async def get_media_types_by_id(db: AsyncSession) -> dict[int, MediaTypeSchema]:
+    """Todos los tipos de medio indexados por ID, ordenados por nombre (cacheados)"""
+    return await cache.media_types.get_or_load("all", lambda: _load_media_types(db))
+
+
+async def get_media_type(db: AsyncSession, media_type_id: int) -> MediaTypeSchema | None:
+    """Obtiene un tipo de medio por ID"""
+    media_types = await get_media_types_by_id(db)
+    return media_types.get(media_type_id)
+
+
+async def get_media_types(db: AsyncSession) -> list[MediaTypeSchema]:
+    """Obtiene todos los tipos de medio"""
+    return list((await get_media_types_by_id(db)).values())
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""Paginación por offset y por cursor (keyset) compartida por los CRUD"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import DateTime, Integer, Select, and_, bindparam, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import statements
+from app.crud import fanout
+from app.crud.counting import CountStrategy, count_rows, default_strategy
+from app.statements import Listing
+
+# Columna de ordenamiento y si es descendente. El último elemento de cada
+# orden debe ser la clave primaria para que el cursor sea único.
+SortKey = tuple[Any, bool]
+
+
+class InvalidCursorError(ValueError):
+    """El cursor recibido no es válido para este listado"""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica los valores de ordenamiento de una fila como cursor opaco"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_raw(cursor: str) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Cursor inválido")
+    if not isinstance(values, list):
+        raise InvalidCursorError("Cursor inválido")
+    return values
+
+
+def decode_cursor(cursor: str, order: Sequence[SortKey]) -> list[Any]:
+    """Decodifica un cursor y convierte cada valor al tipo de su columna"""
+    values = _decode_raw(cursor)
+    if len(values) != len(order):
+        raise InvalidCursorError("Cursor inválido")
+
+    try:
+        return [
+            datetime.fromisoformat(value)
+            if value is not None and isinstance(column.type, DateTime)
+            else value
+            for (column, _), value in zip(order, values)
+        ]
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Cursor inválido")
+
+
+def decode_position(cursor: str) -> int:
+    """Decodifica un cursor de posición (resultados rankeados por relevancia)"""
+    values = _decode_raw(cursor)
+    if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+        raise InvalidCursorError("Cursor inválido")
+    return values[0]
+
+
+def _after(order: Sequence[SortKey], values: Sequence[Any]):
+    """Condición "fila posterior al cursor" para el orden dado.
+
+    Equivale a la comparación de tuplas (c1, c2, ...) > (v1, v2, ...) pero
+    respeta que MySQL ordena los NULL primero en ASC y al final en DESC.
+    """
+    (column, descending), *rest = order
+    value, *rest_values = values
+
+    if value is None:
+        after = column.is_(None) if descending else column.is_not(None)
+        same = column.is_(None)
+    elif descending:
+        after = or_(column < value, column.is_(None))
+        same = column == value
+    else:
+        after = column > value
+        same = column == value
+
+    if not rest:
+        return after
+    return or_(after, and_(same, _after(rest, rest_values)))
+
+
+def order_clauses(order: Sequence[SortKey]) -> list:
+    """Cláusulas ORDER BY para el orden dado"""
+    return [column.desc() if descending else column.asc() for column, descending in order]
+
+
+def cursor_for(item: Any, order: Sequence[SortKey]) -> str:
+    """Cursor que apunta justo después de la fila dada"""
+    return encode_cursor([getattr(item, column.key) for column, _ in order])
+
+
+def _page_query(listing: Listing, order: Sequence[SortKey], nulls: tuple[bool, ...] | None, window: bool) -> Select:
+    """Consulta de una página con bindparam() en el cursor, el offset y el límite.
+
+    `nulls` indica qué valores del cursor son NULL (None: página por
+    offset); cambia la condición, así que es parte de la forma.
+    """
+    query = listing.query
+    if nulls is None:
+        query = query.offset(bindparam("page_offset", type_=Integer))
+    else:
+        values = [
+            None if null else bindparam(f"cursor_{position}", type_=column.type)
+            for position, ((column, _), null) in enumerate(zip(order, nulls))
+        ]
+        query = query.where(_after(order, values))
+    if window:
+        query = query.add_columns(func.count().over())
+    return query.order_by(*order_clauses(order)).limit(bindparam("page_limit", type_=Integer))
+
+
+async def fetch_page(
+    db: AsyncSession,
+    listing: Listing,
+    params: dict,
+    order: Sequence[SortKey],
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+) -> tuple[list[Any], int | None, str | None]:
+    """Ejecuta una consulta paginada y retorna la página, el total y el siguiente cursor.
+
+    `listing` es la forma preconstruida del listado (ver app.statements) y
+    `params` los valores de sus filtros; cada listado usa siempre el mismo
+    `order`.
+
+    Con cursor se usa keyset (WHERE sobre las columnas de orden) y se ignora
+    skip, así el costo no crece con la profundidad de la página. Sin cursor
+    se usa OFFSET como siempre. En ambos modos se pide una fila extra para
+    saber si hay una página siguiente.
+
+    El total de `listing.model` con sus filtros se calcula según `count` (ver
+    `counting.CountStrategy`); WINDOW lo obtiene con COUNT(*) OVER() en la
+    misma consulta cuando se pagina por offset. Las demás estrategias cuentan
+    en paralelo con la consulta de la página (ver `fanout.gather`).
+    """
+    count = count or default_strategy()
+    window = count == CountStrategy.WINDOW and not cursor
+
+    page_params = {**params, "page_limit": limit + 1}
+    if cursor:
+        values = decode_cursor(cursor, order)
+        nulls = tuple(value is None for value in values)
+        page_params.update(
+            (f"cursor_{position}", value) for position, value in enumerate(values) if value is not None
+        )
+    else:
+        nulls = None
+        page_params["page_offset"] = skip
+
+    query = statements.prepared(
+        (*listing.key, "page", nulls, window),
+        lambda: _page_query(listing, order, nulls, window),
+    )
+    if window or count == CountStrategy.NONE:
+        result = await db.execute(query, page_params)
+        total = None
+    else:
+        result, total = await fanout.gather(
+            db,
+            lambda session: session.execute(query, page_params),
+            lambda session: count_rows(session, listing, params, count),
+        )
+
+    if window:
+        rows = result.all()
+        items = [row[0] for row in rows]
+        if rows:
+            total = rows[0][1]
+        elif skip == 0:
+            total = 0
+        else:
+            # Página fuera de rango: no hay filas de donde leer el total
+            total = await count_rows(db, listing, params, CountStrategy.EXACT)
+    else:
+        items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = cursor_for(items[-1], order)
+
+    return items, total, next_cursor
+
+
+async def fetch_ranked_page(
+    db: AsyncSession,
+    listing: Listing,
+    id_column: Any,
+    index: Any,
+    search: str,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    fuzzy: bool = False,
+    count: CountStrategy | None = None,
+) -> tuple[list[Any], int | None, str | None]:
+    """Página de resultados de un `app.search.SearchIndex`, en orden de relevancia.
+
+    El índice da los ids de la página y el total de coincidencias (sin
+    COUNT); la base de datos solo se consulta por los ids de la página, con
+    la consulta base de `listing` (sin filtros). El cursor guarda la
+    posición dentro del ranking.
+    """
+    start = decode_position(cursor) if cursor else skip
+    ids, total = index.search(search, limit=start + limit + 1, fuzzy=fuzzy)
+    page_ids = ids[start:start + limit]
+
+    items = []
+    if page_ids:
+        query = statements.prepared(
+            (*listing.key, "ranked"),
+            lambda: listing.query.where(id_column.in_(bindparam("page_ids", expanding=True))),
+        )
+        result = await db.execute(query, {"page_ids": page_ids})
+        by_id = {getattr(item, id_column.key): item for item in result.scalars()}
+        items = [by_id[doc_id] for doc_id in page_ids if doc_id in by_id]
+
+    next_cursor = encode_cursor([start + limit]) if len(ids) > start + limit else None
+    if count == CountStrategy.NONE:
+        total = None
+
+    return items, total, next_cursor
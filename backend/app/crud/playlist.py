@@ -0,0 +1,108 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, delete, insert, literal, select
+from app import playlists
+from app.models import Playlist, PlaylistTrack, Track
+from app.statements import listing
+from app.schemas.playlist import PlaylistCreate
+from app.crud.counting import CountStrategy, invalidate_counts
+from app.crud.pagination import fetch_page
+
+# Orden de los listados; PlaylistId desempata para la paginación por cursor
+PLAYLIST_ORDER = ((Playlist.Name, False), (Playlist.PlaylistId, False))
+# Tracks de una playlist en el orden de la clave primaria (PlaylistId, TrackId):
+# el cursor es un rango sobre el índice, sin ordenar
+PLAYLIST_TRACK_ORDER = ((PlaylistTrack.TrackId, False),)
+
+
+async def get_playlist(db: AsyncSession, playlist_id: int) -> Playlist | None:
+    """Obtiene una playlist por ID"""
+    return await db.get(Playlist, playlist_id)
+
+
+async def get_playlists(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+) -> tuple[list[Playlist], int | None, str | None]:
+    """Obtiene lista de playlists con paginación (los totales salen de app.playlists)"""
+    await playlists.ensure_ready(db)
+    page = listing(("playlists",), lambda: select(Playlist), model=Playlist)
+    return await fetch_page(db, page, {}, PLAYLIST_ORDER, skip, limit, cursor, count=count)
+
+
+async def get_playlist_tracks(
+    db: AsyncSession,
+    playlist_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> tuple[list[Track], str | None]:
+    """Página de tracks de una playlist (el total es su track_count)"""
+    page = listing(
+        ("playlist_tracks",),
+        lambda: select(Track).join(PlaylistTrack, PlaylistTrack.TrackId == Track.TrackId),
+        lambda: [PlaylistTrack.PlaylistId == bindparam("playlist_id")],
+    )
+    tracks, _, next_cursor = await fetch_page(
+        db, page, {"playlist_id": playlist_id}, PLAYLIST_TRACK_ORDER, skip, limit, cursor,
+        count=CountStrategy.NONE,
+    )
+    return tracks, next_cursor
+
+
+async def create_playlist(db: AsyncSession, playlist: PlaylistCreate) -> Playlist:
+    """Crea una playlist vacía"""
+    db_playlist = Playlist(**playlist.model_dump())
+    db.add(db_playlist)
+    await db.commit()
+    invalidate_counts(Playlist.__tablename__)
+    await db.refresh(db_playlist)
+    await playlists.refresh(db, db_playlist.PlaylistId)
+    return db_playlist
+
+
+async def add_tracks(
+    db: AsyncSession,
+    playlist_id: int,
+    track_ids: list[int],
+) -> tuple[int, list[int]]:
+    """Agrega tracks a una playlist con un solo INSERT ... SELECT.
+
+    Los pares que ya existen se ignoran (INSERT IGNORE en MySQL, OR IGNORE en
+    SQLite) y los TrackIds inexistentes quedan afuera del SELECT. Retorna la
+    cantidad agregada y los TrackIds que no existen.
+    """
+    unique_ids = set(track_ids)
+    result = await db.execute(select(Track.TrackId).where(Track.TrackId.in_(unique_ids)))
+    missing = sorted(unique_ids - set(result.scalars()))
+    
+    statement = (
+        insert(PlaylistTrack)
+        .from_select(
+            ["PlaylistId", "TrackId"],
+            select(literal(playlist_id), Track.TrackId).where(Track.TrackId.in_(unique_ids)),
+        )
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    result = await db.execute(statement)
+    await db.commit()
+    invalidate_counts(PlaylistTrack.__tablename__)
+    await playlists.refresh(db, playlist_id)
+    return result.rowcount, missing
+
+
+async def remove_tracks(db: AsyncSession, playlist_id: int, track_ids: list[int]) -> int:
+    """Quita tracks de una playlist con un solo DELETE; retorna cuántos se quitaron"""
+    result = await db.execute(
+        delete(PlaylistTrack).where(
+            PlaylistTrack.PlaylistId == playlist_id,
+            PlaylistTrack.TrackId.in_(set(track_ids)),
+        )
+    )
+    await db.commit()
+    invalidate_counts(PlaylistTrack.__tablename__)
+    await playlists.refresh(db, playlist_id)
+    return result.rowcount
@@ -0,0 +1,121 @@
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app import stats
+from app.models import Track, Album, Artist, Customer, Employee
+from app.schemas.stats import TopTrack, TopGenre, TopCustomer, SalesByEmployee, MonthlySales
+from app.crud.genre import get_genres_by_id
+
+# Los agregados vienen de app/stats.py; aquí solo se consultan los nombres de
+# las filas del resultado, con una consulta IN por endpoint.
+
+
+async def get_top_tracks(db: AsyncSession, limit: int = 10) -> list[TopTrack]:
+    """Tracks más vendidos por monto"""
+    top = (await stats.ensure_ready(db)).tracks.top(limit)
+    if not top:
+        return []
+    
+    result = await db.execute(
+        select(Track.TrackId, Track.Name, Artist.Name.label("artist_name"))
+        .outerjoin(Album, Album.AlbumId == Track.AlbumId)
+        .outerjoin(Artist, Artist.ArtistId == Album.ArtistId)
+        .where(Track.TrackId.in_([track_id for track_id, _, _ in top]))
+    )
+    names = {row.TrackId: row for row in result}
+    
+    return [
+        TopTrack(
+            TrackId=track_id,
+            Name=names[track_id].Name,
+            total_sales=total,
+            units_sold=units,
+            artist_name=names[track_id].artist_name,
+        )
+        for track_id, total, units in top
+        if track_id in names
+    ]
+
+
+async def get_top_genres(db: AsyncSession, limit: int = 10) -> list[TopGenre]:
+    """Géneros más vendidos por monto"""
+    top = (await stats.ensure_ready(db)).genres.top(limit)
+    genres = await get_genres_by_id(db)
+    
+    return [
+        TopGenre(
+            GenreId=genre_id,
+            Name=genres[genre_id].Name if genre_id in genres else None,
+            total_sales=total,
+            tracks_sold=units,
+        )
+        for genre_id, total, units in top
+    ]
+
+
+async def get_top_customers(db: AsyncSession, limit: int = 10) -> list[TopCustomer]:
+    """Clientes con mayor gasto acumulado"""
+    top = (await stats.ensure_ready(db)).customers.top(limit)
+    if not top:
+        return []
+    
+    result = await db.execute(
+        select(Customer.CustomerId, Customer.FirstName, Customer.LastName, Customer.Email)
+        .where(Customer.CustomerId.in_([customer_id for customer_id, _, _ in top]))
+    )
+    customers = {row.CustomerId: row for row in result}
+    
+    return [
+        TopCustomer(
+            CustomerId=customer_id,
+            FirstName=customers[customer_id].FirstName,
+            LastName=customers[customer_id].LastName,
+            Email=customers[customer_id].Email,
+            total_spent=total,
+            total_purchases=purchases,
+        )
+        for customer_id, total, purchases in top
+        if customer_id in customers
+    ]
+
+
+async def get_sales_by_employee(db: AsyncSession) -> list[SalesByEmployee]:
+    """Ventas por empleado, de mayor a menor"""
+    employees_sales = (await stats.ensure_ready(db)).employees
+    employee_ids = [employee_id for employee_id in employees_sales if employee_id is not None]
+    
+    names = {}
+    if employee_ids:
+        result = await db.execute(
+            select(Employee.EmployeeId, Employee.FirstName, Employee.LastName)
+            .where(Employee.EmployeeId.in_(employee_ids))
+        )
+        names = {row.EmployeeId: f"{row.FirstName} {row.LastName}" for row in result}
+    
+    sales = [
+        SalesByEmployee(
+            EmployeeId=employee_id,
+            employee_name=names.get(employee_id),
+            total_sales=total,
+            total_invoices=invoices,
+        )
+        for employee_id, (total, invoices) in employees_sales.items()
+    ]
+    sales.sort(key=lambda sale: sale.total_sales, reverse=True)
+    return sales
+
+
+async def get_monthly_sales(
+    db: AsyncSession,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list[MonthlySales]:
+    """Ventas por mes, en orden cronológico; las fechas se toman por mes completo"""
+    rollups = await stats.ensure_ready(db)
+    start = (start_date.year, start_date.month) if start_date else None
+    end = (end_date.year, end_date.month) if end_date else None
+    
+    return [
+        MonthlySales(year=year, month=month, total_sales=total, total_invoices=invoices)
+        for year, month, total, invoices in rollups.monthly(start, end)
+    ]
@@ -1,90 +1,108 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
-from app.models import Track, Album
+from sqlalchemy import bindparam, select
+from app import recommendations, search as search_index
+from app.models import Track
+from app.statements import Listing, bound_filters, listing
+from app.crud.counting import CountStrategy
+from app.crud.pagination import fetch_page, fetch_ranked_page
 
+# Orden de los listados; TrackId desempata para la paginación por cursor
+TRACK_ORDER = ((Track.Name, False), (Track.TrackId, False))
 
-async def get_track(db: AsyncSession, track_id: int) -> Track | None:
-    """Obtiene un track por ID con todas sus relaciones"""
-    result = await db.execute(
-        select(Track)
-        .options(
-            selectinload(Track.album).selectinload(Album.artist),
-            selectinload(Track.genre),
-            selectinload(Track.media_type),
-        )
-        .where(Track.TrackId == track_id)
+# Filtros de los listados por nombre de parámetro
+TRACK_FILTERS = {
+    "album_id": lambda value: Track.AlbumId == value,
+    "genre_id": lambda value: Track.GenreId == value,
+    "search": lambda value: Track.Name.ilike(value),
+}
+
+# Sentencias preconstruidas (ver app.statements)
+TRACK_BY_ID = select(Track).where(Track.TrackId == bindparam("track_id"))
+TRACKS_BY_IDS = select(Track).where(Track.TrackId.in_(bindparam("track_ids", expanding=True)))
+
+
+def _tracks_listing(params: dict) -> Listing:
+    """Listado de tracks con los filtros presentes en `params`"""
+    return listing(
+        ("tracks", *params),
+        lambda: select(Track),
+        lambda: bound_filters(TRACK_FILTERS, params),
+        model=Track,
     )
+
+
+async def get_track(db: AsyncSession, track_id: int) -> Track | None:
+    """Obtiene un track por ID (álbum, artista y género salen de app.cache)"""
+    result = await db.execute(TRACK_BY_ID, {"track_id": track_id})
     return result.scalar_one_or_none()
 
 
+async def get_tracks_by_ids(db: AsyncSession, track_ids) -> dict[int, Track]:
+    """Obtiene varios tracks por ID en una consulta; los que no existen se omiten"""
+    result = await db.execute(TRACKS_BY_IDS, {"track_ids": list(set(track_ids))})
+    return {track.TrackId: track for track in result.scalars()}
+
+
+async def get_recommended_tracks(
+    db: AsyncSession,
+    track_id: int,
+    limit: int = 10,
+) -> tuple[Track | None, list[tuple[Track, int]]]:
+    """Obtiene un track y los que más se compraron junto a él.
+
+    Los vecinos salen de app.recommendations; el track y sus vecinos se leen
+    en una sola consulta IN. Retorna (track, [(vecino, co-compras)]).
+    """
+    neighbors = (await recommendations.ensure_ready(db)).recommend(track_id, limit)
+    tracks = await get_tracks_by_ids(db, [track_id, *(neighbor_id for neighbor_id, _ in neighbors)])
+    return tracks.get(track_id), [
+        (tracks[neighbor_id], co_purchases)
+        for neighbor_id, co_purchases in neighbors
+        if neighbor_id in tracks
+    ]
+
+
 async def get_tracks(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
     album_id: int | None = None,
-    genre_id: int | None = None
-) -> tuple[list[Track], int]:
-    """Obtiene lista de tracks con paginación y filtros"""
-    # Base query
-    base_query = select(Track).options(
-        selectinload(Track.album).selectinload(Album.artist),
-        selectinload(Track.genre),
-    )
-    
+    genre_id: int | None = None,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+) -> tuple[list[Track], int | None, str | None]:
+    """Obtiene lista de tracks con paginación y filtros (sin relaciones, ver app.cache)"""
     # Filtros opcionales
+    params = {}
     if album_id:
-        base_query = base_query.where(Track.AlbumId == album_id)
+        params["album_id"] = album_id
     if genre_id:
-        base_query = base_query.where(Track.GenreId == genre_id)
-    
-    # Count
-    count_query = select(func.count(Track.TrackId))
-    if album_id:
-        count_query = count_query.where(Track.AlbumId == album_id)
-    if genre_id:
-        count_query = count_query.where(Track.GenreId == genre_id)
-    
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Data
-    query = base_query.offset(skip).limit(limit).order_by(Track.Name)
-    result = await db.execute(query)
-    tracks = result.scalars().all()
+        params["genre_id"] = genre_id
     
-    return list(tracks), total
+    return await fetch_page(
+        db, _tracks_listing(params), params, TRACK_ORDER, skip, limit, cursor, count=count,
+    )
 
 
 async def search_tracks(
     db: AsyncSession,
     search: str,
     skip: int = 0,
-    limit: int = 50
-) -> tuple[list[Track], int]:
+    limit: int = 50,
+    cursor: str | None = None,
+    count: CountStrategy | None = None,
+    fuzzy: bool = False,
+) -> tuple[list[Track], int | None, str | None]:
     """Busca tracks por nombre"""
-    search_pattern = f"%{search}%"
+    if search_index.tracks.ready:
+        return await fetch_ranked_page(
+            db, _tracks_listing({}), Track.TrackId, search_index.tracks, search,
+            skip, limit, cursor, fuzzy, count,
+        )
     
-    # Count
-    count_query = select(func.count(Track.TrackId)).where(
-        Track.Name.ilike(search_pattern)
-    )
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Sin índice (aún no construido o deshabilitado): ILIKE
+    params = {"search": f"%{search}%"}
     
-    # Data
-    query = (
-        select(Track)
-        .options(
-            selectinload(Track.album).selectinload(Album.artist),
-            selectinload(Track.genre),
-        )
-        .where(Track.Name.ilike(search_pattern))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Track.Name)
+    return await fetch_page(
+        db, _tracks_listing(params), params, TRACK_ORDER, skip, limit, cursor, count=count,
     )
-    result = await db.execute(query)
-    tracks = result.scalars().all()
-    
-    return list(tracks), total
\ No newline at end of file
@@ -1,18 +1,72 @@
-from typing import Annotated, AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from contextlib import asynccontextmanager
+from typing import Annotated, AsyncGenerator, AsyncIterator
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from fastapi import Depends
+from fastapi import Depends, Request, Response
 from app.config import get_settings
+from app import sql_log, statements
+from app.pool import InstrumentedPool
+from app.replicas import Replica, ReplicaSet
 
 settings = get_settings()
 
-# Engine async
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-)
+# Cookie que envía las lecturas de un cliente al primario justo después de
+# que escribió (leer lo propio aunque las réplicas estén atrasadas)
+PRIMARY_COOKIE = "db_primary"
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int, read_only: bool = False) -> AsyncEngine:
+    """Engine con el pool instrumentado, el log de SQL (app/sql_log.py) y las
+    métricas de su caché de compilación (app/statements.py).
+
+    Los de solo lectura usan conexiones en autocommit: cada consulta ve lo
+    último confirmado sin abrir una transacción que dure todo el request, y
+    al volver al pool no necesitan el ROLLBACK con que se resetean las demás.
+    """
+    options = {}
+    if read_only:
+        options = {"isolation_level": "AUTOCOMMIT", "pool_reset_on_return": None}
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        **options,
+    )
+    role = "read" if read_only else "primary"
+    sql_log.instrument_engine(engine, role)
+    statements.instrument_engine(engine, role)
+    return engine
+
+
+def _read_sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    """Sesiones de las lecturas, sobre un engine en autocommit.
+
+    No hay transacción que confirmar: quien la abre solo la cierra, y al
+    cerrarla la conexión vuelve al pool. Mientras tanto los objetos siguen
+    ligados a la sesión (cargas diferidas, varias consultas en la misma
+    conexión).
+    """
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+def _replica(url: str) -> Replica:
+    replica_engine = _create_engine(
+        url, settings.DB_REPLICA_POOL_SIZE, settings.DB_REPLICA_MAX_OVERFLOW, read_only=True
+    )
+    return Replica(replica_engine, _read_sessionmaker(replica_engine))
+
+
+# Engine async (primario)
+engine = _create_engine(settings.database_url, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -21,12 +75,36 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Lecturas en el primario (sin réplicas, o justo después de escribir): su
+# propio pool, con las conexiones siempre en autocommit. Suma conexiones al
+# primario además de las de `engine`, así que es más chico (ver .env.example)
+read_engine = _create_engine(
+    settings.database_url, settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW, read_only=True
+)
+ReadSessionLocal = _read_sessionmaker(read_engine)
+
+# Réplicas de lectura (vacío si no hay DB_REPLICA_URLS)
+replicas = ReplicaSet(
+    [_replica(url) for url in settings.replica_urls],
+    balancing=settings.DB_REPLICA_BALANCING,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG,
+    check_timeout=settings.DB_REPLICA_HEALTH_TIMEOUT,
+)
+
 # Base para los models
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency para obtener sesión de DB"""
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency para obtener sesión de DB (primario)"""
+    if replicas and settings.DB_REPLICA_STICKY_SECONDS and request.method not in ("GET", "HEAD"):
+        # Las lecturas siguientes de este cliente van al primario un rato
+        response.set_cookie(
+            PRIMARY_COOKIE, "1",
+            max_age=settings.DB_REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -38,8 +116,34 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def read_session(primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """Sesión para lecturas: en una réplica sana, o en el primario si no hay
+    ninguna o se pide `primary`"""
+    replica = None if primary else replicas.choose()
+    if replica is None:
+        async with ReadSessionLocal() as session:
+            yield session
+    else:
+        async with replica.session() as session:
+            yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency para endpoints de solo lectura (GET de listados y detalle).
+
+    Sin transacción ni COMMIT (ver _read_sessionmaker); la sesión se cierra
+    al terminar el request. Usa una réplica si hay
+    alguna sana; las escrituras y lo que se relee después de escribir deben
+    usar `get_db`.
+    """
+    async with read_session(primary=PRIMARY_COOKIE in request.cookies) as session:
+        yield session
+
+
 # Type alias moderno con Annotated para inyección de dependencias
 DBSession = Annotated[AsyncSession, Depends(get_db)]
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 async def init_db():
@@ -50,4 +154,6 @@ async def init_db():
 
 async def close_db():
     """Cierra las conexiones"""
-    await engine.dispose()
\ No newline at end of file
+    await engine.dispose()
+    await read_engine.dispose()
+    await replicas.dispose()
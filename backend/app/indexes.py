@@ -0,0 +1,438 @@
+"""Índices de los patrones de acceso de la API y verificación de los planes.
+
+Los índices se declaran en los models (`__table_args__`), así `create_all`
+(tests, benchmarks) ya los crea. Sobre una base existente los aplican las
+migraciones de MIGRATIONS, en orden:
+
+    python -m app.indexes migrate [--dry-run]
+
+Cada migración crea solo los índices que faltan: si la base ya tiene uno
+equivalente (las mismas columnas al principio; en InnoDB cuenta la clave
+primaria que todo índice secundario lleva al final) no se duplica, así los
+IFK_* del Chinook original se reutilizan donde alcanzan. También crean las
+tablas de soporte que falten: la de la versión del catálogo (ETag /
+Last-Modified), con los triggers que la incrementan.
+
+El checker ejecuta las funciones de app/crud con valores reales de la base,
+captura cada SELECT que emiten y le pide el plan al motor (EXPLAIN en MySQL,
+EXPLAIN QUERY PLAN en SQLite):
+
+    python -m app.indexes check [--large-table-rows 1000]
+
+Falla si alguna consulta recorre entera una tabla grande o si ordena sin
+índice (filesort) muchas filas. Las búsquedas con ILIKE '%...%' y las
+exportaciones completas recorren la tabla por definición: en ellas solo se
+verifica el orden.
+"""
+import argparse
+import asyncio
+import re
+import sys
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from sqlalchemy import Index, Select, event, func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+from app import playlists, recommendations, stats
+from app.crud import album, artist, customer, export, invoice, playlist, track
+from app.crud import stats as stats_crud
+from app.crud.counting import CountStrategy
+from app.database import Base
+from app.models import Album, CatalogVersion, Customer, Invoice, PlaylistTrack, Track
+from app.models.catalog_version import create_catalog_triggers, missing_catalog_triggers
+from app.profiling import fingerprint
+
+# Tablas con al menos estas filas se consideran grandes (--large-table-rows)
+LARGE_TABLE_ROWS = 1000
+
+
+class Migration(NamedTuple):
+    id: str
+    description: str
+    indexes: tuple[str, ...]  # nombres de índices declarados en los models
+    tables: tuple[str, ...] = ()  # tablas de los models que se crean si faltan
+
+
+MIGRATIONS = (
+    Migration(
+        "0001_catalog_order",
+        "Listados del catálogo ordenados por nombre o título, con y sin filtro",
+        (
+            "IX_ArtistName",
+            "IX_AlbumTitle",
+            "IX_AlbumArtistTitle",
+            "IX_TrackName",
+            "IX_TrackAlbumName",
+            "IX_TrackGenreName",
+            "IX_PlaylistName",
+            "IFK_PlaylistTrackTrackId",
+        ),
+    ),
+    Migration(
+        "0002_customers",
+        "Clientes por apellido y nombre; búsqueda por email",
+        ("IX_CustomerName", "UX_CustomerEmail"),
+    ),
+    Migration(
+        "0003_invoices",
+        "Facturas por fecha, cliente y empleado; líneas por factura y por track",
+        (
+            "IX_InvoiceDate",
+            "IX_InvoiceCustomerDate",
+            "IX_InvoiceEmployeeDate",
+            "IFK_InvoiceLineInvoiceId",
+            "IX_InvoiceLineTrack",
+        ),
+    ),
+    Migration(
+        "0004_catalog_version",
+        "Versión del catálogo para ETag / Last-Modified, con triggers en sus tablas",
+        (),
+        (CatalogVersion.__tablename__,),
+    ),
+)
+
+
+def declared_indexes() -> dict[str, Index]:
+    """Índices declarados en los models, por nombre"""
+    return {
+        index.name: index
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+
+
+def _existing_indexes(sync_conn) -> dict[str, list[tuple[tuple[str, ...], bool]]]:
+    """Por tabla: (columnas efectivas, es único) de cada índice existente"""
+    inspector = inspect(sync_conn)
+    implicit_pk = sync_conn.dialect.name == "mysql"
+    existing = {}
+    for table in Base.metadata.tables:
+        if not inspector.has_table(table):
+            continue
+        pk = tuple(inspector.get_pk_constraint(table)["constrained_columns"])
+        entries = [(pk, True)]
+        for index in inspector.get_indexes(table):
+            columns = tuple(index["column_names"])
+            unique = bool(index["unique"])
+            # InnoDB guarda la clave primaria al final de cada índice secundario
+            entries.append((columns + pk if implicit_pk and not unique else columns, unique))
+        for constraint in inspector.get_unique_constraints(table):
+            entries.append((tuple(constraint["column_names"]), True))
+        existing[table] = entries
+    return existing
+
+
+def is_covered(index: Index, existing: list[tuple[tuple[str, ...], bool]]) -> bool:
+    """Si algún índice existente ya sirve a las consultas de `index`.
+
+    Alcanza con que empiece por las mismas columnas; un índice único además
+    tiene que ser único sobre exactamente esas columnas.
+    """
+    wanted = tuple(column.name for column in index.columns)
+    if index.unique:
+        return any(unique and columns == wanted for columns, unique in existing)
+    return any(columns[:len(wanted)] == wanted for columns, _ in existing)
+
+
+async def migrate(engine: AsyncEngine, dry_run: bool = False) -> list[tuple[str, str, str]]:
+    """Aplica las migraciones de índices (y tablas) que falten.
+
+    Retorna (migración, objeto, estado) con estado "exists", "created" o,
+    con `dry_run`, "missing". La tabla de la versión del catálogo además
+    necesita sus triggers, que se reportan igual.
+    """
+    declared = declared_indexes()
+    report = []
+    async with engine.begin() as conn:
+        existing = await conn.run_sync(_existing_indexes)
+        for migration in MIGRATIONS:
+            for name in migration.tables:
+                if name in existing:
+                    report.append((migration.id, name, "exists"))
+                elif dry_run:
+                    report.append((migration.id, name, "missing"))
+                else:
+                    # Crearla también inserta su fila (ver app/models/catalog_version.py)
+                    await conn.run_sync(Base.metadata.tables[name].create)
+                    existing[name] = []
+                    report.append((migration.id, name, "created"))
+                if name == CatalogVersion.__tablename__:
+                    missing = await conn.run_sync(missing_catalog_triggers)
+                    if not dry_run:
+                        await conn.run_sync(create_catalog_triggers)
+                    status = "missing" if dry_run else "created"
+                    report.extend((migration.id, trigger, status) for trigger in missing)
+            for name in migration.indexes:
+                index = declared[name]
+                entries = existing.setdefault(index.table.name, [])
+                if is_covered(index, entries):
+                    report.append((migration.id, name, "exists"))
+                    continue
+                if dry_run:
+                    report.append((migration.id, name, "missing"))
+                    continue
+                await conn.run_sync(index.create)
+                entries.append((tuple(column.name for column in index.columns), bool(index.unique)))
+                report.append((migration.id, name, "created"))
+    return report
+
+
+# Checker de planes
+
+class Samples(NamedTuple):
+    """Valores reales de la base con los que se arman las consultas"""
+    track_id: int
+    album_id: int
+    artist_id: int
+    genre_id: int
+    customer_id: int
+    email: str
+    employee_id: int
+    invoice_id: int
+    playlist_id: int
+    last_date: Any
+
+
+class QueryCase(NamedTuple):
+    name: str
+    run: Callable[[AsyncSession, Samples], Awaitable[Any]]
+    allow_full_scan: bool = False
+
+
+class Problem(NamedTuple):
+    case: str
+    kind: str  # "full scan" o "filesort"
+    table: str
+    statement: str  # huella de la sentencia (app.profiling.fingerprint)
+
+
+async def _samples(db: AsyncSession) -> Samples:
+    a_track = (await db.execute(
+        select(Track.TrackId, Track.AlbumId, Track.GenreId)
+        .where(Track.AlbumId.is_not(None), Track.GenreId.is_not(None))
+        .order_by(Track.TrackId)
+        .limit(1)
+    )).one()
+    artist_id = await db.scalar(select(Album.ArtistId).where(Album.AlbumId == a_track.AlbumId))
+    an_invoice = (await db.execute(
+        select(Invoice.InvoiceId, Invoice.CustomerId, Invoice.EmployeeId, Invoice.InvoiceDate)
+        .where(Invoice.EmployeeId.is_not(None))
+        .order_by(Invoice.InvoiceId.desc())
+        .limit(1)
+    )).one()
+    email = await db.scalar(select(Customer.Email).where(Customer.CustomerId == an_invoice.CustomerId))
+    playlist_id = await db.scalar(select(func.min(PlaylistTrack.PlaylistId)))
+    return Samples(
+        track_id=a_track.TrackId,
+        album_id=a_track.AlbumId,
+        artist_id=artist_id,
+        genre_id=a_track.GenreId,
+        customer_id=an_invoice.CustomerId,
+        email=email,
+        employee_id=an_invoice.EmployeeId,
+        invoice_id=an_invoice.InvoiceId,
+        playlist_id=playlist_id or 0,
+        last_date=an_invoice.InvoiceDate.date(),
+    )
+
+
+async def _two_pages(fetch: Callable[[str | None], Awaitable[tuple]]) -> None:
+    """Primera página (OFFSET) y, si hay, la siguiente por cursor (keyset)"""
+    *_, next_cursor = await fetch(None)
+    if next_cursor:
+        await fetch(next_cursor)
+
+
+async def _first_row(db: AsyncSession, query: Select) -> None:
+    """Inicia una exportación: para el plan alcanza con la primera fila"""
+    result = await db.stream(query)
+    await result.first()
+
+
+EXACT = CountStrategy.EXACT
+
+CASES = (
+    QueryCase("tracks", lambda db, s: _two_pages(
+        lambda cursor: track.get_tracks(db, cursor=cursor, count=EXACT))),
+    QueryCase("tracks_by_album", lambda db, s: _two_pages(
+        lambda cursor: track.get_tracks(db, album_id=s.album_id, cursor=cursor, count=EXACT))),
+    QueryCase("tracks_by_genre", lambda db, s: _two_pages(
+        lambda cursor: track.get_tracks(db, genre_id=s.genre_id, cursor=cursor, count=EXACT))),
+    QueryCase("track_detail", lambda db, s: track.get_track(db, s.track_id)),
+    QueryCase("track_recommendations", lambda db, s: track.get_recommended_tracks(db, s.track_id)),
+    QueryCase("albums", lambda db, s: _two_pages(
+        lambda cursor: album.get_albums(db, cursor=cursor, count=EXACT))),
+    QueryCase("albums_by_artist", lambda db, s: album.get_albums(db, artist_id=s.artist_id, count=EXACT)),
+    QueryCase("album_detail", lambda db, s: album.get_album(db, s.album_id)),
+    QueryCase("artists", lambda db, s: _two_pages(
+        lambda cursor: artist.get_artists(db, cursor=cursor, count=EXACT))),
+    QueryCase("customers", lambda db, s: _two_pages(
+        lambda cursor: customer.get_customers(db, cursor=cursor, count=EXACT))),
+    QueryCase("customer_detail", lambda db, s: customer.get_customer(db, s.customer_id)),
+    QueryCase("customer_by_email", lambda db, s: customer.get_customer_by_email(db, s.email)),
+    QueryCase("invoices", lambda db, s: _two_pages(
+        lambda cursor: invoice.get_invoices(db, cursor=cursor, count=EXACT))),
+    QueryCase("invoices_by_customer", lambda db, s: _two_pages(
+        lambda cursor: invoice.get_customer_purchase_history(db, s.customer_id, cursor=cursor, count=EXACT))),
+    QueryCase("invoices_by_employee", lambda db, s: _two_pages(
+        lambda cursor: invoice.get_invoices(db, employee_id=s.employee_id, cursor=cursor, count=EXACT))),
+    QueryCase("invoices_by_date", lambda db, s: invoice.get_invoices(
+        db, start_date=s.last_date, end_date=s.last_date, count=EXACT)),
+    QueryCase("invoice_detail", lambda db, s: invoice.get_invoice_detail(db, s.invoice_id)),
+    QueryCase("playlists", lambda db, s: _two_pages(
+        lambda cursor: playlist.get_playlists(db, cursor=cursor, count=EXACT))),
+    QueryCase("playlist_tracks", lambda db, s: _two_pages(
+        lambda cursor: playlist.get_playlist_tracks(db, s.playlist_id, cursor=cursor))),
+    QueryCase("top_tracks", lambda db, s: stats_crud.get_top_tracks(db)),
+    QueryCase("top_customers", lambda db, s: stats_crud.get_top_customers(db)),
+    QueryCase("export_invoices_by_customer", lambda db, s: _first_row(
+        db, export.invoices_query(customer_id=s.customer_id))),
+    QueryCase("export_invoice_lines_by_customer", lambda db, s: _first_row(
+        db, export.invoice_lines_query(customer_id=s.customer_id))),
+    QueryCase("export_tracks_by_album", lambda db, s: _first_row(
+        db, export.tracks_query(album_id=s.album_id))),
+    # Recorren la tabla entera a propósito
+    QueryCase("search_tracks_ilike", lambda db, s: track.search_tracks(db, "love", count=EXACT),
+              allow_full_scan=True),
+    QueryCase("export_invoice_lines", lambda db, s: _first_row(db, export.invoice_lines_query()),
+              allow_full_scan=True),
+    QueryCase("export_tracks", lambda db, s: _first_row(db, export.tracks_query()),
+              allow_full_scan=True),
+)
+
+
+async def _explain(conn: AsyncConnection, statement: str, parameters) -> list[dict]:
+    if conn.dialect.name == "sqlite":
+        result = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [{"detail": row[-1]} for row in result]
+    result = await conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+    return [dict(row) for row in result.mappings()]
+
+
+def _mysql_problems(plan: list[dict], sizes: dict[str, int], large: int, allow_full_scan: bool):
+    for row in plan:
+        table = row.get("table") or ""
+        if row.get("type") == "ALL" and not allow_full_scan and sizes.get(table, 0) >= large:
+            yield "full scan", table
+        # `rows` estima las filas que se leen (y ordenan) de esa tabla
+        if "Using filesort" in (row.get("Extra") or "") and (row.get("rows") or 0) >= large:
+            yield "filesort", table
+
+
+# Contar una tabla entera la recorre siempre (la tabla o un índice); de
+# evitarlo se encargan las estrategias de app.crud.counting
+_UNFILTERED_COUNT = re.compile(r"SELECT count\(\*\) AS \w+\s+FROM \S+\s*$", re.IGNORECASE)
+
+# "SCAN Track", "SCAN TABLE Track" (SQLite < 3.36), "SEARCH Track USING INDEX ..."
+_SQLITE_STEP = re.compile(r"(SCAN|SEARCH)(?: TABLE)? (\w+)(.*)")
+
+
+def _sqlite_problems(plan: list[dict], sizes: dict[str, int], large: int, allow_full_scan: bool):
+    scanned = None  # última tabla grande recorrida entera (con o sin índice)
+    for row in plan:
+        detail = row["detail"]
+        step = _SQLITE_STEP.match(detail)
+        if step:
+            action, table, rest = step.groups()
+            if action == "SCAN" and sizes.get(table, 0) >= large:
+                scanned = table
+                if "USING" not in rest and not allow_full_scan:
+                    yield "full scan", table
+        # Ordenar lo que trae un SEARCH son pocas filas; lo que trae un SCAN, la tabla
+        elif detail.startswith("USE TEMP B-TREE FOR ORDER BY") and scanned:
+            yield "filesort", scanned
+
+
+class _Capture:
+    """Listener before_cursor_execute que guarda los SELECT mientras `statements`
+    no es None"""
+
+    def __init__(self):
+        self.statements: list[tuple[str, Any]] | None = None
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.statements is not None and statement.lstrip()[:6].upper() == "SELECT":
+            self.statements.append((statement, parameters))
+
+
+async def check(engine: AsyncEngine, large_table_rows: int = LARGE_TABLE_ROWS) -> tuple[int, list[Problem]]:
+    """Ejecuta CASES y revisa el plan de cada SELECT.
+
+    Retorna la cantidad de sentencias revisadas y los problemas encontrados.
+    """
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        sizes = {
+            name: await db.scalar(select(func.count()).select_from(table))
+            for name, table in Base.metadata.tables.items()
+        }
+        samples = await _samples(db)
+        # Los agregados en memoria recorren las ventas completas a propósito,
+        # una vez por proceso: se construyen antes de capturar
+        await stats.ensure_ready(db)
+        await playlists.ensure_ready(db)
+        await recommendations.ensure_ready(db)
+
+    problems_for = _mysql_problems if engine.dialect.name == "mysql" else _sqlite_problems
+    capture = _Capture()
+    checked = 0
+    problems = []
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        for case in CASES:
+            capture.statements = []
+            async with session_factory() as db:
+                await case.run(db, samples)
+            statements, capture.statements = capture.statements, None
+
+            async with engine.connect() as conn:
+                for statement, parameters in statements:
+                    plan = await _explain(conn, statement, parameters)
+                    checked += 1
+                    allow_full_scan = case.allow_full_scan or bool(_UNFILTERED_COUNT.match(statement))
+                    for kind, table in problems_for(plan, sizes, large_table_rows, allow_full_scan):
+                        problem = Problem(case.name, kind, table, fingerprint(statement))
+                        if problem not in problems:
+                            problems.append(problem)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    return checked, problems
+
+
+async def _run(args: argparse.Namespace) -> int:
+    from app.database import engine
+
+    try:
+        if args.command == "migrate":
+            for migration_id, name, status in await migrate(engine, args.dry_run):
+                print(f"  {migration_id} {name}: {status}", file=sys.stderr)
+            return 0
+
+        checked, problems = await check(engine, args.large_table_rows)
+        for problem in problems:
+            print(f"❌ {problem.case}: {problem.kind} en {problem.table}\n    {problem.statement}", file=sys.stderr)
+        if problems:
+            print(f"❌ {len(problems)} problemas en {checked} sentencias", file=sys.stderr)
+            return 1
+        print(f"✅ {checked} sentencias sin full scans ni filesorts en tablas grandes", file=sys.stderr)
+        return 0
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.indexes", description="Índices y planes de las consultas")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = commands.add_parser("migrate", help="Crear los índices (y tablas) que falten")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="Solo informar lo que falta")
+    check_parser = commands.add_parser("check", help="Revisar con EXPLAIN las consultas de app/crud")
+    check_parser.add_argument(
+        "--large-table-rows", type=int, default=LARGE_TABLE_ROWS,
+        help="Filas desde las que una tabla se considera grande",
+    )
+    return asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
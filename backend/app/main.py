@@ -1,22 +1,128 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from app.config import get_settings
-from app.database import close_db
+from app.database import AsyncSessionLocal, ReadSessionLocal, close_db, engine, read_engine, replicas
+from app.cache import cache_stats, refresh_catalog_version, run_catalog_version_checks
+from app.negotiation import NegotiationMiddleware
+from app.pool import pool_stats
+from app.profiling import install_profiling, instrument_engine, slowest_requests
+from app.search import build_indexes, run_rebuilds as run_index_rebuilds
+from app.sql_log import start_sql_log, stop_sql_log, stats as sql_log_stats
+from app.statements import stats as statement_stats
+from app.stats import build_rollups, run_rebuilds as run_rollup_rebuilds
+from app.playlists import build_totals, run_rebuilds as run_playlist_rebuilds
+from app.recommendations import build_recommendations, run_rebuilds, run_updates as run_recommendation_updates
+from app.serialization import FastJSONResponse
 from app.api.v1 import api_router
+from app.crud import fanout
 
 settings = get_settings()
 
 
+async def _build_search_indexes():
+    try:
+        await build_indexes(AsyncSessionLocal)
+        print("🔎 Índice de búsqueda listo")
+    except Exception as e:
+        print(f"⚠️ No se pudo construir el índice de búsqueda: {e}")
+
+
+async def _read_catalog_version():
+    try:
+        await refresh_catalog_version(ReadSessionLocal)
+    except Exception as e:
+        print(f"⚠️ No se pudo leer la versión del catálogo (¿falta `python -m app.indexes migrate`?): {e}")
+
+
+async def _build_sales_rollups():
+    try:
+        await build_rollups(AsyncSessionLocal)
+        print("📊 Estadísticas de ventas listas")
+    except Exception as e:
+        print(f"⚠️ No se pudieron construir las estadísticas: {e}")
+
+
+async def _build_recommendations():
+    try:
+        await build_recommendations(AsyncSessionLocal)
+        print("🎧 Recomendaciones listas")
+    except Exception as e:
+        print(f"⚠️ No se pudieron construir las recomendaciones: {e}")
+
+
+async def _build_playlist_totals():
+    try:
+        await build_totals(AsyncSessionLocal)
+        print("🎶 Totales de playlists listos")
+    except Exception as e:
+        print(f"⚠️ No se pudieron calcular los totales de playlists: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Maneja startup y shutdown events"""
     # Startup
     print(f"🚀 {settings.APP_NAME} iniciando...")
+    start_sql_log()
+    # Versión del catálogo para ETag / Last-Modified, compartida por los workers
+    await _read_catalog_version()
+    catalog_version_task = asyncio.create_task(
+        run_catalog_version_checks(ReadSessionLocal, settings.CATALOG_VERSION_INTERVAL)
+    )
+    # El índice de búsqueda se construye en segundo plano; mientras tanto
+    # las búsquedas usan ILIKE
+    index_tasks = []
+    if settings.SEARCH_INDEX_ENABLED:
+        index_tasks.append(asyncio.create_task(_build_search_indexes()))
+        if settings.SEARCH_INDEX_REBUILD_INTERVAL:
+            index_tasks.append(asyncio.create_task(
+                run_index_rebuilds(AsyncSessionLocal, settings.SEARCH_INDEX_REBUILD_INTERVAL)
+            ))
+    # Los agregados de estadísticas y de playlists también; si un request llega antes,
+    # espera a que terminen
+    stats_tasks = [asyncio.create_task(_build_sales_rollups())]
+    if settings.STATS_REBUILD_INTERVAL:
+        stats_tasks.append(asyncio.create_task(
+            run_rollup_rebuilds(AsyncSessionLocal, settings.STATS_REBUILD_INTERVAL)
+        ))
+    playlists_tasks = [asyncio.create_task(_build_playlist_totals())]
+    if settings.PLAYLIST_TOTALS_REBUILD_INTERVAL:
+        playlists_tasks.append(asyncio.create_task(
+            run_playlist_rebuilds(AsyncSessionLocal, settings.PLAYLIST_TOTALS_REBUILD_INTERVAL)
+        ))
+    # Matriz de co-compras: se construye al iniciar, suma por lotes las
+    # facturas de la API y se reconstruye periódicamente para incorporar las
+    # ventas escritas por fuera de ella
+    recommendations_tasks = [
+        asyncio.create_task(_build_recommendations()),
+        asyncio.create_task(run_recommendation_updates(settings.RECOMMENDATIONS_UPDATE_INTERVAL)),
+    ]
+    if settings.RECOMMENDATIONS_REBUILD_INTERVAL:
+        recommendations_tasks.append(asyncio.create_task(
+            run_rebuilds(AsyncSessionLocal, settings.RECOMMENDATIONS_REBUILD_INTERVAL)
+        ))
+    # Chequeos de salud de las réplicas de lectura
+    replicas_task = None
+    if replicas:
+        replicas_task = asyncio.create_task(replicas.run_health_checks(settings.DB_REPLICA_HEALTH_INTERVAL))
     yield
     # Shutdown
+    catalog_version_task.cancel()
+    for task in index_tasks:
+        task.cancel()
+    for task in stats_tasks:
+        task.cancel()
+    for task in playlists_tasks:
+        task.cancel()
+    for task in recommendations_tasks:
+        task.cancel()
+    if replicas_task:
+        replicas_task.cancel()
     print("🛑 Cerrando conexiones...")
     await close_db()
+    stop_sql_log()
 
 
 app = FastAPI(
@@ -24,6 +130,8 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
     debug=settings.DEBUG,
+    # Todas las respuestas JSON pasan por orjson y pueden salir en MessagePack
+    default_response_class=FastJSONResponse,
 )
 
 # CORS (para frontend)
@@ -35,6 +143,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Formato (JSON / MessagePack) y compresión según los headers Accept*; queda
+# dentro del perfilado para que este mida la compresión
+app.add_middleware(
+    NegotiationMiddleware,
+    encodings=settings.compression_encodings,
+    levels={
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_LEVEL,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    },
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    msgpack_enabled=settings.MSGPACK_ENABLED,
+)
+
+# Perfilado de SQL por request (opcional)
+if settings.PROFILING_ENABLED:
+    install_profiling(app, engine)
+    instrument_engine(read_engine)
+    for replica in replicas.replicas:
+        instrument_engine(replica.engine)
+
 # Incluir routers de la API
 app.include_router(api_router)
 
@@ -55,4 +184,51 @@ async def health():
     return {
         "status": "healthy",
         "service": settings.APP_NAME
-    }
\ No newline at end of file
+    }
+
+
+# Métricas internas (pools, réplicas, cachés, log de SQL): exponen la
+# topología y la carga de la base, así que solo se publican si se habilitan
+if settings.HEALTH_DETAILS_ENABLED:
+    @app.get("/health/cache", tags=["Health"])
+    async def health_cache():
+        """Aciertos, fallos y tamaño de las cachés del catálogo"""
+        return cache_stats()
+
+    @app.get("/health/sql-log", tags=["Health"])
+    async def health_sql_log():
+        """Sentencias medidas, registradas (por muestreo o por lentas) y descartadas
+        por el log de SQL"""
+        return sql_log_stats.snapshot()
+
+    @app.get("/health/statements", tags=["Health"])
+    async def health_statements():
+        """Reutilización de las sentencias preconstruidas y aciertos de la caché
+        de compilación de SQLAlchemy por rol de engine"""
+        return statement_stats.snapshot()
+
+    @app.get("/health/pool", tags=["Health"])
+    async def health_pool():
+        """Uso del pool de conexiones y tiempos de espera en el checkout
+        (`read`: el pool de las lecturas en el primario; `fanout`: consultas
+        ejecutadas en paralelo dentro de un request)"""
+        return {
+            **pool_stats(engine.pool),
+            "read": pool_stats(read_engine.pool),
+            "fanout": fanout.stats.snapshot(),
+        }
+
+    @app.get("/health/replicas", tags=["Health"])
+    async def health_replicas():
+        """Estado de las réplicas de lectura, sesiones activas y uso de sus pools"""
+        stats = replicas.stats()
+        for replica, replica_stats in zip(replicas.replicas, stats["replicas"]):
+            replica_stats["pool"] = pool_stats(replica.engine.pool)
+        return stats
+
+
+if settings.PROFILING_ENABLED:
+    @app.get("/debug/profiles", tags=["Debug"])
+    async def debug_profiles(limit: int = Query(20, ge=1, le=settings.PROFILING_BUFFER_SIZE)):
+        """Requests recientes más lentos con su perfil de SQL"""
+        return slowest_requests(limit)
\ No newline at end of file
@@ -9,6 +9,7 @@ from app.models.invoice import Invoice
 from app.models.invoice_line import InvoiceLine
 from app.models.playlist import Playlist
 from app.models.playlist_track import PlaylistTrack
+from app.models.catalog_version import CatalogVersion
 
 __all__ = [
     "Artist",
@@ -22,4 +23,5 @@ __all__ = [
     "InvoiceLine",
     "Playlist",
     "PlaylistTrack",
+    "CatalogVersion",
 ]
\ No newline at end of file
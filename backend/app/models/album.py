@@ -1,10 +1,15 @@
-from sqlalchemy import Integer, String, Column, ForeignKey
+from sqlalchemy import Integer, String, Column, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Album(Base):
     __tablename__ = "Album"
+    __table_args__ = (
+        # Orden de los listados, con y sin filtro por artista
+        Index("IX_AlbumTitle", "Title", "AlbumId"),
+        Index("IX_AlbumArtistTitle", "ArtistId", "Title", "AlbumId"),
+    )
     
     AlbumId = Column(Integer, primary_key=True, autoincrement=True)
     Title = Column(String(160), nullable=False)
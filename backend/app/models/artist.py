@@ -1,10 +1,14 @@
-from sqlalchemy import Integer, String, Column
+from sqlalchemy import Integer, String, Column, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Artist(Base):
     __tablename__ = "Artist"
+    __table_args__ = (
+        # Orden de los listados
+        Index("IX_ArtistName", "Name", "ArtistId"),
+    )
     
     ArtistId = Column(Integer, primary_key=True, autoincrement=True)
     Name = Column(String(120))
@@ -0,0 +1,71 @@
+import time
+
+from sqlalchemy import BigInteger, Column, Integer, event, text
+from app.database import Base
+
+# Tablas cuyas escrituras cambian la versión del catálogo
+CATALOG_TABLES = ("Artist", "Album", "Track", "Genre", "MediaType")
+
+_UPDATE_VERSION = {
+    "mysql": (
+        "CREATE TRIGGER `{name}` AFTER {operation} ON `{table}` FOR EACH ROW "
+        "UPDATE `CatalogVersion` SET `Version` = `Version` + 1, `Modified` = UNIX_TIMESTAMP() WHERE `Id` = 1"
+    ),
+    "sqlite": (
+        'CREATE TRIGGER "{name}" AFTER {operation} ON "{table}" BEGIN '
+        'UPDATE "CatalogVersion" SET "Version" = "Version" + 1, '
+        "\"Modified\" = CAST(strftime('%s', 'now') AS INTEGER) WHERE \"Id\" = 1; END"
+    ),
+}
+
+_EXISTING_TRIGGERS = {
+    "mysql": "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()",
+    "sqlite": "SELECT name FROM sqlite_master WHERE type = 'trigger'",
+}
+
+
+class CatalogVersion(Base):
+    """Versión del catálogo (una sola fila, Id = 1).
+
+    Los triggers de las tablas del catálogo la incrementan con cada escritura,
+    venga de la API, de otro proceso o de SQL directo; de ella salen el ETag
+    y el Last-Modified de las respuestas del catálogo (ver app/cache.py).
+    """
+    __tablename__ = "CatalogVersion"
+    
+    Id = Column(Integer, primary_key=True, autoincrement=False)
+    Version = Column(BigInteger, nullable=False)
+    Modified = Column(BigInteger, nullable=False)  # epoch en segundos
+
+
+def missing_catalog_triggers(connection) -> dict[str, str]:
+    """Nombre y DDL de los triggers que faltan (conexión sync)"""
+    dialect = connection.dialect.name
+    existing = set(connection.execute(text(_EXISTING_TRIGGERS[dialect])).scalars())
+    missing = {}
+    for table in CATALOG_TABLES:
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            name = f"TR_{table}{operation.title()}Version"
+            if name not in existing:
+                missing[name] = _UPDATE_VERSION[dialect].format(name=name, operation=operation, table=table)
+    return missing
+
+
+def create_catalog_triggers(connection) -> list[str]:
+    """Crea los triggers que falten y retorna sus nombres"""
+    missing = missing_catalog_triggers(connection)
+    for ddl in missing.values():
+        connection.exec_driver_sql(ddl)
+    return list(missing)
+
+
+@event.listens_for(CatalogVersion.__table__, "after_create")
+def _insert_version_row(target, connection, **kw):
+    connection.execute(target.insert().values(Id=1, Version=1, Modified=int(time.time())))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_triggers(target, connection, **kw):
+    # Después de crear todas las tablas: los triggers necesitan las del catálogo
+    if CatalogVersion.__tablename__ in target.tables:
+        create_catalog_triggers(connection)
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Customer(Base):
     __tablename__ = "Customer"
+    __table_args__ = (
+        # Orden de los listados y búsqueda por email (único)
+        Index("IX_CustomerName", "LastName", "FirstName", "CustomerId"),
+        Index("UX_CustomerEmail", "Email", unique=True),
+    )
     
-    CustomerId = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    CustomerId = Column(Integer, primary_key=True, autoincrement=True)
     FirstName = Column(String(40), nullable=False)
     LastName = Column(String(20), nullable=False)
     Company = Column(String(80))
@@ -17,7 +22,7 @@ class Customer(Base):
     PostalCode = Column(String(10))
     Phone = Column(String(24))
     Fax = Column(String(24))
-    Email = Column(String(60), nullable=False, unique=True)
+    Email = Column(String(60), nullable=False)
     SupportRepId = Column(Integer, ForeignKey("Employee.EmployeeId"))
     
     # Relación
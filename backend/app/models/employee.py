@@ -6,7 +6,7 @@ from app.database import Base
 class Employee(Base):
     __tablename__ = "Employee"
     
-    EmployeeId = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    EmployeeId = Column(Integer, primary_key=True, autoincrement=True)
     LastName = Column(String(20), nullable=False)
     FirstName = Column(String(20), nullable=False)
     Title = Column(String(30))
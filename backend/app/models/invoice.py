@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Invoice(Base):
     __tablename__ = "Invoice"
+    __table_args__ = (
+        # Orden de los listados (fecha descendente), con y sin filtro por cliente o empleado
+        Index("IX_InvoiceDate", "InvoiceDate", "InvoiceId"),
+        Index("IX_InvoiceCustomerDate", "CustomerId", "InvoiceDate", "InvoiceId"),
+        Index("IX_InvoiceEmployeeDate", "EmployeeId", "InvoiceDate", "InvoiceId"),
+    )
     
-    InvoiceId = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    InvoiceId = Column(Integer, primary_key=True, autoincrement=True)
     CustomerId = Column(Integer, ForeignKey("Customer.CustomerId"), nullable=False)
     InvoiceDate = Column(DateTime, nullable=False)
     BillingAddress = Column(String(70))
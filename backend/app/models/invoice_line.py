@@ -1,12 +1,17 @@
-from sqlalchemy import Column, Integer, DECIMAL, ForeignKey
+from sqlalchemy import Column, Integer, DECIMAL, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class InvoiceLine(Base):
     __tablename__ = "InvoiceLine"
+    __table_args__ = (
+        # Líneas de una factura (en orden de InvoiceLineId) y ventas de un track
+        Index("IFK_InvoiceLineInvoiceId", "InvoiceId"),
+        Index("IX_InvoiceLineTrack", "TrackId", "InvoiceId"),
+    )
     
-    InvoiceLineId = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    InvoiceLineId = Column(Integer, primary_key=True, autoincrement=True)
     InvoiceId = Column(Integer, ForeignKey("Invoice.InvoiceId"), nullable=False)
     TrackId = Column(Integer, ForeignKey("Track.TrackId"), nullable=False)
     UnitPrice = Column(DECIMAL(10, 2), nullable=False)
@@ -1,10 +1,14 @@
-from sqlalchemy import Integer, Column, ForeignKey
+from sqlalchemy import Integer, Column, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class PlaylistTrack(Base):
     __tablename__ = "PlaylistTrack"
+    __table_args__ = (
+        # Playlists que contienen un track (la PK empieza por PlaylistId)
+        Index("IFK_PlaylistTrackTrackId", "TrackId"),
+    )
     
     PlaylistId = Column(Integer, ForeignKey("Playlist.PlaylistId"), primary_key=True)
     TrackId = Column(Integer, ForeignKey("Track.TrackId"), primary_key=True)
@@ -1,10 +1,16 @@
-from sqlalchemy import Integer, String, Column, ForeignKey, Numeric
+from sqlalchemy import Integer, String, Column, ForeignKey, Index, Numeric
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class Track(Base):
     __tablename__ = "Track"
+    __table_args__ = (
+        # Orden de los listados, con y sin filtro por álbum o género
+        Index("IX_TrackName", "Name", "TrackId"),
+        Index("IX_TrackAlbumName", "AlbumId", "Name", "TrackId"),
+        Index("IX_TrackGenreName", "GenreId", "Name", "TrackId"),
+    )
     
     TrackId = Column(Integer, primary_key=True, autoincrement=True)
     Name = Column(String(200), nullable=False)
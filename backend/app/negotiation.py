@@ -0,0 +1,282 @@
+"""Negociación de contenido de las respuestas: formato y compresión.
+
+Formato: con `Accept: application/msgpack` (y msgpack instalado) las
+respuestas que pasan por `FastJSONResponse` se codifican en MessagePack; el
+resto de los clientes recibe JSON igual que antes. Los errores
+(HTTPException, validación) van siempre en JSON.
+
+Compresión: las respuestas de tipos compresibles (JSON, NDJSON, CSV,
+MessagePack) desde COMPRESSION_MIN_SIZE bytes se comprimen con zstd, brotli
+o gzip según Accept-Encoding y el orden de preferencia del servidor
+(COMPRESSION_ENCODINGS). zstd y brotli son opcionales (paquetes `zstandard`
+y `brotli`); los que no estén instalados no se ofrecen. Las respuestas en
+streaming (exportaciones) se comprimen bloque a bloque con un flush por
+bloque, así el cliente recibe cada lote a medida que sale de la base.
+
+Las respuestas negociables llevan `Vary: Accept, Accept-Encoding` para que
+nginx y los navegadores guarden cada representación por separado. El ETag
+del catálogo cambia con el formato (app/api/http_cache.py) pero no con la
+compresión: es débil, y el mismo contenido comprimido o no es equivalente.
+"""
+import time
+import zlib
+from typing import Callable, Protocol, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.profiling import record_compression
+from app.serialization import MSGPACK_MEDIA_TYPE, msgpack, response_format
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli es opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard es opcional
+    zstandard = None
+
+# Nombres con los que los clientes piden MessagePack
+_MSGPACK_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+# Content-Types que vale la pena comprimir
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    MSGPACK_MEDIA_TYPE,
+    "text/",
+)
+
+
+def parse_qualities(header: str) -> dict[str, float]:
+    """Valores de un header Accept/Accept-Encoding con su calidad `q`"""
+    qualities = {}
+    for part in header.split(","):
+        value, *params = part.split(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw)
+                except ValueError:
+                    quality = 0.0
+        qualities[value] = quality
+    return qualities
+
+
+def negotiate_format(accept: str | None) -> str:
+    """"msgpack" si el cliente lo prefiere a JSON (y está instalado); si no, "json".
+
+    Con la misma calidad gana MessagePack solo si JSON no está pedido
+    explícitamente (`application/msgpack, */*` es MessagePack).
+    """
+    if not accept or msgpack is None:
+        return "json"
+    qualities = parse_qualities(accept)
+    msgpack_quality = max(qualities.get(media_type, 0.0) for media_type in _MSGPACK_TYPES)
+    if msgpack_quality <= 0:
+        return "json"
+    if "application/json" in qualities:
+        json_quality = qualities["application/json"]
+        return "msgpack" if msgpack_quality > json_quality else "json"
+    json_quality = qualities.get("application/*", qualities.get("*/*", 0.0))
+    return "msgpack" if msgpack_quality >= json_quality else "json"
+
+
+def negotiate_encoding(accept_encoding: str | None, available: Sequence[str]) -> str | None:
+    """Codificación disponible con mayor `q`; los empates se resuelven por el
+    orden de `available` (preferencia del servidor). None: sin comprimir"""
+    if not accept_encoding:
+        return None
+    qualities = parse_qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    chosen, chosen_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, wildcard)
+        if quality > chosen_quality:
+            chosen, chosen_quality = encoding, quality
+    return chosen
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes:
+        """Cierra el bloque en curso para que el cliente pueda decodificarlo"""
+
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: formato gzip
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Content-Encoding -> fábrica de compresores (solo los instalados)
+COMPRESSORS: dict[str, Callable[[int], Compressor]] = {"gzip": _Gzip}
+if brotli is not None:
+    COMPRESSORS["br"] = _Brotli
+if zstandard is not None:
+    COMPRESSORS["zstd"] = _Zstd
+
+
+def _compressible(content_type: str) -> bool:
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+class _NegotiatedSend:
+    """`send` que comprime el cuerpo de la respuesta y agrega los Vary.
+
+    El inicio de la respuesta se retiene hasta el primer bloque del cuerpo:
+    recién ahí se sabe el tamaño (o si es un streaming) y se pueden
+    ajustar Content-Encoding y Content-Length.
+    """
+
+    def __init__(self, send: Send, encoding: str | None, level: int, minimum_size: int, vary: str):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.vary = vary
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            body = self._begin(start, body, more_body)
+            await self.send(start)
+        elif self.compressor is not None:
+            body = self._compress(body, more_body)
+        else:
+            await self.send(message)
+            return
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def _begin(self, start: Message, body: bytes, more_body: bool) -> bytes:
+        headers = MutableHeaders(scope=start)
+        status = start["status"]
+        compressible = _compressible(headers.get("content-type", ""))
+        if compressible or status == 304:
+            headers.add_vary_header(self.vary)
+
+        if (
+            self.encoding is None
+            or not compressible
+            or status in (204, 304)
+            or "content-encoding" in headers
+            or (not more_body and len(body) < self.minimum_size)
+        ):
+            return body
+
+        self.compressor = COMPRESSORS[self.encoding](self.level)
+        headers["Content-Encoding"] = self.encoding
+        body = self._compress(body, more_body)
+        if more_body:
+            # Streaming: el largo final no se conoce
+            del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+        return body
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        started = time.perf_counter()
+        data = self.compressor.compress(body)
+        data += self.compressor.flush() if more_body else self.compressor.finish()
+        record_compression((time.perf_counter() - started) * 1000)
+        return data
+
+
+class NegotiationMiddleware:
+    """Middleware ASGI que negocia el formato (Accept) y la compresión
+    (Accept-Encoding) de cada respuesta HTTP"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("zstd", "br", "gzip"),
+        levels: dict[str, int] | None = None,
+        minimum_size: int = 1024,
+        msgpack_enabled: bool = True,
+    ):
+        self.app = app
+        # Preferencia del servidor, sin los que no están instalados
+        self.encodings = [encoding for encoding in encodings if encoding in COMPRESSORS]
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+        self.minimum_size = minimum_size
+        self.msgpack_enabled = msgpack_enabled and msgpack is not None
+        self.vary = ", ".join(
+            header for header, enabled in (
+                ("Accept", self.msgpack_enabled),
+                ("Accept-Encoding", bool(self.encodings)),
+            ) if enabled
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.vary:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        fmt = negotiate_format(headers.get("accept")) if self.msgpack_enabled else "json"
+        encoding = negotiate_encoding(headers.get("accept-encoding"), self.encodings)
+        negotiated_send = _NegotiatedSend(
+            send, encoding, self.levels.get(encoding, 0), self.minimum_size, self.vary
+        )
+        token = response_format.set(fmt)
+        try:
+            await self.app(scope, receive, negotiated_send)
+        finally:
+            response_format.reset(token)
@@ -0,0 +1,116 @@
+"""Cantidad de tracks y duración total de cada playlist, en memoria.
+
+Se calculan con un GROUP BY sobre PlaylistTrack al arrancar y cada escritura
+de la API recalcula solo la playlist modificada (`refresh`), así el listado
+de playlists no agrega PlaylistTrack en cada request. Como los agregados de
+ventas, viven en cada proceso: los cambios de otros workers o hechos por
+SQL se reflejan en la reconstrucción periódica
+(PLAYLIST_TOTALS_REBUILD_INTERVAL). Las respuestas de una sola playlist no
+dependen de eso: leen sus totales en el momento (`current`, una consulta por
+el prefijo de la clave primaria).
+"""
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import PlaylistTrack, Track
+
+
+class PlaylistTotals:
+    """PlaylistId -> (cantidad de tracks, milisegundos totales)"""
+
+    def __init__(self):
+        self.ready = False
+        self._totals: dict[int, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def get(self, playlist_id: int) -> tuple[int, int]:
+        return self._totals.get(playlist_id, (0, 0))
+
+    def set(self, playlist_id: int, track_count: int, milliseconds: int) -> None:
+        self._totals[playlist_id] = (track_count, milliseconds)
+
+
+totals = PlaylistTotals()
+
+_build_lock = asyncio.Lock()
+# Playlists recalculadas mientras se construyen los totales (son más nuevas)
+_pending: dict[int, tuple[int, int]] | None = None
+
+
+def _totals_query():
+    return (
+        select(
+            PlaylistTrack.PlaylistId,
+            func.count(),
+            func.coalesce(func.sum(Track.Milliseconds), 0),
+        )
+        .join(Track, Track.TrackId == PlaylistTrack.TrackId)
+        .group_by(PlaylistTrack.PlaylistId)
+    )
+
+
+async def _build(session: AsyncSession) -> None:
+    global totals, _pending
+    _pending = {}
+    try:
+        built = PlaylistTotals()
+        result = await session.execute(_totals_query())
+        for playlist_id, track_count, milliseconds in result:
+            built.set(playlist_id, track_count, int(milliseconds))
+        for playlist_id, values in _pending.items():
+            built.set(playlist_id, *values)
+        built.ready = True
+        totals = built
+    finally:
+        _pending = None
+
+
+async def build_totals(session_factory: async_sessionmaker) -> None:
+    """(Re)construye los totales de todas las playlists"""
+    async with _build_lock:
+        async with session_factory() as session:
+            await _build(session)
+
+
+async def run_rebuilds(session_factory: async_sessionmaker, interval: float) -> None:
+    """Reconstruye los totales cada `interval` segundos (tarea de fondo)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await build_totals(session_factory)
+        except Exception as e:
+            print(f"⚠️ No se pudieron reconstruir los totales de playlists: {e}")
+
+
+async def ensure_ready(db: AsyncSession) -> PlaylistTotals:
+    """Totales listos para consultar; los construye si todavía no existen"""
+    if not totals.ready:
+        async with _build_lock:
+            if not totals.ready:
+                await _build(db)
+    return totals
+
+
+async def refresh(db: AsyncSession, playlist_id: int) -> tuple[int, int]:
+    """Recalcula los totales de una playlist después de modificarla.
+
+    Todo endpoint que cambie los tracks de una playlist debe llamarla
+    después del commit.
+    """
+    values = await current(db, playlist_id)
+    if _pending is not None:
+        _pending[playlist_id] = values
+    if totals.ready:
+        totals.set(playlist_id, *values)
+    return values
+
+
+async def current(db: AsyncSession, playlist_id: int) -> tuple[int, int]:
+    """Totales de una playlist leídos de la base, sin tocar los de memoria"""
+    result = await db.execute(_totals_query().where(PlaylistTrack.PlaylistId == playlist_id))
+    row = result.first()
+    return (row[1], int(row[2])) if row else (0, 0)
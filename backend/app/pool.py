@@ -0,0 +1,104 @@
+"""Pool de conexiones instrumentado: ocupación, overflow y espera en el checkout"""
+import time
+from bisect import bisect_left
+from typing import Sequence
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Límites de los buckets de espera en el checkout, en milisegundos
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """Histograma de buckets fijos (conteos acumulados, estilo Prometheus)"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        buckets = []
+        cumulative = 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            buckets.append({"le": bound, "count": cumulative})
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "avg": round(self.sum / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class PoolMetrics:
+    """Métricas acumuladas de un pool desde que se creó"""
+
+    def __init__(self, pool_size: int, max_overflow: int):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms = Histogram(WAIT_BUCKETS_MS)
+        # Conexiones en uso y en overflow vistas en cada checkout
+        self.checked_out = Histogram(range(pool_size + max(max_overflow, 0) + 1))
+        self.overflow = Histogram(range(max(max_overflow, 0) + 1))
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mide cada checkout.
+
+    La espera incluye el pre-ping, si está activo: es el tiempo que el
+    request queda bloqueado hasta tener una conexión usable.
+    """
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # El valor configurado (DB_*MAX_OVERFLOW en app/database.py)
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics(self.size(), max_overflow)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            self.metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+            raise
+
+        self.metrics.checkouts += 1
+        self.metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+        self.metrics.checked_out.observe(self.checkedout())
+        self.metrics.overflow.observe(max(self.overflow(), 0))
+        return connection
+
+
+def pool_stats(pool) -> dict:
+    """Estado actual y métricas acumuladas de un pool"""
+    stats = {
+        "size": pool.size(),
+        "max_overflow": getattr(pool, "max_overflow", None),
+        "timeout": pool.timeout() if hasattr(pool, "timeout") else None,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_ms=metrics.wait_ms.snapshot(),
+            checked_out_histogram=metrics.checked_out.snapshot(),
+            overflow_histogram=metrics.overflow.snapshot(),
+        )
+    return stats
@@ -0,0 +1,221 @@
+"""Perfilado de SQL por request (opcional, ver PROFILING_ENABLED).
+
+Los eventos del engine registran cada sentencia en el perfil del request en
+curso (una ContextVar que fija el middleware): cantidad, tiempo total, la
+más lenta y las que se repiten con la misma forma (candidatas a N+1). También
+se mide la serialización (la validación contra `response_model` que hace
+FastAPI y la codificación a JSON) y la compresión de app/negotiation.py.
+El middleware agrega el resumen como header `Server-Timing` y guarda los
+últimos requests en un buffer circular que muestra `/debug/profiles`.
+"""
+import asyncio
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+
+import fastapi.routing
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.serialization import FastJSONResponse
+
+settings = get_settings()
+
+# Largo máximo del SQL guardado en los perfiles
+_MAX_SQL_LENGTH = 500
+
+_PLACEHOLDER_LIST_RE = re.compile(r"\((?:\s*(?:%s|\?|%\(\w+\)s)\s*,)+\s*(?:%s|\?|%\(\w+\)s)\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Forma de una sentencia sin literales y con las listas IN colapsadas"""
+    statement = _PLACEHOLDER_LIST_RE.sub("(?+)", statement)
+    statement = _LITERAL_RE.sub("?", statement)
+    return _SPACES_RE.sub(" ", statement).strip()
+
+
+class RequestProfile:
+    """Sentencias ejecutadas durante un request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_ms = 0.0
+        self.serialization_ms = 0.0
+        self.compression_ms = 0.0
+        self.slowest: tuple[float, str] | None = None
+        self.counts: Counter[str] = Counter()
+        self.durations: Counter[str] = Counter()
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> None:
+        key = fingerprint(statement)
+        self.statements += 1
+        self.db_ms += elapsed_ms
+        self.counts[key] += 1
+        self.durations[key] += elapsed_ms
+        if self.slowest is None or elapsed_ms > self.slowest[0]:
+            self.slowest = (elapsed_ms, statement)
+
+    def repeated(self) -> list[dict]:
+        """Formas ejecutadas al menos PROFILING_REPEAT_THRESHOLD veces"""
+        return [
+            {"sql": key[:_MAX_SQL_LENGTH], "count": count, "total_ms": round(self.durations[key], 3)}
+            for key, count in self.counts.most_common()
+            if count >= settings.PROFILING_REPEAT_THRESHOLD
+        ]
+
+    def server_timing(self, total_ms: float) -> str:
+        metrics = [
+            f'db;dur={self.db_ms:.3f};desc="{self.statements} queries"',
+            f"ser;dur={self.serialization_ms:.3f}",
+            f"comp;dur={self.compression_ms:.3f}",
+            f"total;dur={total_ms:.3f}",
+        ]
+        if self.slowest:
+            metrics.insert(1, f"db-slowest;dur={self.slowest[0]:.3f}")
+        repeated = self.repeated()
+        if repeated:
+            metrics.append(f'db-repeated;desc="{len(repeated)} shapes x{repeated[0]["count"]}"')
+        return ", ".join(metrics)
+
+    def summary(self, status: int, total_ms: float) -> dict:
+        return {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "method": self.method,
+            "path": self.path,
+            "status": status,
+            "total_ms": round(total_ms, 3),
+            "db_ms": round(self.db_ms, 3),
+            "serialization_ms": round(self.serialization_ms, 3),
+            "compression_ms": round(self.compression_ms, 3),
+            "statements": self.statements,
+            "slowest": {
+                "ms": round(self.slowest[0], 3),
+                "sql": self.slowest[1][:_MAX_SQL_LENGTH],
+            } if self.slowest else None,
+            "repeated": self.repeated(),
+        }
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+# Últimos requests perfilados
+_recent: deque[dict] = deque(maxlen=settings.PROFILING_BUFFER_SIZE)
+
+
+def record_serialization(elapsed_ms: float) -> None:
+    """Suma tiempo de codificación de la respuesta al request en curso"""
+    profile = _current.get()
+    if profile is not None:
+        profile.serialization_ms += elapsed_ms
+
+
+def record_compression(elapsed_ms: float) -> None:
+    """Suma tiempo de compresión de la respuesta al request en curso"""
+    profile = _current.get()
+    if profile is not None:
+        profile.compression_ms += elapsed_ms
+
+
+def slowest_requests(limit: int = 20) -> list[dict]:
+    """Los requests más lentos del buffer, de mayor a menor duración"""
+    return sorted(_recent, key=lambda entry: entry["total_ms"], reverse=True)[:limit]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = getattr(context, "_profiling_started", None)
+    if profile is not None and started is not None:
+        profile.record_statement(statement, (time.perf_counter() - started) * 1000)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Registra los eventos de perfilado en un engine"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI que perfila cada request HTTP"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode("latin-1")
+        profile = RequestProfile(scope["method"], path)
+        token = _current.set(profile)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - profile.started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing(total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            total_ms = (time.perf_counter() - profile.started) * 1000
+            _recent.append(profile.summary(status, total_ms))
+
+
+def _time_serialization(function):
+    """Envuelve una función de serialización para medirla en el perfil"""
+    if getattr(function, "_profiled", False):
+        return function
+
+    if asyncio.iscoroutinefunction(function):
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                record_serialization((time.perf_counter() - started) * 1000)
+    else:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record_serialization((time.perf_counter() - started) * 1000)
+
+    timed._profiled = True
+    return timed
+
+
+def install_profiling(app: FastAPI, engine: AsyncEngine) -> None:
+    """Activa el perfilado: middleware, eventos del engine y medición de la
+    serialización (`serialize_response` de FastAPI y el render de las
+    respuestas JSON)"""
+    instrument_engine(engine)
+    fastapi.routing.serialize_response = _time_serialization(fastapi.routing.serialize_response)
+    JSONResponse.render = _time_serialization(JSONResponse.render)
+    FastJSONResponse.render = _time_serialization(FastJSONResponse.render)
+    app.add_middleware(ProfilingMiddleware)
@@ -0,0 +1,209 @@
+"""Recomendaciones "quienes compraron este track también compraron".
+
+La matriz de co-compras track × track es dispersa: por cada track se guarda
+solo el conteo de facturas que lo comparten con cada otro track, y se
+mantienen ordenados sus K vecinos con más co-compras. Se construye una vez
+desde InvoiceLine (agrupando por factura en una sola pasada, sin
+self-joins), así recomendar es leer una lista ya ordenada.
+
+Las facturas que crea la API se encolan (`record_invoice`, en el request) y
+se suman por lotes en un hilo cada RECOMMENDATIONS_UPDATE_INTERVAL segundos
+(`run_updates`), sin frenar el event loop aunque el carrito sea grande.
+Como los agregados de app/stats.py, la matriz vive en cada proceso; las ventas
+escritas por fuera de la API se reflejan en la reconstrucción periódica
+(RECOMMENDATIONS_REBUILD_INTERVAL).
+"""
+import asyncio
+import heapq
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.models import InvoiceLine
+
+settings = get_settings()
+
+# Filas de InvoiceLine por lote al leer el historial
+_BUILD_BATCH_SIZE = 5000
+
+
+class CoPurchases:
+    """Conteos de co-compra y los `k` vecinos principales de cada track.
+
+    Los conteos solo crecen: al sumar facturas, un vecino que no estaba entre
+    los `k` de un track solo puede entrar si su conteo creció. Basta con
+    volver a ordenar, para cada track de esas facturas, su lista anterior
+    junto con los vecinos que crecieron: la actualización es exacta.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.ready = False
+        self.invoices = 0
+        # TrackId -> {TrackId vecino: facturas en que se compraron juntos}
+        self._counts: dict[int, Counter] = {}
+        # TrackId -> vecinos por co-compras descendente, TrackId ascendente
+        self._top: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def count(self, basket: list[int]) -> None:
+        """Suma una factura (TrackIds sin repetir) a los conteos, sin tocar
+        las listas de vecinos"""
+        self.invoices += 1
+        if len(basket) < 2:
+            return
+        for position, track_id in enumerate(basket):
+            neighbors = self._counts.get(track_id)
+            if neighbors is None:
+                neighbors = self._counts[track_id] = Counter()
+            # Counter.update cuenta en C: un carrito grande no son n² llamadas
+            neighbors.update(basket[:position])
+            neighbors.update(basket[position + 1:])
+
+    def load(self, baskets: Iterable[list[int]]) -> None:
+        """Carga inicial: cuenta todo y ordena cada lista una sola vez"""
+        for basket in baskets:
+            self.count(basket)
+        self.rank()
+
+    def rank(self) -> None:
+        """Arma las listas de vecinos desde los conteos"""
+        for track_id, neighbors in self._counts.items():
+            self._rank(track_id, neighbors)
+
+    def _rank(self, track_id: int, candidates: Iterable[int]) -> None:
+        neighbors = self._counts[track_id]
+        # Se reemplaza la lista entera: quien lee nunca ve una a medio ordenar
+        self._top[track_id] = heapq.nsmallest(
+            self.k, candidates, key=lambda neighbor_id: (-neighbors[neighbor_id], neighbor_id)
+        )
+
+    def add_invoices(self, baskets: Iterable[Iterable[int]]) -> None:
+        """Suma facturas y reordena solo las listas de sus tracks"""
+        grown: dict[int, set[int]] = {}
+        for track_ids in baskets:
+            basket = sorted(set(track_ids))
+            self.count(basket)
+            if len(basket) > 1:
+                for track_id in basket:
+                    grown.setdefault(track_id, set()).update(basket)
+        for track_id, candidates in grown.items():
+            candidates.discard(track_id)
+            candidates.update(self._top.get(track_id, ()))
+            self._rank(track_id, candidates)
+
+    def add_invoice(self, track_ids: Iterable[int]) -> None:
+        self.add_invoices([track_ids])
+
+    def recommend(self, track_id: int, limit: int) -> list[tuple[int, int]]:
+        """Hasta `limit` (≤ k) vecinos de `track_id`: (TrackId, co-compras)"""
+        neighbors = self._counts.get(track_id, {})
+        return [(neighbor_id, neighbors[neighbor_id]) for neighbor_id in self._top.get(track_id, [])[:limit]]
+
+
+recommendations = CoPurchases(settings.RECOMMENDATIONS_TOP_K)
+
+_build_lock = asyncio.Lock()
+# Facturas guardadas que todavía no se sumaron a la matriz: (InvoiceId, TrackIds)
+_queued: list[tuple[int, list[int]]] = []
+# InvoiceIds que leyó la última reconstrucción: sus facturas encoladas ya
+# están contadas (se descarta en la siguiente actualización)
+_scanned: set[int] = set()
+
+
+def record_invoice(invoice_id: int, track_ids: Iterable[int]) -> None:
+    """Encola una factura recién guardada para sumarla a las co-compras.
+
+    Todo endpoint que cree facturas debe llamarla después del commit.
+    """
+    _queued.append((invoice_id, list(track_ids)))
+
+
+async def apply_queued() -> None:
+    """Suma a la matriz las facturas encoladas, en un hilo"""
+    global _queued, _scanned
+    async with _build_lock:
+        if not recommendations.ready:
+            # Quedan encoladas para la primera construcción
+            return
+        batch, _queued = _queued, []
+        baskets = [track_ids for invoice_id, track_ids in batch if invoice_id not in _scanned]
+        _scanned = set()
+        if baskets:
+            # Mientras tanto se sigue sirviendo: cada lista se reemplaza entera
+            await asyncio.to_thread(recommendations.add_invoices, baskets)
+
+
+async def run_updates(interval: float) -> None:
+    """Suma las facturas encoladas cada `interval` segundos (tarea de fondo)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await apply_queued()
+        except Exception as e:
+            print(f"⚠️ No se pudieron actualizar las recomendaciones: {e}")
+
+
+async def _baskets(session: AsyncSession):
+    """(InvoiceId, TrackIds distintos) de cada factura, en orden de factura"""
+    result = await session.stream(
+        select(InvoiceLine.InvoiceId, InvoiceLine.TrackId)
+        .order_by(InvoiceLine.InvoiceId)
+        .execution_options(yield_per=_BUILD_BATCH_SIZE)
+    )
+    current, basket = None, set()
+    async for rows in result.partitions():
+        for invoice_id, track_id in rows:
+            if invoice_id != current:
+                if basket:
+                    yield current, sorted(basket)
+                current, basket = invoice_id, set()
+            basket.add(track_id)
+    if basket:
+        yield current, sorted(basket)
+
+
+async def _build(session: AsyncSession) -> None:
+    global recommendations, _scanned
+    built = CoPurchases(settings.RECOMMENDATIONS_TOP_K)
+    # Una sola consulta: las facturas que no vio (guardadas después, tengan
+    # el InvoiceId que tengan) siguen en la cola y se suman a la nueva matriz
+    scanned = set()
+    async for invoice_id, basket in _baskets(session):
+        scanned.add(invoice_id)
+        built.count(basket)
+    built.rank()
+    built.ready = True
+    recommendations = built
+    _scanned = scanned
+
+
+async def build_recommendations(session_factory: async_sessionmaker) -> None:
+    """(Re)construye la matriz de co-compras desde el historial de ventas"""
+    async with _build_lock:
+        async with session_factory() as session:
+            await _build(session)
+
+
+async def run_rebuilds(session_factory: async_sessionmaker, interval: float) -> None:
+    """Reconstruye la matriz cada `interval` segundos (tarea de fondo)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await build_recommendations(session_factory)
+        except Exception as e:
+            print(f"⚠️ No se pudieron reconstruir las recomendaciones: {e}")
+
+
+async def ensure_ready(db: AsyncSession) -> CoPurchases:
+    """Matriz lista para consultar; la construye si todavía no existe"""
+    if not recommendations.ready:
+        async with _build_lock:
+            if not recommendations.ready:
+                await _build(db)
+    return recommendations
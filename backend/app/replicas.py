@@ -0,0 +1,167 @@
+"""Réplicas de lectura: balanceo y chequeos de salud.
+
+Las lecturas (GET de listados y detalle, exportaciones) se reparten entre las
+réplicas sanas con round-robin o por menos sesiones activas; las escrituras
+y sus relecturas usan siempre el primario (`app.database.get_db`). Una
+réplica se marca caída cuando falla su chequeo periódico (SELECT 1 y, si se
+configura, el retraso de replicación) o una conexión durante un request, y
+vuelve a recibir tráfico cuando un chequeo posterior pasa. Sin réplicas
+sanas las lecturas van al primario.
+"""
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+Balancing = Literal["round_robin", "least_connections"]
+
+
+class Replica:
+    """Una réplica: su engine, estado de salud y sesiones activas"""
+
+    def __init__(self, engine: AsyncEngine, session_factory: async_sessionmaker | None = None):
+        self.engine = engine
+        # Host y base, sin credenciales
+        url = engine.url
+        self.name = f"{url.host or 'local'}:{url.port or ''}/{url.database or ''}"
+        self.session_factory = session_factory or async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.healthy = True
+        self.active = 0
+        self.served = 0
+        self.failures = 0
+        self.lag_seconds: int | None = None
+        self.last_error: str | None = None
+        self.last_check: float | None = None
+
+    def mark_failed(self, error: Exception | str) -> None:
+        if self.healthy:
+            # El detalle queda en el log; /health/replicas no lo publica
+            print(f"⚠️ Réplica {self.name} fuera de rotación: {str(error)[:300]}")
+        self.healthy = False
+        self.failures += 1
+        self.last_error = str(error)[:300]
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        self.active += 1
+        self.served += 1
+        try:
+            async with self.session_factory() as session:
+                yield session
+        except exc.DBAPIError as error:
+            # Errores de conexión (no de la consulta): sacarla de rotación
+            if error.connection_invalidated or isinstance(error, exc.OperationalError):
+                self.mark_failed(error)
+            raise
+        finally:
+            self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "active_sessions": self.active,
+            "served": self.served,
+            "failures": self.failures,
+            "lag_seconds": self.lag_seconds,
+            "last_check_seconds_ago": round(time.monotonic() - self.last_check, 1) if self.last_check else None,
+        }
+
+
+async def _replication_lag(conn) -> int | None:
+    """Segundos de retraso informados por MySQL (None si no replica)"""
+    try:
+        result = await conn.execute(text("SHOW REPLICA STATUS"))
+        column = "Seconds_Behind_Source"
+    except exc.DBAPIError:
+        # MySQL < 8.0.22
+        result = await conn.execute(text("SHOW SLAVE STATUS"))
+        column = "Seconds_Behind_Master"
+    row = result.mappings().first()
+    if row is None:
+        return None
+    lag = row.get(column)
+    return None if lag is None else int(lag)
+
+
+class ReplicaSet:
+    """Réplicas de lectura con balanceo y chequeos de salud periódicos"""
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        balancing: Balancing = "round_robin",
+        max_lag_seconds: int | None = None,
+        check_timeout: float = 2.0,
+    ):
+        self.replicas = replicas
+        self.balancing = balancing
+        self.max_lag_seconds = max_lag_seconds
+        self.check_timeout = check_timeout
+        self.fallbacks = 0
+        self._next = itertools.count()
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Replica | None:
+        """Réplica sana para la próxima lectura, o None si no hay ninguna"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            if self.replicas:
+                self.fallbacks += 1
+            return None
+        if self.balancing == "least_connections":
+            return min(healthy, key=lambda replica: (replica.active, replica.served))
+        return healthy[next(self._next) % len(healthy)]
+
+    async def check(self, replica: Replica) -> None:
+        """Chequeo de salud de una réplica: conexión y retraso de replicación"""
+        async def probe():
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                if self.max_lag_seconds is not None and replica.engine.dialect.name == "mysql":
+                    return await _replication_lag(conn)
+                return None
+
+        replica.last_check = time.monotonic()
+        try:
+            lag = await asyncio.wait_for(probe(), self.check_timeout)
+        except (exc.SQLAlchemyError, OSError, asyncio.TimeoutError) as error:
+            replica.mark_failed(str(error) or type(error).__name__)
+            return
+
+        replica.lag_seconds = lag
+        if self.max_lag_seconds is not None and (lag is None or lag > self.max_lag_seconds):
+            # Sin replicación activa o demasiado atrasada
+            replica.mark_failed(f"retraso de replicación: {lag}")
+        else:
+            replica.healthy = True
+            replica.last_error = None
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Chequea todas las réplicas cada `interval` segundos (tarea de fondo)"""
+        while True:
+            await self.check_all()
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "balancing": self.balancing,
+            "max_lag_seconds": self.max_lag_seconds,
+            "fallbacks_to_primary": self.fallbacks,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
@@ -1,43 +1,100 @@
-from app.schemas.artist import Artist, ArtistList
-from app.schemas.album import Album, AlbumList, AlbumDetail
-from app.schemas.track import Track, TrackList, TrackDetail
+from app.schemas.artist import Artist, ArtistList, ArtistBatch
+from app.schemas.album import Album, AlbumList, AlbumDetail, AlbumBatch
+from app.schemas.track import Track, TrackList, TrackDetail, TrackBatch, TrackRecommendation, TrackRecommendations
 from app.schemas.genre import Genre, GenreList
+from app.schemas.media_type import MediaType
 from app.schemas.customer import (
     Customer,
     CustomerCreate,
     CustomerUpdate,
     CustomerList,
+    CustomerBatch,
 )
 from app.schemas.invoice import (
     Invoice,
     InvoiceCreate,
+    InvoiceImport,
+    InvoiceBulkCreate,
+    InvoiceBulkResult,
+    InvoiceBulkResponse,
     InvoiceDetail,
     InvoiceList,
     InvoiceItem,
     InvoiceItemDetail,
     InvoiceItemCreate,
 )
+from app.schemas.playlist import (
+    Playlist,
+    PlaylistCreate,
+    PlaylistSummary,
+    PlaylistList,
+    PlaylistTrackList,
+    PlaylistTracksUpdate,
+    PlaylistTracksAdded,
+    PlaylistTracksRemoved,
+)
+from app.schemas.stats import (
+    TopTrack,
+    TopGenre,
+    TopCustomer,
+    SalesByEmployee,
+    MonthlySales,
+    TopTracksResponse,
+    TopGenresResponse,
+    TopCustomersResponse,
+    SalesByEmployeeResponse,
+    MonthlySalesResponse,
+)
 
 __all__ = [
     "Artist",
     "ArtistList",
+    "ArtistBatch",
     "Album",
     "AlbumList",
     "AlbumDetail",
+    "AlbumBatch",
     "Track",
     "TrackList",
     "TrackDetail",
+    "TrackBatch",
+    "TrackRecommendation",
+    "TrackRecommendations",
     "Genre",
     "GenreList",
+    "MediaType",
     "Customer",
     "CustomerCreate",
     "CustomerUpdate",
     "CustomerList",
+    "CustomerBatch",
     "Invoice",
     "InvoiceCreate",
+    "InvoiceImport",
+    "InvoiceBulkCreate",
+    "InvoiceBulkResult",
+    "InvoiceBulkResponse",
     "InvoiceDetail",
     "InvoiceList",
     "InvoiceItem",
     "InvoiceItemDetail",
     "InvoiceItemCreate",
+    "Playlist",
+    "PlaylistCreate",
+    "PlaylistSummary",
+    "PlaylistList",
+    "PlaylistTrackList",
+    "PlaylistTracksUpdate",
+    "PlaylistTracksAdded",
+    "PlaylistTracksRemoved",
+    "TopTrack",
+    "TopGenre",
+    "TopCustomer",
+    "SalesByEmployee",
+    "MonthlySales",
+    "TopTracksResponse",
+    "TopGenresResponse",
+    "TopCustomersResponse",
+    "SalesByEmployeeResponse",
+    "MonthlySalesResponse",
 ]
\ No newline at end of file
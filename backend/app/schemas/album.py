@@ -25,6 +25,13 @@ class AlbumDetail(Album):
 class AlbumList(BaseModel):
     """Schema para lista de álbumes con paginación"""
     albums: list[AlbumDetail]
-    total: int
+    total: int | None  # None si se pidió include_total=false
     page: int
-    page_size: int
\ No newline at end of file
+    page_size: int
+    next_cursor: str | None = None  # Cursor de la página siguiente (None si no hay más)
+
+
+class AlbumBatch(BaseModel):
+    """Schema para búsqueda por lote: álbumes en el orden pedido"""
+    albums: list[AlbumDetail]
+    missing: list[int]  # IDs pedidos que no existen
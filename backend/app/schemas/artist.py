@@ -16,8 +16,15 @@ class Artist(ArtistBase):
 class ArtistList(BaseModel):
     """Schema para lista de artistas con paginación"""
     artists: list[Artist]
-    total: int
+    total: int | None  # None si se pidió include_total=false
     page: int
     page_size: int
+    next_cursor: str | None = None  # Cursor de la página siguiente (None si no hay más)
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArtistBatch(BaseModel):
+    """Schema para búsqueda por lote: artistas en el orden pedido"""
+    artists: list[Artist]
+    missing: list[int]  # IDs pedidos que no existen
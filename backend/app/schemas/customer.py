@@ -48,6 +48,13 @@ class Customer(CustomerBase):
 class CustomerList(BaseModel):
     """Schema para lista de clientes con paginación"""
     customers: list[Customer]
-    total: int
+    total: int | None  # None si se pidió include_total=false
     page: int
-    page_size: int
\ No newline at end of file
+    page_size: int
+    next_cursor: str | None = None  # Cursor de la página siguiente (None si no hay más)
+
+
+class CustomerBatch(BaseModel):
+    """Schema para búsqueda por lote: clientes en el orden pedido"""
+    customers: list[Customer]
+    missing: list[int]  # IDs pedidos que no existen
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
 from decimal import Decimal
 
@@ -53,6 +53,32 @@ class InvoiceCreate(BaseModel):
         return v
 
 
+class InvoiceImport(InvoiceCreate):
+    """Schema de una factura en una carga masiva"""
+    InvoiceDate: datetime | None = None  # Opcional - por defecto la fecha de carga
+
+
+class InvoiceBulkCreate(BaseModel):
+    """Schema para crear facturas en lote"""
+    invoices: list[InvoiceImport] = Field(..., min_length=1)
+
+
+class InvoiceBulkResult(BaseModel):
+    """Resultado de una factura de la carga masiva"""
+    index: int  # Posición en la lista recibida
+    success: bool
+    InvoiceId: int | None = None
+    Total: Decimal | None = None
+    error: str | None = None
+
+
+class InvoiceBulkResponse(BaseModel):
+    """Schema de respuesta de la carga masiva"""
+    results: list[InvoiceBulkResult]
+    created: int
+    failed: int
+
+
 class Invoice(BaseModel):
     """Schema de respuesta de Invoice"""
     InvoiceId: int
@@ -79,6 +105,7 @@ class InvoiceDetail(Invoice):
 class InvoiceList(BaseModel):
     """Schema para lista de facturas con paginación"""
     invoices: list[Invoice]
-    total: int
+    total: int | None  # None si se pidió include_total=false
     page: int
-    page_size: int
\ No newline at end of file
+    page_size: int
+    next_cursor: str | None = None  # Cursor de la página siguiente (None si no hay más)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class MediaTypeBase(BaseModel):
+    """Schema base para MediaType"""
+    Name: str | None = None
+
+
+class MediaType(MediaTypeBase):
+    """Schema para respuesta de MediaType"""
+    MediaTypeId: int
+    
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from pydantic import BaseModel, ConfigDict, Field
+from app.schemas.track import Track
+
+
+class PlaylistCreate(BaseModel):
+    """Schema para crear una playlist"""
+    Name: str = Field(..., min_length=1, max_length=120)
+
+
+class Playlist(BaseModel):
+    """Schema simple de Playlist"""
+    PlaylistId: int
+    Name: str | None = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PlaylistSummary(Playlist):
+    """Schema de Playlist con cantidad de tracks y duración total"""
+    track_count: int
+    total_milliseconds: int
+
+
+class PlaylistList(BaseModel):
+    """Schema para lista de playlists con paginación"""
+    playlists: list[PlaylistSummary]
+    total: int | None  # None si se pidió include_total=false
+    page: int
+    page_size: int
+    next_cursor: str | None = None  # Cursor de la página siguiente (None si no hay más)
+
+
+class PlaylistTrackList(BaseModel):
+    """Schema para los tracks de una playlist con paginación"""
+    tracks: list[Track]
+    total: int | None
+    page: int
+    page_size: int
+    next_cursor: str | None = None
+
+
+class PlaylistTracksUpdate(BaseModel):
+    """TrackIds a agregar o quitar de una playlist"""
+    TrackIds: list[int] = Field(..., min_length=1)
+
+
+class PlaylistTracksAdded(BaseModel):
+    """Resultado de agregar tracks a una playlist"""
+    added: int
+    ignored: int  # Ya estaban en la playlist o repetidos en el request
+    missing: list[int]  # TrackIds que no existen
+    track_count: int
+    total_milliseconds: int
+
+
+class PlaylistTracksRemoved(BaseModel):
+    """Resultado de quitar tracks de una playlist"""
+    removed: int
+    ignored: int  # No estaban en la playlist o repetidos en el request
+    track_count: int
+    total_milliseconds: int
@@ -0,0 +1,71 @@
+from datetime import date
+from decimal import Decimal
+from pydantic import BaseModel
+
+
+class TopTrack(BaseModel):
+    """Track con sus ventas acumuladas"""
+    TrackId: int
+    Name: str
+    total_sales: Decimal
+    units_sold: int
+    artist_name: str | None = None
+
+
+class TopGenre(BaseModel):
+    """Género con sus ventas acumuladas"""
+    GenreId: int
+    Name: str | None = None
+    total_sales: Decimal
+    tracks_sold: int
+
+
+class TopCustomer(BaseModel):
+    """Cliente con su gasto acumulado"""
+    CustomerId: int
+    FirstName: str
+    LastName: str
+    Email: str
+    total_spent: Decimal
+    total_purchases: int
+
+
+class SalesByEmployee(BaseModel):
+    """Ventas de un empleado (EmployeeId None: ventas sin empleado asignado)"""
+    EmployeeId: int | None = None
+    employee_name: str | None = None
+    total_sales: Decimal
+    total_invoices: int
+
+
+class MonthlySales(BaseModel):
+    """Ventas de un mes"""
+    year: int
+    month: int
+    total_sales: Decimal
+    total_invoices: int
+
+
+class TopTracksResponse(BaseModel):
+    tracks: list[TopTrack]
+    limit: int
+
+
+class TopGenresResponse(BaseModel):
+    genres: list[TopGenre]
+    limit: int
+
+
+class TopCustomersResponse(BaseModel):
+    customers: list[TopCustomer]
+    limit: int
+
+
+class SalesByEmployeeResponse(BaseModel):
+    sales: list[SalesByEmployee]
+
+
+class MonthlySalesResponse(BaseModel):
+    sales: list[MonthlySales]
+    start_date: date | None = None
+    end_date: date | None = None
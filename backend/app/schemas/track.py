@@ -34,6 +34,24 @@ class TrackDetail(Track):
 class TrackList(BaseModel):
     """Schema para lista de tracks con paginación"""
     tracks: list[TrackDetail]
-    total: int
+    total: int | None  # None si se pidió include_total=false
     page: int
-    page_size: int
\ No newline at end of file
+    page_size: int
+    next_cursor: str | None = None  # Cursor de la página siguiente (None si no hay más)
+
+
+class TrackBatch(BaseModel):
+    """Schema para búsqueda por lote: tracks en el orden pedido"""
+    tracks: list[TrackDetail]
+    missing: list[int]  # IDs pedidos que no existen
+
+
+class TrackRecommendation(TrackDetail):
+    """Track recomendado con la cantidad de facturas que lo comparten"""
+    co_purchases: int
+
+
+class TrackRecommendations(BaseModel):
+    """Schema de recomendaciones: lo que también compraron quienes compraron TrackId"""
+    TrackId: int
+    recommendations: list[TrackRecommendation]
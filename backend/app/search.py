@@ -0,0 +1,407 @@
+"""Índice de búsqueda en memoria para tracks, álbumes, artistas y clientes.
+
+Reemplaza los `ILIKE '%term%'` (que no pueden usar índices) por un índice
+invertido de tokens con búsqueda por prefijo, ranking por relevancia y
+tolerancia opcional a errores de tipeo mediante bigramas del vocabulario. Se construye al
+arrancar la app y se mantiene al día con las escrituras de clientes hechas
+por los CRUD de este worker; cada worker tiene su propia copia y la
+reconstruye cada `SEARCH_INDEX_REBUILD_INTERVAL` segundos. Mientras no esté
+listo, los CRUD usan el ILIKE de siempre.
+
+A diferencia del ILIKE, cada palabra buscada coincide con el inicio de una
+palabra del texto ("love" encuentra "Lovely Day" pero no "Glove Box").
+"""
+import asyncio
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Album, Artist, Customer, Track
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Mayor que cualquier carácter: cota superior de los tokens con un prefijo
+_MAX_CHAR = chr(0x10FFFF)
+
+# Puntos por token de la consulta según cómo coincide con el documento
+_EXACT, _PREFIX, _FUZZY = 3, 2, 1
+# Bonus si el texto completo empieza con la consulta
+_STARTS_WITH = 2
+# Revisar un documento a mano cuesta como unir unos 8 ids de las listas
+_SCAN_COST = 8
+
+
+def normalize(value: str | None) -> str:
+    """Minúsculas y sin acentos"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(value: str | None) -> list[str]:
+    return _TOKEN_RE.findall(normalize(value))
+
+
+def _bigrams(token: str) -> set[str]:
+    padded = f"${token}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _within_distance(a: str, b: str, max_distance: int) -> bool:
+    """Distancia de edición acotada (transposiciones cuentan como 1)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return False
+    before_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        if min(current) > max_distance:
+            return False
+        before_previous, previous = previous, current
+    return previous[-1] <= max_distance
+
+
+class SearchIndex:
+    """Índice invertido de tokens -> ids con vocabulario ordenado para prefijos.
+
+    Mientras se construye (`ready` en False) los documentos solo se acumulan;
+    `finish_build` ordena una sola vez el vocabulario y los documentos. Desde
+    ahí cada escritura mantiene ambos órdenes con `insort`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ready = False
+        self._texts: dict[int, str] = {}
+        self._sort_keys: dict[int, tuple[str, int]] = {}
+        self._doc_tokens: dict[int, set[str]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+        self._token_bigrams: dict[str, set[str]] = {}
+        # Documentos cuyo texto empieza con el token (para el bonus de inicio)
+        self._leading: dict[str, set[int]] = {}
+        # Ids ordenados por clave de orden, para no ordenar resultados grandes
+        self._ordered: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, doc_id: int, text: str | None, sort_key: str | None = None) -> None:
+        """Agrega o reemplaza un documento"""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+
+        tokens = set(tokenize(text))
+        normalized = self._texts[doc_id] = normalize(text)
+        self._sort_keys[doc_id] = (normalize(sort_key) if sort_key is not None else normalized, doc_id)
+        self._doc_tokens[doc_id] = tokens
+        leading = _TOKEN_RE.match(normalized)
+        if leading:
+            self._leading.setdefault(leading.group(), set()).add(doc_id)
+        if self.ready:
+            insort(self._ordered, doc_id, key=self._sort_keys.__getitem__)
+
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                if self.ready:
+                    insort(self._vocabulary, token)
+                for bigram in _bigrams(token):
+                    self._token_bigrams.setdefault(bigram, set()).add(token)
+            posting.add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """Elimina un documento si existe"""
+        tokens = self._doc_tokens.pop(doc_id, None)
+        if tokens is None:
+            return
+        if self.ready:
+            position = bisect_left(self._ordered, self._sort_keys[doc_id], key=self._sort_keys.__getitem__)
+            del self._ordered[position]
+        leading = _TOKEN_RE.match(self._texts.pop(doc_id))
+        if leading:
+            starting = self._leading[leading.group()]
+            starting.discard(doc_id)
+            if not starting:
+                del self._leading[leading.group()]
+        del self._sort_keys[doc_id]
+
+        for token in tokens:
+            posting = self._postings[token]
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[token]
+                if self.ready:
+                    del self._vocabulary[bisect_left(self._vocabulary, token)]
+                for bigram in _bigrams(token):
+                    similar = self._token_bigrams[bigram]
+                    similar.discard(token)
+                    if not similar:
+                        del self._token_bigrams[bigram]
+
+    def finish_build(self) -> None:
+        """Ordena vocabulario y documentos una sola vez y habilita las búsquedas"""
+        self._vocabulary = sorted(self._postings)
+        self._ordered = sorted(self._sort_keys, key=self._sort_keys.__getitem__)
+        self.ready = True
+
+    def _prefix_tokens(self, prefix: str) -> list[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + _MAX_CHAR, lo=start)
+        return self._vocabulary[start:end]
+
+    def _fuzzy_tokens(self, token: str) -> Iterable[str]:
+        max_distance = 1 if len(token) < 8 else 2
+        bigrams = _bigrams(token)
+        shared = Counter()
+        for bigram in bigrams:
+            shared.update(self._token_bigrams.get(bigram, ()))
+        # Cada edición cambia a lo sumo 3 bigramas (una transposición)
+        min_shared = max(1, len(bigrams) - 3 * max_distance)
+        for candidate, count in shared.items():
+            if (
+                count >= min_shared
+                and candidate != token
+                and _within_distance(token, candidate, max_distance)
+            ):
+                yield candidate
+
+    def _postings_exceed(self, tokens: list[str], size: int) -> bool:
+        """Si las listas de `tokens` suman más de `size` documentos"""
+        if len(tokens) > size:
+            # Cada lista tiene al menos un documento
+            return True
+        total = 0
+        for token in tokens:
+            total += len(self._postings[token])
+            if total > size:
+                return True
+        return False
+
+    def _match(
+        self, token: str, fuzzy: bool, within: set[int] | None = None
+    ) -> list[tuple[int, set[int]]]:
+        """Documentos que coinciden con un token de la consulta, en grupos
+        disjuntos según los puntos de la mejor coincidencia.
+
+        Con `within` solo se consideran esos documentos: si unir las listas
+        de todos los tokens con ese prefijo cuesta más, se revisan uno por uno.
+        """
+        prefix_tokens = self._prefix_tokens(token)
+        similar = set(self._fuzzy_tokens(token)) if fuzzy else set()
+        if within is not None and self._postings_exceed(prefix_tokens, len(within) * _SCAN_COST):
+            exact, prefixed, fuzzed = set(), set(), set()
+            for doc_id in within:
+                doc_tokens = self._doc_tokens[doc_id]
+                if token in doc_tokens:
+                    exact.add(doc_id)
+                elif any(t.startswith(token) for t in doc_tokens):
+                    prefixed.add(doc_id)
+                elif not similar.isdisjoint(doc_tokens):
+                    fuzzed.add(doc_id)
+            return [(_EXACT, exact), (_PREFIX, prefixed), (_FUZZY, fuzzed)]
+
+        exact = self._postings.get(token, set())
+        prefixed = set().union(*(self._postings[t] for t in prefix_tokens if t != token))
+        groups = [(_EXACT, exact), (_PREFIX, prefixed - exact)]
+        if fuzzy:
+            fuzzed = set().union(*(self._postings[t] for t in similar))
+            groups.append((_FUZZY, fuzzed - exact - prefixed))
+        return groups
+
+    def _starting_with(self, query: str, tokens: list[str], candidates: set[int]) -> set[int]:
+        """Candidatos cuyo texto completo empieza con la consulta"""
+        prefix_tokens = self._prefix_tokens(tokens[0])
+        if query.startswith(tokens[0]) and len(prefix_tokens) < len(candidates):
+            # Quien empieza con la consulta tiene como primer token uno con el
+            # prefijo del primer token buscado
+            starting = set().union(*(self._leading[t] for t in prefix_tokens if t in self._leading))
+            starting &= candidates
+            if query == tokens[0]:
+                return starting
+        else:
+            starting = candidates
+        return {doc_id for doc_id in starting if self._texts[doc_id].startswith(query)}
+
+    def _first_in_order(self, docs: set[int], limit: int | None) -> list[int]:
+        """Los primeros `limit` documentos de `docs` según la clave de orden"""
+        if limit is None:
+            return sorted(docs, key=self._sort_keys.__getitem__)
+        if limit * len(self._ordered) < len(docs) ** 2:
+            # Muchos documentos: suele costar menos recorrer el orden global
+            # hasta juntar `limit`. Con tope, por si están todos al final
+            budget = 4 * limit * len(self._ordered) // len(docs)
+            first = list(islice(filter(docs.__contains__, islice(self._ordered, budget)), limit))
+            if len(first) == limit:
+                return first
+        return heapq.nsmallest(limit, docs, key=self._sort_keys.__getitem__)
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        fuzzy: bool = False,
+    ) -> tuple[list[int], int]:
+        """Busca documentos que contengan todos los tokens de la consulta.
+
+        Cada token coincide exacto, como prefijo o (con `fuzzy`) con hasta 1-2
+        errores de tipeo. Retorna los ids de los `limit` mejores resultados por
+        relevancia (desempatando por la clave de orden) y el total de
+        coincidencias.
+
+        Los puntos se calculan por grupos con operaciones de conjuntos, sin
+        puntuar cada documento; de los grupos solo se ordena lo necesario para
+        llegar a `limit`.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return [], 0
+
+        # Primero el token más específico (menos tokens del vocabulario con ese
+        # prefijo); los demás solo se evalúan sobre los candidatos que quedan
+        by_specificity = sorted(tokens, key=lambda token: len(self._prefix_tokens(token)))
+        # Puntos acumulados -> documentos que coinciden con todos los tokens vistos
+        scores = {points: docs for points, docs in self._match(by_specificity[0], fuzzy) if docs}
+        for token in by_specificity[1:]:
+            match = self._match(token, fuzzy, within=set().union(*scores.values()))
+            merged: dict[int, set[int]] = {}
+            for score, docs in scores.items():
+                for points, matched in match:
+                    both = docs & matched
+                    if both:
+                        merged.setdefault(score + points, set()).update(both)
+            scores = merged
+            if not scores:
+                return [], 0
+
+        candidates = set().union(*scores.values())
+        starting = self._starting_with(normalize(query).strip(), tokens, candidates)
+        if starting:
+            boosted: dict[int, set[int]] = {}
+            for score, docs in scores.items():
+                for points, part in ((score + _STARTS_WITH, docs & starting), (score, docs - starting)):
+                    if part:
+                        boosted.setdefault(points, set()).update(part)
+            scores = boosted
+
+        ranked: list[int] = []
+        for score in sorted(scores, reverse=True):
+            remaining = None if limit is None else limit - len(ranked)
+            if remaining == 0:
+                break
+            ranked.extend(self._first_in_order(scores[score], remaining))
+        return ranked, len(candidates)
+
+
+tracks = SearchIndex("tracks")
+albums = SearchIndex("albums")
+artists = SearchIndex("artists")
+customers = SearchIndex("customers")
+
+# Filas leídas por lote al construir los índices
+_BUILD_BATCH_SIZE = 10000
+
+_build_lock = asyncio.Lock()
+# Escrituras de clientes durante una reconstrucción: (id, (texto, orden)) o
+# (id, None) si se eliminó. Se aplican al índice nuevo antes de reemplazar al
+# actual
+_pending: list[tuple[int, tuple[str, str] | None]] | None = None
+
+
+def _customer_text(customer) -> str:
+    return " ".join(
+        part or ""
+        for part in (customer.FirstName, customer.LastName, customer.Email, customer.Company)
+    )
+
+
+def _customer_sort_key(customer) -> str:
+    return f"{customer.LastName} {customer.FirstName}"
+
+
+def index_customer(customer) -> None:
+    """Agrega o actualiza un cliente en el índice"""
+    document = (_customer_text(customer), _customer_sort_key(customer))
+    customers.add(customer.CustomerId, *document)
+    if _pending is not None:
+        _pending.append((customer.CustomerId, document))
+
+
+def remove_customer(customer_id: int) -> None:
+    customers.remove(customer_id)
+    if _pending is not None:
+        _pending.append((customer_id, None))
+
+
+async def build_indexes(session_factory: async_sessionmaker) -> None:
+    """(Re)construye todos los índices leyendo las tablas por lotes.
+
+    Los índices nuevos se llenan aparte y reemplazan a los actuales recién al
+    final, así una reconstrucción no deja las búsquedas sin índice. El
+    catálogo no tiene endpoints de escritura: sus cambios (y los clientes
+    escritos desde otros workers) aparecen en la siguiente reconstrucción.
+    """
+    global tracks, albums, artists, customers, _pending
+    sources = (
+        (select(Track.TrackId, Track.Name), lambda row: (row[1], None)),
+        (select(Album.AlbumId, Album.Title), lambda row: (row[1], None)),
+        (select(Artist.ArtistId, Artist.Name), lambda row: (row[1], None)),
+        (
+            select(
+                Customer.CustomerId,
+                Customer.FirstName,
+                Customer.LastName,
+                Customer.Email,
+                Customer.Company,
+            ),
+            lambda row: (_customer_text(row), _customer_sort_key(row)),
+        ),
+    )
+    async with _build_lock:
+        _pending = []
+        try:
+            built = []
+            async with session_factory() as session:
+                for (query, document), current in zip(sources, (tracks, albums, artists, customers)):
+                    index = SearchIndex(current.name)
+                    rows = await session.stream(query.execution_options(yield_per=_BUILD_BATCH_SIZE))
+                    async for row in rows:
+                        index.add(row[0], *document(row))
+                    index.finish_build()
+                    built.append(index)
+
+            for customer_id, document in _pending:
+                if document is None:
+                    built[3].remove(customer_id)
+                else:
+                    built[3].add(customer_id, *document)
+            tracks, albums, artists, customers = built
+        finally:
+            _pending = None
+
+
+async def run_rebuilds(session_factory: async_sessionmaker, interval: float) -> None:
+    """Reconstruye los índices cada `interval` segundos (tarea de fondo)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await build_indexes(session_factory)
+        except Exception as e:
+            print(f"⚠️ No se pudo reconstruir el índice de búsqueda: {e}")
@@ -0,0 +1,121 @@
+"""Serialización rápida para las respuestas de la API.
+
+FastAPI valida el valor retornado contra `response_model` y después lo
+codifica con `json.dumps`, así que un listado construido con schemas se
+valida dos veces por fila. Aquí los payloads se arman como dicts en una
+sola pasada desde las filas (en el orden de campos del schema, para que el
+JSON sea idéntico byte a byte) y se codifican con orjson si está instalado.
+
+Los endpoints siguen declarando `response_model` para la documentación;
+al retornar una `FastJSONResponse` FastAPI no lo vuelve a validar.
+
+Si el cliente pidió MessagePack (`Accept`, ver app/negotiation.py) y
+msgpack está instalado, `FastJSONResponse` codifica el mismo contenido en
+ese formato.
+"""
+import json
+from contextvars import ContextVar
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Mapping
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack es opcional
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Formato de respuesta negociado para el request en curso ("json" o
+# "msgpack"); lo fija el middleware de app.negotiation
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def _default(value: Any) -> Any:
+    """Tipos que orjson/json no codifican como lo hace pydantic"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Codifica igual que el JSONResponse de FastAPI (compacto, UTF-8)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    """Codifica en MessagePack con las mismas conversiones que `dumps`"""
+    return msgpack.packb(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que codifica con `dumps` (o en MessagePack si se negoció)"""
+
+    def render(self, content: Any) -> bytes:
+        if msgpack is not None and response_format.get() == "msgpack":
+            # Response.__init__ arma los headers después de render
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return dumps_msgpack(content)
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _field_names(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def row_to_dict(row: Any, schema: type[BaseModel], **values: Any) -> dict:
+    """Campos de `schema` leídos de una fila ORM, mapping o modelo.
+
+    Las claves quedan en el orden del schema. `values` reemplaza campos
+    calculados o anidados (ya convertidos a dict); no se leen de la fila.
+    """
+    if isinstance(row, Mapping):
+        return {name: values[name] if name in values else row.get(name) for name in _field_names(schema)}
+    return {name: values[name] if name in values else getattr(row, name, None) for name in _field_names(schema)}
+
+
+def list_response(
+    key: str,
+    items: list[dict],
+    total: int | None,
+    page: int,
+    page_size: int,
+    next_cursor: str | None = None,
+) -> FastJSONResponse:
+    """Respuesta con la forma de los schemas *List paginados"""
+    return FastJSONResponse({
+        key: items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+    })
+
+
+def batch_response(key: str, ids: list[int], found: Mapping[int, dict]) -> FastJSONResponse:
+    """Respuesta con la forma de los schemas *Batch: los items en el orden
+    de `ids` y los IDs que no están en `found` en `missing`"""
+    return FastJSONResponse({
+        key: [found[item_id] for item_id in ids if item_id in found],
+        "missing": [item_id for item_id in ids if item_id not in found],
+    })
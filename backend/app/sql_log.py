@@ -0,0 +1,157 @@
+"""Log estructurado de SQL: muestreado, fuera del event loop y en JSON.
+
+Reemplaza al `echo` del engine, que escribía cada sentencia con sus
+parámetros en stdout de forma sincrónica, dentro del event loop. Aquí los
+eventos del engine solo miden la sentencia y deciden si se registra: las
+que tardan al menos SQL_LOG_SLOW_MS siempre, el resto con probabilidad
+SQL_LOG_SAMPLE_RATE. El registro va a una cola acotada; un hilo aparte
+(QueueListener) calcula la huella de la sentencia (la forma sin literales
+de app.profiling) y escribe una línea JSON por sentencia. Los parámetros
+nunca se registran. Si la cola se llena los registros se descartan (y se
+cuentan) en lugar de frenar los requests.
+"""
+import logging
+import queue
+import random
+import sys
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import get_settings
+from app.profiling import fingerprint
+from app.serialization import dumps
+
+settings = get_settings()
+
+logger = logging.getLogger("app.sql")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+
+class SqlLogStats:
+    """Contadores acumulados del log de SQL (ver /health/sql-log)"""
+
+    def __init__(self):
+        self.statements = 0  # sentencias medidas
+        self.sampled = 0     # registradas por muestreo
+        self.slow = 0        # registradas por superar SQL_LOG_SLOW_MS
+        self.dropped = 0     # descartadas con la cola llena
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": settings.SQL_LOG_ENABLED,
+            "sample_rate": settings.SQL_LOG_SAMPLE_RATE,
+            "slow_ms": settings.SQL_LOG_SLOW_MS,
+            "statements": self.statements,
+            "sampled": self.sampled,
+            "slow": self.slow,
+            "dropped": self.dropped,
+            "queued": _queue.qsize(),
+        }
+
+
+stats = SqlLogStats()
+
+
+class JSONFormatter(logging.Formatter):
+    """Una línea JSON por sentencia. Corre en el hilo del listener, así la
+    huella y la codificación no ocupan el event loop"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return dumps({
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "event": "sql",
+            "db": record.db,
+            "role": record.role,
+            "ms": round(record.elapsed_ms, 3),
+            "slow": record.slow,
+            "rows": record.rows,
+            "executemany": record.executemany,
+            "fingerprint": fingerprint(record.statement),
+        }).decode()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler que no formatea en el hilo que registra y que descarta
+    en lugar de bloquear cuando la cola está llena"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            stats.dropped += 1
+
+
+_queue: queue.Queue = queue.Queue(settings.SQL_LOG_QUEUE_SIZE)
+_listener: QueueListener | None = None
+
+if settings.SQL_LOG_ENABLED:
+    logger.addHandler(_DroppingQueueHandler(_queue))
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """Registra los eventos del log en un engine (`role`: "primary" o "read")"""
+    if not settings.SQL_LOG_ENABLED:
+        return
+    url = engine.url
+    db = f"{url.host}/{url.database}" if url.host else url.database
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._sql_log_started = time.perf_counter()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_sql_log_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats.statements += 1
+        slow = bool(settings.SQL_LOG_SLOW_MS) and elapsed_ms >= settings.SQL_LOG_SLOW_MS
+        if slow:
+            stats.slow += 1
+        elif random.random() < settings.SQL_LOG_SAMPLE_RATE:
+            stats.sampled += 1
+        else:
+            return
+        logger.info("sql", extra={
+            "db": db,
+            "role": role,
+            "elapsed_ms": elapsed_ms,
+            "slow": slow,
+            "rows": cursor.rowcount,
+            "executemany": executemany,
+            "statement": statement,
+        })
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+def start_sql_log() -> None:
+    """Arranca el hilo que escribe el log (stderr o SQL_LOG_FILE)"""
+    global _listener
+    if _listener is not None or not settings.SQL_LOG_ENABLED:
+        return
+    if settings.SQL_LOG_FILE:
+        output = logging.FileHandler(settings.SQL_LOG_FILE)
+    else:
+        output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JSONFormatter())
+    _listener = QueueListener(_queue, output)
+    _listener.start()
+
+
+def stop_sql_log() -> None:
+    """Escribe lo que quedó en la cola y detiene el hilo"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
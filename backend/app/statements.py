@@ -0,0 +1,131 @@
+"""Sentencias preconstruidas para las lecturas frecuentes.
+
+Aunque el SQL compilado quede en la caché del engine, construir un select()
+del ORM (con sus where, options, order_by...) y calcular su clave de caché
+cuesta en Python en cada request. Las lecturas frecuentes usan en cambio
+sentencias construidas una sola vez con bindparam() en lugar de valores: la
+clave de caché de un Select se memoriza en el objeto, así cada ejecución
+siguiente va directo al SQL compilado y los valores viajan como parámetros.
+
+Las búsquedas por id son constantes de cada módulo CRUD. Las sentencias que
+dependen de qué filtros vienen (listados, conteos, páginas por cursor) se
+arman con `prepared(key, build)`: `key` describe la forma de la consulta,
+nunca los valores, así la cantidad de formas está acotada por el código.
+
+Las reutilizaciones de esta capa y los aciertos de la caché de compilación
+de cada engine (`instrument_engine`) se ven en /health/statements.
+"""
+from typing import Any, Callable, Hashable, NamedTuple, Sequence
+
+from sqlalchemy import Select, bindparam, event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class Listing(NamedTuple):
+    """Forma preconstruida de un listado paginado.
+
+    `query` y `filters` usan bindparam() en lugar de valores; `model` es la
+    tabla que se cuenta con `filters`.
+    """
+    key: tuple
+    query: Select
+    model: Any = None
+    filters: tuple = ()
+
+
+class CompileCacheStats:
+    """Aciertos de la caché de compilación de los engines de un rol"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0  # sin clave de caché o con la caché deshabilitada
+
+    def snapshot(self) -> dict:
+        total = self.hits + self.misses + self.uncached
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+class StatementStats:
+    """Contadores acumulados de las sentencias preconstruidas (ver /health/statements)"""
+
+    def __init__(self):
+        self.built = 0   # formas construidas por primera vez
+        self.reused = 0  # ejecuciones que reutilizaron una forma ya construida
+        self.compiled: dict[str, CompileCacheStats] = {}
+
+    def snapshot(self) -> dict:
+        total = self.built + self.reused
+        return {
+            "prepared": {
+                "shapes": len(_prepared),
+                "built": self.built,
+                "reused": self.reused,
+                "hit_rate": round(self.reused / total, 4) if total else None,
+            },
+            "compiled": {role: stats.snapshot() for role, stats in self.compiled.items()},
+        }
+
+
+stats = StatementStats()
+
+# key -> sentencia (o Listing) construida
+_prepared: dict[Hashable, Any] = {}
+
+
+def prepared(key: Hashable, build: Callable[[], Any]) -> Any:
+    """La sentencia de la forma `key`, construida con `build()` solo la primera vez"""
+    statement = _prepared.get(key)
+    if statement is None:
+        statement = _prepared[key] = build()
+        stats.built += 1
+    else:
+        stats.reused += 1
+    return statement
+
+
+def bound_filters(conditions: dict[str, Callable[[Any], Any]], params: dict) -> list:
+    """Filtros de los parámetros presentes en `params`.
+
+    Cada condición recibe un bindparam() con el nombre del parámetro (y su
+    valor, así el filtro también sirve en una consulta que no se reutiliza).
+    """
+    return [conditions[name](bindparam(name, value)) for name, value in params.items()]
+
+
+def listing(
+    key: tuple,
+    query: Callable[[], Select],
+    filters: Callable[[], Sequence] = tuple,
+    model: Any = None,
+) -> Listing:
+    """El Listing de la forma `key`: consulta base `query()` con `filters()`"""
+
+    def build() -> Listing:
+        conditions = tuple(filters())
+        return Listing(key, query().where(*conditions), model, conditions)
+
+    return prepared(key, build)
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """Cuenta los aciertos de la caché de compilación de `engine`"""
+    compiled = stats.compiled.setdefault(role, CompileCacheStats())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context.compiled is None:
+            return  # SQL textual (exec_driver_sql)
+        if context.cache_hit is CACHE_HIT:
+            compiled.hits += 1
+        elif context.cache_hit is CACHE_MISS:
+            compiled.misses += 1
+        else:
+            compiled.uncached += 1
+
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
@@ -0,0 +1,259 @@
+"""Agregados de ventas en memoria para el API de estadísticas.
+
+Se construyen desde el historial con consultas GROUP BY y se actualizan con
+cada factura que crea la API (`record_invoice`), así cada endpoint de
+estadísticas responde en tiempo proporcional al resultado sin recorrer
+InvoiceLine. Como el índice de búsqueda, viven en cada proceso: las ventas
+escritas por fuera de la API (otros workers, SQL, el CLI de datos) se
+reflejan en la reconstrucción periódica (STATS_REBUILD_INTERVAL).
+"""
+import asyncio
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from decimal import Decimal
+from typing import Hashable, Iterable
+
+from sqlalchemy import extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Invoice, InvoiceLine, Track
+
+# InvoiceIds por consulta al buscar las facturas pendientes que ya se leyeron
+_PENDING_BATCH_SIZE = 500
+
+_ZERO = Decimal("0.00")
+_CENT = Decimal("0.01")
+
+# (TrackId, GenreId, UnitPrice, Quantity) de cada línea de una factura
+SaleLine = tuple[int, int | None, Decimal, int]
+
+
+class Ranking:
+    """Total y cantidad por clave, ordenados de mayor a menor total.
+
+    Cada actualización reubica una sola clave con bisect, así `top(k)` es
+    un slice de la lista ya ordenada.
+    """
+
+    def __init__(self):
+        self._totals: dict[int, tuple[Decimal, int]] = {}
+        # (-total, clave): orden descendente por total, ascendente por clave
+        self._order: list[tuple[Decimal, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def load(self, rows: Iterable[tuple[int, Decimal, int]]) -> None:
+        """Carga inicial: ordena una sola vez en lugar de insertar de a una"""
+        self._totals = {key: (total, count) for key, total, count in rows}
+        self._order = sorted((-total, key) for key, (total, _) in self._totals.items())
+
+    def add(self, key: int, amount: Decimal, count: int) -> None:
+        total, current = self._totals.get(key, (_ZERO, 0))
+        if key in self._totals:
+            del self._order[bisect_left(self._order, (-total, key))]
+        total += amount
+        self._totals[key] = (total, current + count)
+        insort(self._order, (-total, key))
+
+    def get(self, key: int) -> tuple[Decimal, int]:
+        return self._totals.get(key, (_ZERO, 0))
+
+    def top(self, limit: int) -> list[tuple[int, Decimal, int]]:
+        """Las `limit` claves de mayor total: (clave, total, cantidad)"""
+        return [(key, *self._totals[key]) for _, key in self._order[:limit]]
+
+
+def _money(rows: Iterable[tuple]) -> Iterable[tuple]:
+    """Filas (clave, monto, cantidad) con el monto redondeado a centavos"""
+    return ((key, Decimal(total).quantize(_CENT), count) for key, total, count in rows)
+
+
+def _accumulate(totals: dict, key: Hashable, amount: Decimal, count: int) -> None:
+    total, current = totals.get(key, (_ZERO, 0))
+    totals[key] = (total + amount, current + count)
+
+
+class SalesRollups:
+    """Ventas acumuladas por track, género, cliente, empleado y mes"""
+
+    def __init__(self):
+        self.ready = False
+        self.tracks = Ranking()      # TrackId -> (ventas, unidades)
+        self.genres = Ranking()      # GenreId -> (ventas, unidades)
+        self.customers = Ranking()   # CustomerId -> (gastado, facturas)
+        self.employees: dict[int | None, tuple[Decimal, int]] = {}  # -> (ventas, facturas)
+        self.months: dict[tuple[int, int], tuple[Decimal, int]] = {}  # (año, mes) -> (ventas, facturas)
+        self._month_keys: list[tuple[int, int]] = []
+
+    def add_invoice(
+        self,
+        customer_id: int,
+        employee_id: int | None,
+        invoice_date: datetime,
+        total: Decimal,
+        lines: Iterable[SaleLine],
+    ) -> None:
+        self.customers.add(customer_id, total, 1)
+        _accumulate(self.employees, employee_id, total, 1)
+        month = (invoice_date.year, invoice_date.month)
+        if month not in self.months:
+            insort(self._month_keys, month)
+        _accumulate(self.months, month, total, 1)
+
+        for track_id, genre_id, unit_price, quantity in lines:
+            amount = unit_price * quantity
+            self.tracks.add(track_id, amount, quantity)
+            if genre_id is not None:
+                self.genres.add(genre_id, amount, quantity)
+
+    def monthly(
+        self,
+        start: tuple[int, int] | None = None,
+        end: tuple[int, int] | None = None,
+    ) -> list[tuple[int, int, Decimal, int]]:
+        """Ventas por mes entre los meses (año, mes) dados, inclusive"""
+        low = bisect_left(self._month_keys, start) if start else 0
+        high = bisect_right(self._month_keys, end) if end else len(self._month_keys)
+        return [(*month, *self.months[month]) for month in self._month_keys[low:high]]
+
+
+rollups = SalesRollups()
+
+_build_lock = asyncio.Lock()
+# Facturas registradas mientras se construyen los agregados: (InvoiceId, datos)
+_pending: list[tuple[int, tuple]] | None = None
+
+
+def record_invoice(
+    invoice_id: int,
+    customer_id: int,
+    employee_id: int | None,
+    invoice_date: datetime,
+    total: Decimal,
+    lines: Iterable[SaleLine],
+) -> None:
+    """Suma una factura recién guardada a los agregados.
+
+    Todo endpoint que cree facturas debe llamarla después del commit.
+    """
+    invoice = (customer_id, employee_id, invoice_date, total, list(lines))
+    if _pending is not None:
+        _pending.append((invoice_id, invoice))
+    elif rollups.ready:
+        rollups.add_invoice(*invoice)
+
+
+async def _build(session: AsyncSession) -> None:
+    global rollups, _pending
+    _pending = []
+    try:
+        # Todo se agrega hasta este id; las facturas posteriores llegan por
+        # record_invoice mientras dura la construcción
+        last_id = (await session.execute(select(func.max(Invoice.InvoiceId)))).scalar() or 0
+        built = SalesRollups()
+
+        amount = func.sum(InvoiceLine.UnitPrice * InvoiceLine.Quantity)
+        units = func.sum(InvoiceLine.Quantity)
+        lines_filter = InvoiceLine.InvoiceId <= last_id
+        invoices_filter = Invoice.InvoiceId <= last_id
+
+        result = await session.execute(
+            select(InvoiceLine.TrackId, amount, units)
+            .where(lines_filter)
+            .group_by(InvoiceLine.TrackId)
+        )
+        built.tracks.load(_money(result))
+
+        result = await session.execute(
+            select(Track.GenreId, amount, units)
+            .select_from(InvoiceLine)
+            .join(Track, Track.TrackId == InvoiceLine.TrackId)
+            .where(lines_filter, Track.GenreId.is_not(None))
+            .group_by(Track.GenreId)
+        )
+        built.genres.load(_money(result))
+
+        result = await session.execute(
+            select(Invoice.CustomerId, func.sum(Invoice.Total), func.count())
+            .where(invoices_filter)
+            .group_by(Invoice.CustomerId)
+        )
+        built.customers.load(_money(result))
+
+        result = await session.execute(
+            select(Invoice.EmployeeId, func.sum(Invoice.Total), func.count())
+            .where(invoices_filter)
+            .group_by(Invoice.EmployeeId)
+        )
+        built.employees = {employee_id: (total, count) for employee_id, total, count in _money(result)}
+
+        year = extract("year", Invoice.InvoiceDate)
+        month = extract("month", Invoice.InvoiceDate)
+        result = await session.execute(
+            select(year, month, func.sum(Invoice.Total), func.count())
+            .where(invoices_filter)
+            .group_by(year, month)
+        )
+        built.months = {
+            (int(y), int(m)): (Decimal(total).quantize(_CENT), count)
+            for y, m, total, count in result
+        }
+        built._month_keys = sorted(built.months)
+
+        # Las facturas registradas mientras tanto se suman si las consultas de
+        # arriba no las vieron. Se pregunta en la misma sesión (mismo snapshot
+        # en una transacción REPEATABLE READ), no contra `last_id`: una factura
+        # con un id menor puede confirmarse después de leerlo
+        replayed = 0
+        while replayed < len(_pending):
+            batch = _pending[replayed:]
+            replayed = len(_pending)
+            seen = await _aggregated(session, [invoice_id for invoice_id, _ in batch], last_id)
+            for invoice_id, invoice in batch:
+                if invoice_id not in seen:
+                    built.add_invoice(*invoice)
+        built.ready = True
+        rollups = built
+    finally:
+        _pending = None
+
+
+async def _aggregated(session: AsyncSession, invoice_ids: list[int], last_id: int) -> set[int]:
+    """Cuáles de `invoice_ids` entraron en los agregados"""
+    seen = set()
+    for start in range(0, len(invoice_ids), _PENDING_BATCH_SIZE):
+        result = await session.execute(
+            select(Invoice.InvoiceId).where(
+                Invoice.InvoiceId.in_(invoice_ids[start:start + _PENDING_BATCH_SIZE]),
+                Invoice.InvoiceId <= last_id,
+            )
+        )
+        seen.update(result.scalars())
+    return seen
+
+
+async def build_rollups(session_factory: async_sessionmaker) -> None:
+    """(Re)construye los agregados desde el historial de ventas"""
+    async with _build_lock:
+        async with session_factory() as session:
+            await _build(session)
+
+
+async def run_rebuilds(session_factory: async_sessionmaker, interval: float) -> None:
+    """Reconstruye los agregados cada `interval` segundos (tarea de fondo)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await build_rollups(session_factory)
+        except Exception as e:
+            print(f"⚠️ No se pudieron reconstruir las estadísticas: {e}")
+
+
+async def ensure_ready(db: AsyncSession) -> SalesRollups:
+    """Agregados listos para consultar; los construye si todavía no existen"""
+    if not rollups.ready:
+        async with _build_lock:
+            if not rollups.ready:
+                await _build(db)
+    return rollups
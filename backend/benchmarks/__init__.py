@@ -0,0 +1 @@
+"""Benchmarks de carga de la API (ver benchmarks/run.py)"""
@@ -143,4 +143,71 @@ async def test_pagination(async_client):
     track_ids_page2 = {track["TrackId"] for track in data2["tracks"]}
     
     assert len(track_ids_page1.intersection(track_ids_page2)) == 0
-    print(f"\n✓ Paginación funciona: {len(track_ids_page1)} tracks en página 1")
\ No newline at end of file
+    print(f"\n✓ Paginación funciona: {len(track_ids_page1)} tracks en página 1")
+
+@pytest.mark.asyncio
+async def test_cursor_pagination(async_client):
+    """Test que la paginación por cursor continúe donde termina la página anterior"""
+    response1 = await async_client.get("/api/v1/tracks/?page=1&page_size=5")
+    data1 = response1.json()
+    assert data1["next_cursor"] is not None
+    
+    response2 = await async_client.get(f"/api/v1/tracks/?page_size=5&cursor={data1['next_cursor']}")
+    data2 = response2.json()
+    offset_page2 = (await async_client.get("/api/v1/tracks/?page=2&page_size=5")).json()
+    
+    assert [t["TrackId"] for t in data2["tracks"]] == [t["TrackId"] for t in offset_page2["tracks"]]
+    print(f"\n✓ Cursor continúa en: '{data2['tracks'][0]['Name']}'")
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(async_client):
+    """Test que un cursor inválido sea rechazado"""
+    response = await async_client.get("/api/v1/tracks/?cursor=no-es-un-cursor")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_without_total(async_client):
+    """Test que include_total=false omita el conteo"""
+    response = await async_client.get("/api/v1/tracks/?page_size=5&include_total=false")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] is None
+    assert len(data["tracks"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_tracks_batch(async_client):
+    """Test búsqueda de tracks por lote: orden pedido e IDs inexistentes"""
+    response = await async_client.get("/api/v1/tracks/batch?ids=3,1,999999,3")
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert [t["TrackId"] for t in data["tracks"]] == [3, 1]
+    assert data["missing"] == [999999]
+    assert data["tracks"][0]["artist_name"] is not None
+
+
+@pytest.mark.asyncio
+async def test_track_recommendations(async_client):
+    """Test recomendaciones por co-compra: orden descendente y sin ETag del catálogo"""
+    response = await async_client.get("/api/v1/tracks/1/recommendations?limit=5")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    data = response.json()
+    
+    assert data["TrackId"] == 1
+    assert len(data["recommendations"]) <= 5
+    co_purchases = [t["co_purchases"] for t in data["recommendations"]]
+    assert co_purchases == sorted(co_purchases, reverse=True)
+    
+    response = await async_client.get("/api/v1/tracks/999999/recommendations")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_albums_batch_invalid_ids(async_client):
+    """Test que una lista de IDs inválida sea rechazada"""
+    response = await async_client.get("/api/v1/albums/batch?ids=1,dos")
+    assert response.status_code == 400
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import cache
+from app.cache import TTLCache
+from app.database import Base
+
+
+def test_lru_eviction():
+    """Verifica que se descarte la entrada menos usada al superar el tamaño"""
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+    
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiration():
+    """Verifica que las entradas vencidas cuenten como fallo"""
+    cache = TTLCache("test", maxsize=10, ttl=-1)
+    cache.set(1, "a")
+    
+    assert cache.get(1) is None
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_loads_only_missing():
+    """Verifica que la lectura múltiple solo cargue las claves faltantes"""
+    cache = TTLCache("test", maxsize=10, ttl=60)
+    cache.set(1, "a")
+    requested = []
+    
+    async def loader(keys):
+        requested.extend(keys)
+        return {key: str(key) for key in keys if key != 3}
+    
+    values = await cache.get_many([1, 2, 3], loader)
+    
+    assert sorted(requested) == [2, 3]
+    assert values == {1: "a", 2: "2"}
+
+
+@pytest.mark.asyncio
+async def test_catalog_version_follows_database(tmp_path, monkeypatch):
+    """Verifica que la versión salga de la base y cambie con cualquier escritura del catálogo"""
+    monkeypatch.setattr(cache, "_catalog_version", None)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    session_factory = async_sessionmaker(engine)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await cache.refresh_catalog_version(session_factory)
+        first = cache.catalog_etag()
+        assert first is not None
+        cache.genres.set("all", ["cached"])
+        
+        # Escritura por SQL directo, como la haría otro proceso
+        async with engine.begin() as conn:
+            await conn.execute(text('INSERT INTO "Genre" ("Name") VALUES (\'Rock\')'))
+        await cache.refresh_catalog_version(session_factory)
+        
+        assert cache.catalog_etag() != first
+        assert cache.genres.get("all") is None
+    finally:
+        await engine.dispose()
@@ -0,0 +1,51 @@
+from collections import defaultdict
+from decimal import Decimal
+from app.database import Base
+from benchmarks.datagen import COLUMNS, Generator, table_batches
+
+
+def _generate(**kwargs) -> dict[str, list[dict]]:
+    rows = defaultdict(list)
+    for table, batch in table_batches(Generator(**kwargs), chunk_size=500):
+        rows[table].extend(dict(zip(COLUMNS[table], row)) for row in batch)
+    return rows
+
+
+def test_columns_match_models():
+    """Verifica que las columnas generadas existan en los models"""
+    for table, columns in COLUMNS.items():
+        assert set(columns) <= set(Base.metadata.tables[table].columns.keys()), table
+
+
+def test_generated_data_keeps_referential_integrity():
+    """Verifica claves foráneas, totales de facturas y líneas sin tracks repetidos"""
+    rows = _generate(scale=2, invoice_lines=3000, seed=7)
+    ids = {table: {row[columns[0]] for row in rows[table]} for table, columns in COLUMNS.items()}
+
+    assert len(rows["InvoiceLine"]) == 3000
+    assert {row["ArtistId"] for row in rows["Album"]} <= ids["Artist"]
+    assert {row["AlbumId"] for row in rows["Track"]} <= ids["Album"]
+    assert {row["GenreId"] for row in rows["Track"]} <= ids["Genre"]
+    assert {row["SupportRepId"] for row in rows["Customer"]} <= ids["Employee"]
+    assert {row["CustomerId"] for row in rows["Invoice"]} <= ids["Customer"]
+    assert {row["EmployeeId"] for row in rows["Invoice"]} - {None} <= ids["Employee"]
+    assert {row["TrackId"] for row in rows["InvoiceLine"]} <= ids["Track"]
+    assert {row["TrackId"] for row in rows["PlaylistTrack"]} <= ids["Track"]
+
+    prices = {row["TrackId"]: row["UnitPrice"] for row in rows["Track"]}
+    totals = defaultdict(Decimal)
+    tracks_by_invoice = defaultdict(list)
+    for line in rows["InvoiceLine"]:
+        assert line["UnitPrice"] == prices[line["TrackId"]]
+        totals[line["InvoiceId"]] += line["UnitPrice"] * line["Quantity"]
+        tracks_by_invoice[line["InvoiceId"]].append(line["TrackId"])
+
+    assert all(invoice["Total"] == totals[invoice["InvoiceId"]] for invoice in rows["Invoice"])
+    assert all(len(tracks) == len(set(tracks)) for tracks in tracks_by_invoice.values())
+    dates = [invoice["InvoiceDate"] for invoice in rows["Invoice"]]
+    assert dates == sorted(dates)
+
+
+def test_generator_is_deterministic():
+    """Verifica que la misma semilla genere los mismos datos"""
+    assert _generate(scale=1, seed=3) == _generate(scale=1, seed=3)
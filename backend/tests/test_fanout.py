@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.crud import fanout
+from app.pool import InstrumentedPool
+
+
+@pytest.mark.asyncio
+async def test_gather_without_spare_connections_runs_inline():
+    """Verifica que sin conexiones libres todo corra en la sesión del request, en orden"""
+    db = SimpleNamespace(info={}, bind=SimpleNamespace(pool=None))
+    seen = []
+    
+    async def call(session, value):
+        seen.append(session)
+        return value
+    
+    results = await fanout.gather(
+        db,
+        lambda session: call(session, 1),
+        None,
+        lambda session: call(session, 3),
+    )
+    assert results == [1, None, 3]
+    assert seen == [db, db]
+    assert db.info["fanout_slots"]["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_gather_runs_apart_up_to_the_cap(tmp_path, monkeypatch):
+    """Verifica que las llamadas extra usen sesiones hermanas hasta el límite por request"""
+    monkeypatch.setattr(fanout.settings, "DB_FANOUT_MAX_CONNECTIONS", 1)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'fanout.db'}",
+        poolclass=InstrumentedPool, pool_size=5, max_overflow=0,
+    )
+    sessions = []
+    
+    async def call(session, value):
+        sessions.append(session)
+        await asyncio.sleep(0.01)
+        return (await session.execute(text(f"SELECT {value}"))).scalar()
+    
+    try:
+        async with AsyncSession(engine) as db:
+            results = await fanout.gather(
+                db,
+                lambda session: call(session, 1),
+                lambda session: call(session, 2),
+                lambda session: call(session, 3),
+            )
+            assert results == [1, 2, 3]
+            assert sessions.count(db) == 2
+            assert len(set(map(id, sessions))) == 2
+            assert db.info["fanout_slots"]["in_use"] == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,68 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from app import cache, search
+from app.api.http_cache import _etag_matches, representation_etag
+from app.cache import catalog_etag
+from app.main import app
+from app.serialization import response_format
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """Fixture para crear un cliente HTTP async"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def test_etag_matches():
+    """Verifica la comparación débil de If-None-Match"""
+    assert _etag_matches('W/"a-1"', 'W/"a-1"')
+    assert _etag_matches('"x", "a-1"', 'W/"a-1"')
+    assert _etag_matches("*", 'W/"a-1"')
+    assert not _etag_matches('W/"a-0"', 'W/"a-1"')
+
+
+def test_representation_etag(monkeypatch):
+    """Verifica que MessagePack tenga un ETag distinto al de JSON"""
+    monkeypatch.setattr(search.tracks, "ready", True)
+    assert representation_etag('W/"a-1"') == 'W/"a-1"'
+    token = response_format.set("msgpack")
+    try:
+        assert representation_etag('W/"a-1"') == 'W/"a-1-msgpack"'
+    finally:
+        response_format.reset(token)
+
+
+@pytest.mark.asyncio
+async def test_not_modified_without_database(async_client, monkeypatch):
+    """Verifica que un ETag vigente responda 304 sin ejecutar el endpoint"""
+    monkeypatch.setattr(cache, "_catalog_version", (7, 1700000000))
+    etag = representation_etag(catalog_etag())
+    response = await async_client.get(
+        "/api/v1/genres/", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["last-modified"] == "Tue, 14 Nov 2023 22:13:20 GMT"
+    assert response.headers["cache-control"].startswith("public")
+
+
+@pytest.mark.asyncio
+async def test_invalid_request_is_not_answered_with_304(async_client, monkeypatch):
+    """Verifica que un ETag vigente no tape la validación de los parámetros"""
+    monkeypatch.setattr(cache, "_catalog_version", (7, 1700000000))
+    etag = representation_etag(catalog_etag())
+    for url in ("/api/v1/tracks/?page_size=0", "/api/v1/genres/abc"):
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 422
+
+
+def test_representation_etag_before_search_index(monkeypatch):
+    """Verifica que las búsquedas con ILIKE no compartan ETag con las del índice"""
+    monkeypatch.setattr(search.tracks, "ready", True)
+    assert representation_etag('W/"a-1"') == 'W/"a-1"'
+    monkeypatch.setattr(search.tracks, "ready", False)
+    assert representation_etag('W/"a-1"') == 'W/"a-1-ilike"'
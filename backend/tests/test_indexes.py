@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import indexes
+from app.database import Base
+
+
+def test_migrations_cover_declared_indexes():
+    """Verifica que cada índice de los models esté en exactamente una migración"""
+    names = [name for migration in indexes.MIGRATIONS for name in migration.indexes]
+    assert len(names) == len(set(names))
+    assert set(names) == set(indexes.declared_indexes())
+
+
+@pytest.mark.asyncio
+async def test_migrate_creates_only_missing_indexes(tmp_path):
+    """Verifica que se creen los índices faltantes y se respeten los equivalentes"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'indexes.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text('DROP INDEX "IX_TrackName"'))
+        await conn.execute(text('DROP INDEX "IX_InvoiceDate"'))
+        # Uno previo con más columnas sirve igual a las consultas por fecha
+        await conn.execute(text('CREATE INDEX "IX_Legacy" ON "Invoice" ("InvoiceDate", "InvoiceId", "Total")'))
+
+    try:
+        first = {name: status for _, name, status in await indexes.migrate(engine)}
+        assert first["IX_TrackName"] == "created"
+        assert first["IX_InvoiceDate"] == "exists"
+        assert first["IX_AlbumTitle"] == "exists"
+
+        again = await indexes.migrate(engine, dry_run=True)
+        assert {status for _, _, status in again} == {"exists"}
+    finally:
+        await engine.dispose()
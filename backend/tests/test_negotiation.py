@@ -0,0 +1,76 @@
+import gzip
+import pytest
+from app import negotiation
+from app.negotiation import _NegotiatedSend, negotiate_encoding, negotiate_format
+
+
+def test_negotiate_encoding():
+    """Verifica la elección por calidad y, en empate, por preferencia del servidor"""
+    available = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, deflate, br", available) == "br"
+    assert negotiate_encoding("gzip;q=1, br;q=0.5", available) == "gzip"
+    assert negotiate_encoding("*", available) == "zstd"
+    assert negotiate_encoding("br;q=0, *;q=0.1", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("identity", available) is None
+    assert negotiate_encoding(None, available) is None
+
+
+def test_negotiate_format(monkeypatch):
+    """Verifica que MessagePack se elija solo si el cliente lo prefiere"""
+    monkeypatch.setattr(negotiation, "msgpack", object())
+    assert negotiate_format("application/msgpack") == "msgpack"
+    assert negotiate_format("application/x-msgpack, */*") == "msgpack"
+    assert negotiate_format("application/msgpack, application/json") == "json"
+    assert negotiate_format("application/json;q=0.5, application/msgpack") == "msgpack"
+    assert negotiate_format("*/*") == "json"
+    assert negotiate_format(None) == "json"
+    
+    monkeypatch.setattr(negotiation, "msgpack", None)
+    assert negotiate_format("application/msgpack") == "json"
+
+
+@pytest.mark.asyncio
+async def test_streaming_body_is_compressed_per_chunk():
+    """Verifica que un streaming se comprima bloque a bloque sin Content-Length"""
+    sent = []
+    
+    async def send(message):
+        sent.append(message)
+    
+    negotiated_send = _NegotiatedSend(send, "gzip", 6, 1024, "Accept-Encoding")
+    await negotiated_send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/x-ndjson"), (b"content-length", b"99")],
+    })
+    await negotiated_send({"type": "http.response.body", "body": b'{"a":1}\n', "more_body": True})
+    await negotiated_send({"type": "http.response.body", "body": b'{"a":2}\n', "more_body": False})
+    
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert b"content-length" not in headers
+    # Cada bloque se puede decodificar apenas llega
+    first = negotiation.zlib.decompressobj(31).decompress(sent[1]["body"])
+    assert first == b'{"a":1}\n'
+    assert gzip.decompress(sent[1]["body"] + sent[2]["body"]) == b'{"a":1}\n{"a":2}\n'
+
+
+@pytest.mark.asyncio
+async def test_small_body_is_not_compressed():
+    """Verifica que las respuestas chicas salgan sin comprimir"""
+    sent = []
+    
+    async def send(message):
+        sent.append(message)
+    
+    negotiated_send = _NegotiatedSend(send, "gzip", 6, 1024, "Accept-Encoding")
+    await negotiated_send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", b"2")],
+    })
+    await negotiated_send({"type": "http.response.body", "body": b"{}"})
+    
+    assert b"content-encoding" not in dict(sent[0]["headers"])
+    assert sent[1]["body"] == b"{}"
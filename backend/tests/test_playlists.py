@@ -0,0 +1,59 @@
+import pytest
+from app import playlists
+from app.playlists import PlaylistTotals
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _Session:
+    """Sesión falsa que responde siempre la misma fila"""
+
+    def __init__(self, row):
+        self.row = row
+
+    async def execute(self, statement):
+        return _Result(self.row)
+
+
+def test_totals_default_to_empty():
+    """Verifica que una playlist sin tracks tenga totales en cero"""
+    totals = PlaylistTotals()
+    totals.set(1, 3, 600000)
+    
+    assert totals.get(1) == (3, 600000)
+    assert totals.get(2) == (0, 0)
+    assert len(totals) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_during_build_is_kept(monkeypatch):
+    """Verifica que un refresh hecho durante la construcción no se pierda"""
+    monkeypatch.setattr(playlists, "totals", PlaylistTotals())
+    monkeypatch.setattr(playlists, "_pending", {})
+    
+    assert await playlists.refresh(_Session((5, 2, 480000)), 5) == (2, 480000)
+    assert playlists._pending == {5: (2, 480000)}
+    # Todavía no está listo: el valor se aplica al terminar la construcción
+    assert playlists.totals.get(5) == (0, 0)
+    
+    monkeypatch.setattr(playlists, "_pending", None)
+    playlists.totals.ready = True
+    assert await playlists.refresh(_Session(None), 5) == (0, 0)
+    assert playlists.totals.get(5) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_current_reads_without_touching_totals(monkeypatch):
+    """Verifica que el detalle lea sus totales sin pisar los del listado"""
+    monkeypatch.setattr(playlists, "totals", PlaylistTotals())
+    playlists.totals.ready = True
+    
+    assert await playlists.current(_Session((5, 2, 480000)), 5) == (2, 480000)
+    assert await playlists.current(_Session(None), 6) == (0, 0)
+    assert playlists.totals.get(5) == (0, 0)
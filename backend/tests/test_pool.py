@@ -0,0 +1,21 @@
+from app.pool import Histogram
+
+
+def test_histogram_cumulative_buckets():
+    """Verifica que los buckets acumulen los conteos hasta cada límite"""
+    histogram = Histogram((1, 10, 100))
+    for value in (0.5, 1, 5, 50, 500):
+        histogram.observe(value)
+    
+    snapshot = histogram.snapshot()
+    assert [bucket["count"] for bucket in snapshot["buckets"]] == [2, 3, 4, 5]
+    assert snapshot["buckets"][-1]["le"] == "+Inf"
+    assert snapshot["count"] == 5
+    assert snapshot["max"] == 500
+
+
+def test_histogram_empty():
+    """Verifica un histograma sin observaciones"""
+    snapshot = Histogram((1, 2)).snapshot()
+    assert snapshot["count"] == 0
+    assert snapshot["avg"] is None
@@ -0,0 +1,23 @@
+from app.profiling import RequestProfile, fingerprint
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    """Verifica que sentencias con distintos valores tengan la misma forma"""
+    first = fingerprint("SELECT * FROM Track WHERE AlbumId IN (%s, %s) AND Name = 'a'")
+    second = fingerprint("SELECT * FROM Track WHERE AlbumId IN (%s, %s, %s) AND Name = 'b'")
+    assert first == second
+
+
+def test_repeated_statements_are_reported():
+    """Verifica que se marquen como N+1 las sentencias repetidas"""
+    profile = RequestProfile("GET", "/api/v1/invoices/1")
+    for _ in range(5):
+        profile.record_statement("SELECT * FROM Track WHERE TrackId = %s", 1.0)
+    profile.record_statement("SELECT * FROM Invoice WHERE InvoiceId = %s", 3.0)
+    
+    repeated = profile.repeated()
+    assert len(repeated) == 1
+    assert repeated[0]["count"] == 5
+    assert profile.statements == 6
+    assert profile.slowest[0] == 3.0
+    assert 'desc="6 queries"' in profile.server_timing(10.0)
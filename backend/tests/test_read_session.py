@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.database import Base, _create_engine, _read_sessionmaker
+from app.models import Album, Artist
+
+
+@pytest.mark.asyncio
+async def test_read_session_keeps_objects_until_closed(tmp_path):
+    """Verifica que los objetos sigan ligados a la sesión (carga diferida, varias
+    consultas) y que la conexión vuelva al pool al cerrarla"""
+    engine = _create_engine(f"sqlite+aiosqlite:///{tmp_path / 'read.db'}", 1, 0, read_only=True)
+    try:
+        async with engine.connect() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Artist), [{"ArtistId": 1, "Name": "Queen"}])
+            await conn.execute(insert(Album), [
+                {"AlbumId": album_id, "Title": f"Album {album_id}", "ArtistId": 1} for album_id in (1, 2)
+            ])
+        
+        async with _read_sessionmaker(engine)() as session:
+            artist = (await session.execute(select(Artist))).scalar_one()
+            assert await session.run_sync(lambda _: len(artist.albums)) == 2
+            assert await session.scalar(select(func.count()).select_from(Album)) == 2
+            assert engine.pool.checkedout() == 1
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import recommendations
+from app.database import Base
+from app.models import InvoiceLine
+from app.recommendations import CoPurchases
+
+
+def test_recommend_orders_by_co_purchases():
+    """Verifica el orden por co-compras, con el TrackId menor en los empates"""
+    matrix = CoPurchases(k=2)
+    matrix.load([[1, 2, 3], [1, 3], [1, 4], [2, 3]])
+    
+    assert matrix.recommend(1, 5) == [(3, 2), (2, 1)]
+    assert matrix.recommend(3, 1) == [(1, 2)]
+    assert matrix.recommend(99, 5) == []
+
+
+def test_incremental_updates_match_full_rebuild():
+    """Verifica que sumar facturas de a una dé las mismas listas que reconstruir"""
+    rng = random.Random(7)
+    baskets = [sorted(set(rng.choices(range(1, 30), k=rng.randint(1, 6)))) for _ in range(300)]
+    
+    incremental = CoPurchases(k=5)
+    incremental.load(baskets[:100])
+    for basket in baskets[100:]:
+        incremental.add_invoice(basket)
+    rebuilt = CoPurchases(k=5)
+    rebuilt.load(baskets)
+    
+    for track_id in range(1, 30):
+        assert incremental.recommend(track_id, 5) == rebuilt.recommend(track_id, 5)
+
+
+@pytest.mark.asyncio
+async def test_queued_invoices_not_read_by_the_build_are_added(tmp_path, monkeypatch):
+    """Verifica que la cola sume solo las facturas que la reconstrucción no leyó,
+    sin importar su InvoiceId"""
+    monkeypatch.setattr(recommendations, "recommendations", CoPurchases(k=5))
+    monkeypatch.setattr(recommendations, "_queued", [])
+    monkeypatch.setattr(recommendations, "_scanned", set())
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'recommendations.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(InvoiceLine), [
+                {"InvoiceId": 10, "TrackId": track_id, "UnitPrice": 1, "Quantity": 1}
+                for track_id in (1, 2)
+            ])
+        # La 10 ya está en la base; la 5 se confirmó después de la lectura
+        recommendations.record_invoice(10, [1, 2])
+        recommendations.record_invoice(5, [2, 1, 3])
+        await recommendations.build_recommendations(async_sessionmaker(engine))
+        assert recommendations.recommendations.recommend(1, 5) == [(2, 1)]
+        
+        await recommendations.apply_queued()
+        
+        assert recommendations.recommendations.recommend(1, 5) == [(2, 2), (3, 1)]
+        assert recommendations._queued == []
+    finally:
+        await engine.dispose()
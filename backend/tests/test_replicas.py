@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.replicas import Replica, ReplicaSet
+
+
+def _replica(host: str) -> Replica:
+    # El engine no se conecta hasta usarlo
+    return Replica(create_async_engine(f"mysql+aiomysql://user:secret@{host}:3306/chinook"))
+
+
+def test_round_robin_skips_unhealthy_replicas():
+    """Verifica el reparto en ronda entre las réplicas sanas"""
+    a, b, c = _replica("a"), _replica("b"), _replica("c")
+    replicas = ReplicaSet([a, b, c])
+    b.mark_failed("caída")
+    
+    assert [replicas.choose() for _ in range(4)] == [a, c, a, c]
+    assert "secret" not in a.name
+
+
+def test_least_connections_and_fallback_to_primary():
+    """Verifica que se elija la réplica con menos sesiones y que sin réplicas sanas se use el primario"""
+    a, b = _replica("a"), _replica("b")
+    replicas = ReplicaSet([a, b], balancing="least_connections")
+    a.active = 3
+    
+    assert replicas.choose() is b
+    
+    a.mark_failed("caída")
+    b.mark_failed("caída")
+    assert replicas.choose() is None
+    assert replicas.stats()["fallbacks_to_primary"] == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_error_takes_replica_out_of_rotation():
+    """Verifica que un error de conexión durante un request marque la réplica como caída"""
+    replica = _replica("a")
+    
+    with pytest.raises(exc.OperationalError):
+        async with replica.session():
+            assert replica.active == 1
+            raise exc.OperationalError("SELECT 1", {}, Exception("Lost connection"))
+    
+    assert not replica.healthy
+    assert replica.active == 0
+    assert "Lost connection" in replica.last_error
@@ -0,0 +1,57 @@
+from app.search import SearchIndex
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex("test")
+    index.add(1, "Love Me Do")
+    index.add(2, "Lovely Day")
+    index.add(3, "Glove Box")
+    index.add(4, "Canción de Amor")
+    index.finish_build()
+    return index
+
+
+def test_prefix_match_and_ranking():
+    """Verifica que coincida por prefijo y que el match exacto quede primero"""
+    ids, total = _index().search("love")
+    assert ids == [1, 2]
+    assert total == 2
+
+
+def test_all_tokens_required_and_accents():
+    """Verifica que se exijan todos los tokens y se ignoren los acentos"""
+    index = _index()
+    assert index.search("love day")[0] == [2]
+    assert index.search("cancion")[0] == [4]
+
+
+def test_fuzzy_match():
+    """Verifica la tolerancia a errores de tipeo"""
+    index = _index()
+    assert index.search("lvoe")[1] == 0
+    assert 1 in index.search("lvoe", fuzzy=True)[0]
+
+
+def test_remove_and_update():
+    """Verifica que el índice se mantenga al día con las escrituras"""
+    index = _index()
+    index.remove(1)
+    index.add(2, "Sunny Day")
+    assert index.search("love")[1] == 0
+    assert index.search("sunny")[0] == [2]
+
+
+def test_limit_keeps_ranking_order():
+    """Verifica que con límite salgan los mismos primeros que sin él"""
+    index = SearchIndex("test")
+    for doc_id in range(1, 301):
+        index.add(doc_id, f"Track {doc_id % 7} Lo{'ve' if doc_id % 3 else 'ud'} {doc_id}", f"{doc_id % 11:02}")
+    index.finish_build()
+    index.add(301, "Love Song")
+    index.remove(10)
+
+    ranked, total = index.search("lo")
+    assert total == 300
+    for limit in (1, 5, 50, 299):
+        assert index.search("lo", limit=limit) == (ranked[:limit], total)
+    assert ranked[0] == 301
@@ -0,0 +1,43 @@
+import json
+from decimal import Decimal
+from app.models import Track
+from app.schemas.album import Album
+from app.schemas.track import TrackDetail
+from app.serialization import batch_response, dumps, row_to_dict
+
+
+def test_row_to_dict_matches_response_model():
+    """Verifica que el JSON sea idéntico al que genera FastAPI con el schema"""
+    track = Track(
+        TrackId=1, Name="Ñandú “love”", Composer=None, Milliseconds=1000,
+        UnitPrice=Decimal("0.99"), AlbumId=2, GenreId=3, MediaTypeId=1,
+    )
+    album = Album(Title="Álbum", ArtistId=4, AlbumId=2)
+    
+    fast = dumps(row_to_dict(
+        track, TrackDetail, album=row_to_dict(album, Album), artist_name="A", genre_name=None
+    ))
+    
+    model = TrackDetail(
+        **TrackDetail.model_validate(track).model_dump(exclude={"album", "artist_name"}),
+        album=album, artist_name="A",
+    )
+    expected = json.dumps(
+        model.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    assert fast == expected
+
+
+def test_row_to_dict_from_mapping():
+    """Verifica que se puedan usar filas como mappings"""
+    row = {"Title": "X", "ArtistId": 1, "AlbumId": 2, "extra": True}
+    assert row_to_dict(row, Album) == {"Title": "X", "ArtistId": 1, "AlbumId": 2}
+
+
+def test_batch_response_keeps_input_order():
+    """Verifica el orden pedido y los IDs faltantes de las búsquedas por lote"""
+    response = batch_response("artists", [3, 9, 1], {1: {"ArtistId": 1}, 3: {"ArtistId": 3}})
+    assert json.loads(response.body) == {
+        "artists": [{"ArtistId": 3}, {"ArtistId": 1}],
+        "missing": [9],
+    }
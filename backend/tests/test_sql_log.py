@@ -0,0 +1,39 @@
+import json
+import logging
+import queue
+
+from app import sql_log
+
+
+def _record(statement: str) -> logging.LogRecord:
+    record = logging.LogRecord("app.sql", logging.INFO, __file__, 0, "sql", None, None)
+    record.__dict__.update(
+        db="localhost/Chinook", role="read", elapsed_ms=250.12345, slow=True,
+        rows=1, executemany=False, statement=statement,
+    )
+    return record
+
+
+def test_json_formatter_strips_literals():
+    """Verifica la línea JSON: huella sin literales ni listas IN expandidas"""
+    line = sql_log.JSONFormatter().format(
+        _record("SELECT * FROM Customer WHERE Email = 'ana@x.com' AND CustomerId IN (%s, %s, %s)")
+    )
+    entry = json.loads(line)
+    
+    assert entry["fingerprint"] == "SELECT * FROM Customer WHERE Email = ? AND CustomerId IN (?+)"
+    assert entry["ms"] == 250.123
+    assert entry["role"] == "read"
+    assert "ana@x.com" not in line
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Verifica que con la cola llena los registros se descarten y se cuenten"""
+    handler = sql_log._DroppingQueueHandler(queue.Queue(1))
+    dropped = sql_log.stats.dropped
+    
+    handler.emit(_record("SELECT 1"))
+    handler.emit(_record("SELECT 2"))
+    
+    assert handler.queue.qsize() == 1
+    assert sql_log.stats.dropped == dropped + 1
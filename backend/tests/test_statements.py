@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import Integer, bindparam, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import statements
+
+
+@pytest.fixture
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(statements, "stats", statements.StatementStats())
+    monkeypatch.setattr(statements, "_prepared", {})
+    return statements.stats
+
+
+def test_prepared_builds_each_shape_once(fresh_stats):
+    """Verifica que cada forma se construya una vez y después se reutilice"""
+    builds = []
+
+    def build():
+        builds.append(1)
+        return select(func.abs(bindparam("value", type_=Integer)))
+
+    first = statements.prepared(("abs",), build)
+    assert statements.prepared(("abs",), build) is first
+    statements.prepared(("abs", "other"), build)
+
+    assert len(builds) == 2
+    snapshot = fresh_stats.snapshot()["prepared"]
+    assert snapshot == {"shapes": 2, "built": 2, "reused": 1, "hit_rate": 0.3333}
+
+
+@pytest.mark.asyncio
+async def test_instrument_engine_counts_compile_cache_hits(fresh_stats, tmp_path):
+    """Verifica que la misma sentencia con otros valores acierte en la caché de compilación"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'statements.db'}")
+    statements.instrument_engine(engine, "primary")
+    query = select(func.abs(bindparam("value", type_=Integer)))
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(query, {"value": -1})).scalar() == 1
+            assert (await conn.execute(query, {"value": -2})).scalar() == 2
+            await conn.exec_driver_sql("SELECT 1")
+    finally:
+        await engine.dispose()
+
+    assert fresh_stats.snapshot()["compiled"]["primary"] == {
+        "hits": 1,
+        "misses": 1,
+        "uncached": 0,
+        "hit_rate": 0.5,
+    }
@@ -0,0 +1,71 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import stats
+from app.database import Base
+from app.models import Invoice
+from app.stats import Ranking, SalesRollups
+
+
+def test_ranking_keeps_order_on_updates():
+    """Verifica que el top se mantenga ordenado al sumar ventas"""
+    ranking = Ranking()
+    ranking.load([(1, Decimal("5.00"), 5), (2, Decimal("3.00"), 3), (3, Decimal("1.00"), 1)])
+    ranking.add(3, Decimal("10.00"), 2)
+    ranking.add(4, Decimal("3.00"), 1)
+    
+    assert ranking.top(2) == [(3, Decimal("11.00"), 3), (1, Decimal("5.00"), 5)]
+    # Empate de total: gana la clave menor
+    assert [key for key, _, _ in ranking.top(4)] == [3, 1, 2, 4]
+
+
+def test_rollups_add_invoice():
+    """Verifica los agregados por cliente, empleado, mes y género"""
+    rollups = SalesRollups()
+    rollups.add_invoice(1, None, datetime(2024, 3, 5), Decimal("2.97"), [
+        (10, 1, Decimal("0.99"), 1),
+        (11, None, Decimal("0.99"), 2),
+    ])
+    rollups.add_invoice(2, 7, datetime(2024, 1, 9), Decimal("0.99"), [(10, 1, Decimal("0.99"), 1)])
+    
+    assert rollups.tracks.get(10) == (Decimal("1.98"), 2)
+    assert rollups.genres.top(5) == [(1, Decimal("1.98"), 2)]
+    assert rollups.employees == {None: (Decimal("2.97"), 1), 7: (Decimal("0.99"), 1)}
+    assert [(y, m) for y, m, _, _ in rollups.monthly()] == [(2024, 1), (2024, 3)]
+    assert [(y, m) for y, m, _, _ in rollups.monthly((2024, 2), (2024, 12))] == [(2024, 3)]
+
+
+@pytest.mark.asyncio
+async def test_build_adds_invoices_it_did_not_read(tmp_path, monkeypatch):
+    """Verifica que una factura registrada durante la construcción se sume solo
+    si las consultas no la leyeron, aunque su InvoiceId sea menor"""
+    monkeypatch.setattr(stats, "rollups", SalesRollups())
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    date = datetime(2024, 3, 5)
+    money = stats._money
+    
+    def money_recording(rows):
+        # Requests que guardan facturas mientras se construyen los agregados
+        if not stats._pending:
+            stats.record_invoice(10, 1, None, date, Decimal("2.00"), [])
+            stats.record_invoice(5, 2, None, date, Decimal("3.00"), [])
+        return money(rows)
+    
+    monkeypatch.setattr(stats, "_money", money_recording)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Invoice), [
+                {"InvoiceId": invoice_id, "CustomerId": 1, "InvoiceDate": date, "Total": total}
+                for invoice_id, total in ((3, Decimal("1.00")), (10, Decimal("2.00")))
+            ])
+        await stats.build_rollups(async_sessionmaker(engine))
+    finally:
+        await engine.dispose()
+    
+    assert stats.rollups.customers.get(1) == (Decimal("3.00"), 2)
+    assert stats.rollups.customers.get(2) == (Decimal("3.00"), 1)
@@ -7,6 +7,7 @@ export async function getAlbums(params?: AlbumFilters): Promise<AlbumDetail[]> {
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   if (params?.artist_id) queryParams.append('artist_id', params.artist_id.toString());
   
@@ -10,6 +10,7 @@ export async function getArtists(params?: SearchParams): Promise<Artist[]> {
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   
   const url = queryParams.toString() 
@@ -28,6 +29,7 @@ export async function getArtistsPaginated(params?: SearchParams): Promise<Artist
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   
   const url = queryParams.toString() 
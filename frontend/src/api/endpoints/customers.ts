@@ -18,6 +18,7 @@ export async function getCustomers(params?: SearchParams): Promise<Customer[]> {
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   
   const url = queryParams.toString() 
@@ -36,6 +37,7 @@ export async function getCustomersPaginated(params?: SearchParams): Promise<Cust
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   
   const url = queryParams.toString() 
@@ -16,6 +16,7 @@ export async function getInvoices(params?: InvoiceFilters): Promise<Invoice[]> {
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.customer_id) queryParams.append('customer_id', params.customer_id.toString());
   if (params?.employee_id) queryParams.append('employee_id', params.employee_id.toString());
   if (params?.start_date) queryParams.append('start_date', params.start_date);
@@ -37,6 +38,7 @@ export async function getInvoicesPaginated(params?: InvoiceFilters): Promise<Inv
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.customer_id) queryParams.append('customer_id', params.customer_id.toString());
   if (params?.employee_id) queryParams.append('employee_id', params.employee_id.toString());
   if (params?.start_date) queryParams.append('start_date', params.start_date);
@@ -1,6 +1,6 @@
 import { api } from '../client';
 import { ENDPOINTS } from '../../config/api.config';
-import type { TrackList, TrackDetail, TrackFilters } from '../types';
+import type { TrackList, TrackDetail, TrackBatch, TrackRecommendations, TrackFilters } from '../types';
 
 /**
  * Obtiene lista de tracks (retorna solo el array)
@@ -10,6 +10,7 @@ export async function getTracks(params?: TrackFilters): Promise<TrackDetail[]> {
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   if (params?.album_id) queryParams.append('album_id', params.album_id.toString());
   if (params?.genre_id) queryParams.append('genre_id', params.genre_id.toString());
@@ -30,6 +31,7 @@ export async function getTracksPaginated(params?: TrackFilters): Promise<TrackLi
   
   if (params?.page) queryParams.append('page', params.page.toString());
   if (params?.page_size) queryParams.append('page_size', params.page_size.toString());
+  if (params?.cursor) queryParams.append('cursor', params.cursor);
   if (params?.search) queryParams.append('search', params.search);
   if (params?.album_id) queryParams.append('album_id', params.album_id.toString());
   if (params?.genre_id) queryParams.append('genre_id', params.genre_id.toString());
@@ -46,4 +48,18 @@ export async function getTracksPaginated(params?: TrackFilters): Promise<TrackLi
  */
 export async function getTrack(id: number): Promise<TrackDetail> {
   return api.get<TrackDetail>(ENDPOINTS.TRACK_DETAIL(id));
-}
\ No newline at end of file
+}
+
+/**
+ * Obtiene varios tracks por ID en un solo request (en el orden pedido)
+ */
+export async function getTracksByIds(ids: number[]): Promise<TrackBatch> {
+  return api.get<TrackBatch>(`${ENDPOINTS.TRACKS_BATCH}?ids=${ids.join(',')}`);
+}
+
+/**
+ * Obtiene los tracks que más se compraron junto a un track
+ */
+export async function getTrackRecommendations(id: number, limit = 10): Promise<TrackRecommendations> {
+  return api.get<TrackRecommendations>(`${ENDPOINTS.TRACK_RECOMMENDATIONS(id)}?limit=${limit}`);
+}
@@ -3,6 +3,7 @@
 export interface PaginationParams {
   page?: number;
   page_size?: number;
+  cursor?: string; // Cursor de la página siguiente (reemplaza a page)
 }
 
 export interface SearchParams extends PaginationParams {
@@ -21,6 +22,7 @@ export interface ArtistList {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 // ==================== ALBUM ====================
@@ -41,6 +43,7 @@ export interface AlbumList {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface AlbumFilters extends SearchParams {
@@ -83,6 +86,21 @@ export interface TrackList {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
+}
+
+export interface TrackBatch {
+  tracks: TrackDetail[];
+  missing: number[];
+}
+
+export interface TrackRecommendation extends TrackDetail {
+  co_purchases: number;
+}
+
+export interface TrackRecommendations {
+  TrackId: number;
+  recommendations: TrackRecommendation[];
 }
 
 export interface TrackFilters extends SearchParams {
@@ -143,6 +161,7 @@ export interface CustomerList {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 // ==================== INVOICE ====================
@@ -198,6 +217,7 @@ export interface InvoiceList {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
 
 export interface InvoiceFilters extends PaginationParams {
@@ -22,6 +22,8 @@ export const ENDPOINTS = {
   // Tracks
   TRACKS: `/api/${API_VERSION}/tracks`,
   TRACK_DETAIL: (id: number) => `/api/${API_VERSION}/tracks/${id}`,
+  TRACKS_BATCH: `/api/${API_VERSION}/tracks/batch`,
+  TRACK_RECOMMENDATIONS: (id: number) => `/api/${API_VERSION}/tracks/${id}/recommendations`,
 
   // Genres
   GENRES: `/api/${API_VERSION}/genres`,
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
-import { getTrack } from '../api/endpoints/tracks';
-import type { TrackDetail } from '../api/types';
+import { getTrack, getTrackRecommendations } from '../api/endpoints/tracks';
+import type { TrackDetail, TrackRecommendation } from '../api/types';
 import AddToCartButton from '../components/cart/AddToCartButton';
 import './TrackDetailPage.css';
 
@@ -9,6 +9,7 @@ export default function TrackDetailPage() {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
   const [track, setTrack] = useState<TrackDetail | null>(null);
+  const [recommendations, setRecommendations] = useState<TrackRecommendation[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -24,6 +25,10 @@ export default function TrackDetailPage() {
       setError(null);
       const data = await getTrack(trackId);
       setTrack(data);
+      // Las recomendaciones son opcionales: si fallan, la página se muestra igual
+      getTrackRecommendations(trackId, 5)
+        .then((result) => setRecommendations(result.recommendations))
+        .catch(() => setRecommendations([]));
     } catch (err: any) {
       setError(err.message || 'Error al cargar la canción');
     } finally {
@@ -132,6 +137,22 @@ export default function TrackDetailPage() {
               </div>
             </div>
           </div>
+
+          {/* Quienes compraron esta canción también compraron */}
+          {recommendations.length > 0 && (
+            <div className="track-album-info">
+              <h3>También compraron</h3>
+              {recommendations.map((recommended) => (
+                <Link key={recommended.TrackId} to={`/tracks/${recommended.TrackId}`} className="album-card">
+                  <div className="album-thumb">🎵</div>
+                  <div>
+                    <p className="album-title">{recommended.Name}</p>
+                    <p className="album-artist">{recommended.artist_name}</p>
+                  </div>
+                </Link>
+              ))}
+            </div>
+          )}
         </div>
       </div>
     </div>